@@ -18,7 +18,7 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from sentry import analytics, tsdb
+from sentry import analytics, features, tsdb
 from sentry.apidocs.hooks import HTTP_METHODS_SET
 from sentry.auth import access
 from sentry.models import Environment
@@ -251,7 +251,11 @@ class Endpoint(APIView):
                 op="base.dispatch.execute",
                 description=f"{type(self).__name__}.{handler.__name__}",
             ):
-                response = handler(request, *args, **kwargs)
+                if settings.SENTRY_FEATURES_REQUEST_SCOPE:
+                    with features.evaluation_scope():
+                        response = handler(request, *args, **kwargs)
+                else:
+                    response = handler(request, *args, **kwargs)
 
         except Exception as exc:
             response = self.handle_exception(request, exc)
@@ -2,16 +2,18 @@ import logging
 import random
 
 from django.conf import settings
+from django.http import HttpResponse
 from rest_framework.request import Request
 from rest_framework.response import Response
 from sentry_sdk import Hub, set_tag, start_span, start_transaction
 
+from sentry import features, options
 from sentry.api.authentication import RelayAuthentication
 from sentry.api.base import Endpoint
 from sentry.api.permissions import RelayPermission
 from sentry.models import Organization, OrganizationOption, Project, ProjectKey, ProjectKeyStatus
 from sentry.relay import config, projectconfig_cache
-from sentry.utils import metrics
+from sentry.utils import json, metrics
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +25,25 @@ def _sample_apm():
     return random.random() < getattr(settings, "SENTRY_RELAY_ENDPOINT_APM_SAMPLING", 0)
 
 
+def _configs_response(configs, cached_configs):
+    """
+    Builds the response body for a mix of freshly computed configs and configs read
+    from the projectconfig cache. The latter are already serialized and get spliced
+    into the body without decoding and re-encoding them.
+    """
+    fragments = [
+        f"{json.dumps(public_key)}:{json.dumps(project_config)}".encode("utf-8")
+        for public_key, project_config in configs.items()
+    ]
+    for public_key, fragment in cached_configs.items():
+        if isinstance(fragment, str):
+            fragment = fragment.encode("utf-8")
+        fragments.append(json.dumps(public_key).encode("utf-8") + b":" + fragment)
+
+    body = b'{"configs":{' + b",".join(fragments) + b"}}"
+    return HttpResponse(body, status=200, content_type="application/json")
+
+
 class RelayProjectConfigsEndpoint(Endpoint):
     authentication_classes = (RelayAuthentication,)
     permission_classes = (RelayPermission,)
@@ -31,7 +52,7 @@ class RelayProjectConfigsEndpoint(Endpoint):
     def post(self, request: Request) -> Response:
         with start_transaction(
             op="http.server", name="RelayProjectConfigsEndpoint", sampled=_sample_apm()
-        ):
+        ), features.evaluation_scope():
             return self._post(request)
 
     def _post(self, request: Request):
@@ -63,6 +84,16 @@ class RelayProjectConfigsEndpoint(Endpoint):
         public_keys = request.relay_request_data.get("publicKeys")
         public_keys = set(public_keys or ())
 
+        # The projectconfig cache only ever holds full configs, which are kept up to date by
+        # `update_config_cache`. Serve those that are cached and only compute the rest.
+        cached_configs = {}
+        if full_config_requested and options.get("relay.project-config-cache-read-through"):
+            with start_span(op="relay_fetch_cached_configs"):
+                with metrics.timer("relay_project_configs.fetching_cached_configs.duration"):
+                    cached_configs = projectconfig_cache.get_many(public_keys)
+            public_keys -= set(cached_configs)
+            metrics.timing("relay_project_configs.configs_cached", len(cached_configs))
+
         project_keys = {}  # type: dict[str, ProjectKey]
         project_ids = set()  # type: set[int]
 
@@ -105,6 +136,7 @@ class RelayProjectConfigsEndpoint(Endpoint):
         metrics.timing("relay_project_configs.orgs_fetched", len(orgs))
 
         configs = {}
+        organization_configs = {}
         for public_key in public_keys:
             configs[public_key] = {"disabled": True}
 
@@ -123,12 +155,20 @@ class RelayProjectConfigsEndpoint(Endpoint):
             # Prevent organization from being fetched again in quotas.
             project.set_cached_field_value("organization", organization)
 
+            if organization.id not in organization_configs:
+                config.prefetch_features(
+                    organization,
+                    [p for p in projects.values() if p.organization_id == organization.id],
+                )
+                organization_configs[organization.id] = config.get_organization_config(organization)
+
             with Hub.current.start_span(op="get_config"):
                 with metrics.timer("relay_project_configs.get_config.duration"):
                     project_config = config.get_project_config(
                         project,
                         full_config=full_config_requested,
                         project_keys=[key],
+                        organization_config=organization_configs[organization.id],
                     )
 
             configs[public_key] = project_config.to_dict()
@@ -136,6 +176,9 @@ class RelayProjectConfigsEndpoint(Endpoint):
         if full_config_requested:
             projectconfig_cache.set_many(configs)
 
+        if cached_configs:
+            return _configs_response(configs, cached_configs)
+
         return Response({"configs": configs}, status=200)
 
     def _post_by_project(self, request: Request, full_config_requested):
@@ -173,6 +216,7 @@ class RelayProjectConfigsEndpoint(Endpoint):
         metrics.timing("relay_project_configs.orgs_fetched", len(orgs))
 
         configs = {}
+        organization_configs = {}
         for project_id in project_ids:
             configs[str(project_id)] = {"disabled": True}
 
@@ -187,12 +231,20 @@ class RelayProjectConfigsEndpoint(Endpoint):
             # Prevent organization from being fetched again in quotas.
             project.set_cached_field_value("organization", organization)
 
+            if organization.id not in organization_configs:
+                config.prefetch_features(
+                    organization,
+                    [p for p in projects.values() if p.organization_id == organization.id],
+                )
+                organization_configs[organization.id] = config.get_organization_config(organization)
+
             with start_span(op="get_config"):
                 with metrics.timer("relay_project_configs.get_config.duration"):
                     project_config = config.get_project_config(
                         project,
                         full_config=full_config_requested,
                         project_keys=project_keys.get(project.id) or [],
+                        organization_config=organization_configs[organization.id],
                     )
 
             configs[str(project_id)] = project_config.to_dict()
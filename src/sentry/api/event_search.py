@@ -2,6 +2,7 @@ import re
 from collections import namedtuple
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, List, Mapping, NamedTuple, Sequence, Set, Tuple, Union
 
 from django.utils.functional import cached_property
@@ -1074,12 +1075,25 @@ default_config = SearchConfig(
 )
 
 
+@lru_cache(maxsize=1000)
+def _parse_query(query: str) -> Node:
+    """
+    Parses a query into its parse tree.
+
+    The tree only depends on the query string, so it is cached and shared between
+    callers. Anything depending on the config, the params or the current time, like
+    relative dates, is resolved by `SearchVisitor` on every call (and `release:latest`
+    only when the filters are converted), so it never ends up in the cache.
+    """
+    return event_search_grammar.parse(query)
+
+
 def parse_search_query(query, config=None, params=None, builder=None) -> Sequence[SearchFilter]:
     if config is None:
         config = default_config
 
     try:
-        tree = event_search_grammar.parse(query)
+        tree = _parse_query(query)
     except IncompleteParseError as e:
         idx = e.column()
         prefix = query[max(0, idx - 5) : idx]
@@ -63,7 +63,7 @@ from sentry.utils.compat import zip
 from sentry.utils.hashlib import hash_values
 from sentry.utils.json import JSONData
 from sentry.utils.safe import safe_execute
-from sentry.utils.snuba import Dataset, aliased_query, raw_query
+from sentry.utils.snuba import Dataset, aliased_query_params, bulk_raw_query, raw_query
 
 # TODO(jess): remove when snuba is primary backend
 snuba_tsdb = SnubaTSDB(**settings.SENTRY_TSDB_OPTIONS)
@@ -875,6 +875,23 @@ class GroupSerializerSnuba(GroupSerializerBase):
     def _execute_seen_stats_query(
         self, item_list, start=None, end=None, conditions=None, environment_ids=None
     ):
+        return self._execute_seen_stats_queries(
+            item_list,
+            [
+                {
+                    "start": start,
+                    "end": end,
+                    "conditions": conditions,
+                    "environment_ids": environment_ids,
+                }
+            ],
+        )[0]
+
+    def _execute_seen_stats_queries(self, item_list, queries):
+        """
+        Runs several seen stats queries, each a dict of the arguments of
+        `_execute_seen_stats_query`, concurrently.
+        """
         project_ids = list({item.project_id for item in item_list})
         group_ids = [item.id for item in item_list]
         aggregations = [
@@ -886,16 +903,29 @@ class GroupSerializerSnuba(GroupSerializerBase):
         filters = {"project_id": project_ids, "group_id": group_ids}
         if self.environment_ids:
             filters["environment"] = self.environment_ids
-        result = aliased_query(
-            dataset=Dataset.Events,
-            start=start,
-            end=end,
-            groupby=["group_id"],
-            conditions=conditions,
-            filter_keys=filters,
-            aggregations=aggregations,
+        results = bulk_raw_query(
+            [
+                aliased_query_params(
+                    dataset=Dataset.Events,
+                    start=query.get("start"),
+                    end=query.get("end"),
+                    groupby=["group_id"],
+                    conditions=query.get("conditions"),
+                    filter_keys=filters,
+                    aggregations=aggregations,
+                )
+                for query in queries
+            ],
             referrer="serializers.GroupSerializerSnuba._execute_seen_stats_query",
         )
+        return [
+            self._get_seen_stats_attrs(item_list, result, **query)
+            for query, result in zip(queries, results)
+        ]
+
+    def _get_seen_stats_attrs(
+        self, item_list, result, start=None, end=None, conditions=None, environment_ids=None
+    ):
         seen_data = {
             issue["group_id"]: fix_tag_value_data(
                 dict(filter(lambda key: key[0] != "group_id", issue.items()))
@@ -980,25 +1010,26 @@ class StreamGroupSerializerSnuba(GroupSerializerSnuba, GroupStatsMixin):
 
     def _get_seen_stats(self, item_list, user):
         if not self._collapse("stats"):
-            partial_execute_seen_stats_query = functools.partial(
-                self._execute_seen_stats_query,
-                item_list=item_list,
-                environment_ids=self.environment_ids,
-                start=self.start,
-                end=self.end,
-            )
-            time_range_result = partial_execute_seen_stats_query()
-            filtered_result = (
-                partial_execute_seen_stats_query(conditions=self.conditions)
-                if self.conditions and not self._collapse("filtered")
-                else None
+            # The time range, filtered and lifetime stats are independent, so they are
+            # queried concurrently.
+            time_range_query = {
+                "environment_ids": self.environment_ids,
+                "start": self.start,
+                "end": self.end,
+            }
+            queries = {"time_range": time_range_query}
+            if self.conditions and not self._collapse("filtered"):
+                queries["filtered"] = {**time_range_query, "conditions": self.conditions}
+            if not self._collapse("lifetime") and (self.start or self.end):
+                queries["lifetime"] = {**time_range_query, "start": None, "end": None}
+
+            results = dict(
+                zip(queries, self._execute_seen_stats_queries(item_list, list(queries.values())))
             )
+            time_range_result = results["time_range"]
+            filtered_result = results.get("filtered")
             if not self._collapse("lifetime"):
-                lifetime_result = (
-                    partial_execute_seen_stats_query(start=None, end=None)
-                    if self.start or self.end
-                    else time_range_result
-                )
+                lifetime_result = results.get("lifetime", time_range_result)
             else:
                 lifetime_result = None
 
@@ -546,6 +546,8 @@ CELERY_IMPORTS = (
     "sentry.data_export.tasks",
     "sentry.discover.tasks",
     "sentry.incidents.tasks",
+    "sentry.rules.history.tasks",
+    "sentry.search.snuba.tasks",
     "sentry.sentry_metrics.indexer.tasks",
     "sentry.snuba.tasks",
     "sentry.tasks.app_store_connect",
@@ -1141,6 +1143,10 @@ SENTRY_FEATURES = {
     # group sorted alphabetically.
 }
 
+# Memoize feature checks for the duration of each API request, see
+# `FeatureManager.evaluation_scope`.
+SENTRY_FEATURES_REQUEST_SCOPE = False
+
 # Default time zone for localization in the UI.
 # http://en.wikipedia.org/wiki/List_of_tz_zones_by_name
 SENTRY_DEFAULT_TIME_ZONE = "UTC"
@@ -1310,6 +1316,24 @@ SENTRY_BUFFER_OPTIONS = {}
 SENTRY_CACHE = None
 SENTRY_CACHE_OPTIONS = {}
 
+# Load every option at once every this many seconds, rather than each option on its own
+# when its local cache expires. Should be lower than the TTL of options. 0 to disable.
+SENTRY_OPTIONS_BOOTSTRAP_INTERVAL = 0
+# Redis connection options used to broadcast option changes to every process, so
+# that they don't wait for the local caches of options to expire. Processes only
+# listen once they bootstrap options, see SENTRY_OPTIONS_BOOTSTRAP_INTERVAL.
+SENTRY_OPTIONS_PUBSUB = None
+
+# Models additionally cached in memory by `get_from_cache`, by model label, e.g.
+# {"sentry.Project": {"ttl": 10, "max_size": 10000}}
+SENTRY_MODEL_PROCESS_CACHE = {}
+# Redis connection options used to broadcast invalidations of the per-process model
+# caches to every process. Without it, entries can be stale for up to their TTL.
+SENTRY_MODEL_PROCESS_CACHE_PUBSUB = None
+# Cache instances of models in `get_from_cache` as msgpack-encoded field values rather
+# than pickles. Both formats are always read, only enable once every reader supports it.
+SENTRY_MODEL_CACHE_COMPACT_FORMAT = False
+
 # Attachment blob cache backend
 SENTRY_ATTACHMENTS = "sentry.attachments.default.DefaultAttachmentCache"
 SENTRY_ATTACHMENTS_OPTIONS = {}
@@ -1348,6 +1372,9 @@ SENTRY_RELAY_PROJECTCONFIG_DEBOUNCE_CACHE_OPTIONS = {}
 # Rate limiting backend
 SENTRY_RATELIMITER = "sentry.ratelimits.base.RateLimiter"
 SENTRY_RATELIMITER_ENABLED = True
+# With `sentry.ratelimits.redis.RedisRateLimiter`, `approximate_categories` (e.g.
+# `["ip", "user", "org"]`) lists the API rate limit categories counted with
+# per-process reservations rather than one redis round trip per request.
 SENTRY_RATELIMITER_OPTIONS = {}
 
 # The default value for project-level quotas
@@ -1357,6 +1384,17 @@ SENTRY_DEFAULT_MAX_EVENTS_PER_MINUTE = "90%"
 SENTRY_SNUBA = os.environ.get("SNUBA", "http://127.0.0.1:1218")
 SENTRY_SNUBA_TIMEOUT = 30
 SENTRY_SNUBA_CACHE_TTL_SECONDS = 60
+# Per referrer overrides of SENTRY_SNUBA_CACHE_TTL_SECONDS
+SENTRY_SNUBA_CACHE_REFERRER_TTL_SECONDS = {}
+# How long cached query results keep being served after their TTL while a
+# single worker refreshes them in the background. 0 disables serving stale
+# results.
+SENTRY_SNUBA_CACHE_STALE_SECONDS = 0
+# How long a worker may hold the lease to query a missing result before other
+# workers waiting for it query snuba themselves.
+SENTRY_SNUBA_CACHE_LEASE_SECONDS = 10
+# Redis cluster holding the leases of SENTRY_SNUBA_CACHE_LEASE_SECONDS
+SENTRY_SNUBA_CACHE_REDIS_CLUSTER = "default"
 
 # Node storage backend
 SENTRY_NODESTORE = "sentry.nodestore.django.DjangoNodeStorage"
@@ -1405,6 +1443,9 @@ SENTRY_METRICS_SKIP_INTERNAL_PREFIXES = []  # Order this by most frequent prefix
 SENTRY_METRICS_INDEXER = "sentry.sentry_metrics.indexer.postgres.PGStringIndexer"
 SENTRY_METRICS_INDEXER_OPTIONS = {}
 SENTRY_METRICS_INDEXER_CACHE_TTL = 3600 * 2
+# Strings loaded into the in-process cache of the indexer when a metrics consumer
+# process starts, see `local_cache_size` of `PGStringIndexer`.
+SENTRY_METRICS_INDEXER_WARM_SIZE = 0
 
 # Release Health
 SENTRY_RELEASE_HEALTH = "sentry.release_health.sessions.SessionsReleaseHealthBackend"
@@ -2516,8 +2557,22 @@ ANOMALY_DETECTION_TIMEOUT = 30
 # This is the URL to the profiling service
 SENTRY_PROFILING_SERVICE_URL = "http://localhost:8085"
 
+# Use "sentry.rules.history.backends.redis.RedisBufferedRuleHistoryBackend" to buffer rule fires
+# in redis and write them out in batches rather than inserting a row per fire.
 SENTRY_ISSUE_ALERT_HISTORY = "sentry.rules.history.backends.postgres.PostgresRuleHistoryBackend"
 SENTRY_ISSUE_ALERT_HISTORY_OPTIONS = {}
 
+# Number of time partitions discover exports are split in, exported in parallel and
+# paginated by timestamp. Only exports of events sorted by timestamp can be
+# partitioned, others, and all exports when this is 0, are paginated by offset.
+SENTRY_DATA_EXPORT_PARTITIONS = 0
+# Cluster keeping track of the progress of partitioned exports.
+SENTRY_DATA_EXPORT_REDIS_CLUSTER = "default"
+
+# Number of groups `delete_groups` deletes at once, deleting their related rows with
+# set-based queries over all of them. When 0, groups are deleted 100 at a time and the
+# related rows of each group are deleted on their own.
+SENTRY_GROUP_BULK_DELETION_BATCH_SIZE = 0
+
 
 LOG_API_ACCESS = not IS_DEV or os.environ.get("SENTRY_LOG_API_ACCESS")
@@ -6,6 +6,10 @@ MAX_FRAGMENTS_PER_BATCH = 10
 EXPORTED_ROWS_LIMIT = 10000000
 SNUBA_MAX_RESULTS = 10000
 DEFAULT_EXPIRATION = timedelta(weeks=4)
+# Blobs of the partitions of an export are stored this many bytes apart, so that
+# ordering them by offset puts the partitions in order.
+PARTITION_OFFSET_STRIDE = 2 ** 40
+PARTITION_STATE_TTL = int(timedelta(days=1).total_seconds())
 
 
 class ExportError(Exception):
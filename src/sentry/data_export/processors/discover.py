@@ -1,8 +1,13 @@
 import logging
+from datetime import timedelta
 
+from dateutil.parser import parse as parse_date
+
+from sentry.api.event_search import AggregateFilter, ParenExpression, parse_search_query
 from sentry.api.utils import get_date_range_from_params
+from sentry.exceptions import InvalidSearchQuery
 from sentry.models import Environment, Group, Project
-from sentry.search.events.fields import get_function_alias
+from sentry.search.events.fields import get_function_alias, is_function
 from sentry.snuba import discover
 from sentry.utils.compat import map
 
@@ -46,6 +51,17 @@ class DiscoverProcessor:
             sort=discover_query.get("sort"),
             use_snql=discover_query.get("use_snql", False),
         )
+        self.keyset_order = self.get_keyset_order(discover_query)
+        if self.keyset_order is not None:
+            self.keyset_fn = self.get_data_fn(
+                fields=discover_query["field"]
+                + [f for f in ("timestamp", "id") if f not in discover_query["field"]],
+                equations=[],
+                query=discover_query["query"],
+                params=self.params,
+                sort=None,
+                use_snql=discover_query.get("use_snql", False),
+            )
 
     @staticmethod
     def get_projects(organization_id, query):
@@ -75,9 +91,38 @@ class DiscoverProcessor:
 
         return environment_names
 
+    @staticmethod
+    def get_keyset_order(query):
+        """
+        Returns the direction ("" or "-") in which the export can be paginated by
+        timestamp, or `None` if it can only be paginated by offset. That's the case of
+        queries of individual events, sorted by timestamp if they're sorted at all.
+        """
+        sort = query.get("sort") or []
+        if not isinstance(sort, list):
+            sort = [sort]
+        if sort not in ([], ["timestamp"], ["-timestamp"]):
+            return None
+
+        if query.get("equations") or any(is_function(field) for field in query["field"]):
+            return None
+
+        try:
+            terms = list(parse_search_query(query["query"]))
+        except InvalidSearchQuery:
+            return None
+        while terms:
+            term = terms.pop()
+            if isinstance(term, AggregateFilter):
+                return None
+            if isinstance(term, ParenExpression):
+                terms.extend(term.children)
+
+        return "" if sort == ["timestamp"] else "-"
+
     @staticmethod
     def get_data_fn(fields, equations, query, params, sort, use_snql=False):
-        def data_fn(offset, limit):
+        def data_fn(offset, limit, params=params, sort=sort):
             return discover.query(
                 selected_columns=fields,
                 equations=equations,
@@ -95,6 +140,67 @@ class DiscoverProcessor:
 
         return data_fn
 
+    def get_keyset_partitions(self, count):
+        """
+        Splits the date range of the export in `count` partitions, returns the cursor of
+        the first page of each of them, in the order of the export.
+        """
+        step = (self.end - self.start) / count
+        bounds = [self.start + step * i for i in range(count)] + [self.end]
+        cursors = [
+            {"start": start.isoformat(), "end": end.isoformat()}
+            for start, end in zip(bounds, bounds[1:])
+        ]
+        if self.keyset_order == "-":
+            cursors.reverse()
+        return cursors
+
+    def get_keyset_page(self, cursor, limit):
+        """
+        Fetches a page of the rows between the `start` and `end` of a cursor, returns
+        the rows and the cursor of the next page, or `None` after the last page.
+
+        Rows are sorted by timestamp then event id. Event timestamps only have a
+        precision of a second, so after a full page, the rows sharing the timestamp of
+        its last row are paged through by offset before moving past that timestamp.
+        """
+        order = self.keyset_order
+        start, end = parse_date(cursor["start"]), parse_date(cursor["end"])
+        params = dict(self.params)
+
+        tie = cursor.get("tie")
+        if tie is None:
+            params["start"], params["end"] = start, end
+            rows = self.keyset_fn(
+                offset=0, limit=limit, params=params, sort=[f"{order}timestamp", f"{order}id"]
+            )["data"]
+            if len(rows) < limit:
+                return rows, None
+
+            last_timestamp = rows[-1]["timestamp"]
+            return rows, {
+                "start": cursor["start"],
+                "end": cursor["end"],
+                "tie": last_timestamp,
+                "tie_offset": sum(1 for row in rows if row["timestamp"] == last_timestamp),
+            }
+
+        tie_start = parse_date(tie)
+        params["start"], params["end"] = tie_start, tie_start + timedelta(seconds=1)
+        rows = self.keyset_fn(
+            offset=cursor["tie_offset"], limit=limit, params=params, sort=[f"{order}id"]
+        )["data"]
+        if len(rows) == limit:
+            return rows, dict(cursor, tie_offset=cursor["tie_offset"] + len(rows))
+
+        if order == "-":
+            end = tie_start
+        else:
+            start = tie_start + timedelta(seconds=1)
+        if start >= end:
+            return rows, None
+        return rows, {"start": start.isoformat(), "end": end.isoformat()}
+
     def handle_fields(self, result_list):
         # Find issue short_id if present
         # (originally in `/api/bases/organization_events.py`)
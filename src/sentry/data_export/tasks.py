@@ -7,20 +7,14 @@ from hashlib import sha1
 import sentry_sdk
 from celery.exceptions import MaxRetriesExceededError
 from celery.task import current
+from django.conf import settings
 from django.core.files.base import ContentFile
 from django.db import IntegrityError, router
 from django.utils import timezone
 
-from sentry.models import (
-    DEFAULT_BLOB_SIZE,
-    MAX_FILE_SIZE,
-    AssembleChecksumMismatch,
-    File,
-    FileBlob,
-    FileBlobIndex,
-)
+from sentry.models import DEFAULT_BLOB_SIZE, MAX_FILE_SIZE, File, FileBlob, FileBlobIndex
 from sentry.tasks.base import instrumented_task
-from sentry.utils import metrics
+from sentry.utils import metrics, redis
 from sentry.utils.db import atomic_transaction
 from sentry.utils.sdk import capture_exception
 
@@ -28,6 +22,8 @@ from .base import (
     EXPORTED_ROWS_LIMIT,
     MAX_BATCH_SIZE,
     MAX_FRAGMENTS_PER_BATCH,
+    PARTITION_OFFSET_STRIDE,
+    PARTITION_STATE_TTL,
     SNUBA_MAX_RESULTS,
     ExportError,
     ExportQueryType,
@@ -76,19 +72,7 @@ def assemble_download(
             logger.exception(error)
             return
 
-        with sentry_sdk.configure_scope() as scope:
-            if data_export.user:
-                user = {}
-                if data_export.user.id:
-                    user["id"] = data_export.user.id
-                if data_export.user.username:
-                    user["username"] = data_export.user.username
-                if data_export.user.email:
-                    user["email"] = data_export.user.email
-                scope.user = user
-            scope.set_tag("organization.slug", data_export.organization.slug)
-            scope.set_tag("export.type", ExportQueryType.as_str(data_export.query_type))
-            scope.set_extra("export.query", data_export.query_info)
+        set_export_scope(data_export)
 
         base_bytes_written = bytes_written
 
@@ -101,6 +85,24 @@ def assemble_download(
 
             processor = get_processor(data_export, environment_id)
 
+            if (
+                first_page
+                and settings.SENTRY_DATA_EXPORT_PARTITIONS
+                and isinstance(processor, DiscoverProcessor)
+                and processor.keyset_order is not None
+            ):
+                # Only exports capped by the global row limit can be partitioned, the
+                # rows of an export with a lower limit have to be the first ones.
+                partitions = (
+                    settings.SENTRY_DATA_EXPORT_PARTITIONS
+                    if export_limit >= EXPORTED_ROWS_LIMIT
+                    else 1
+                )
+                start_partitioned_export(
+                    data_export, processor, partitions, export_limit, batch_size
+                )
+                return
+
             with tempfile.TemporaryFile(mode="w+b") as tf:
                 # XXX(python3):
                 #
@@ -145,7 +147,12 @@ def assemble_download(
                         break
 
                 tf.seek(0)
-                new_bytes_written = store_export_chunk_as_blob(data_export, bytes_written, tf)
+                # Exports written by this task alone can be merged without reading
+                # their blobs back.
+                file_checksum = sha1(b"") if first_page else None
+                new_bytes_written = store_export_chunk_as_blob(
+                    data_export, bytes_written, tf, checksum=file_checksum
+                )
                 bytes_written += new_bytes_written
         except ExportError as error:
             if error.recoverable and export_retries > 0:
@@ -203,7 +210,268 @@ def assemble_download(
             else:
                 metrics.timing("dataexport.row_count", next_offset, sample_rate=1.0)
                 metrics.timing("dataexport.file_size", bytes_written, sample_rate=1.0)
-                merge_export_blobs.delay(data_export_id)
+                merge_export_blobs.delay(
+                    data_export_id,
+                    checksum=file_checksum.hexdigest() if file_checksum else None,
+                )
+
+
+def set_export_scope(data_export):
+    with sentry_sdk.configure_scope() as scope:
+        if data_export.user:
+            user = {}
+            if data_export.user.id:
+                user["id"] = data_export.user.id
+            if data_export.user.username:
+                user["username"] = data_export.user.username
+            if data_export.user.email:
+                user["email"] = data_export.user.email
+            scope.user = user
+        scope.set_tag("organization.slug", data_export.organization.slug)
+        scope.set_tag("export.type", ExportQueryType.as_str(data_export.query_type))
+        scope.set_extra("export.query", data_export.query_info)
+
+
+def start_partitioned_export(data_export, processor, partitions, export_limit, batch_size):
+    """
+    Splits a discover export in time partitions, each exported by its own chain of
+    `assemble_download_partition` tasks.
+    """
+    cursors = processor.get_keyset_partitions(partitions)
+    with get_redis_client().pipeline(transaction=False) as pipeline:
+        pipeline.set(
+            build_partition_state_key(data_export.id, "partitions"),
+            len(cursors),
+            ex=PARTITION_STATE_TTL,
+        )
+        pipeline.delete(
+            build_partition_state_key(data_export.id, "rows"),
+            build_partition_state_key(data_export.id, "bytes"),
+        )
+        pipeline.execute()
+
+    metrics.timing("dataexport.partitions", len(cursors), sample_rate=1.0)
+    for partition, cursor in enumerate(cursors):
+        assemble_download_partition.apply_async(
+            args=[data_export.id],
+            kwargs={
+                "partition": partition,
+                "cursor": cursor,
+                "export_limit": export_limit,
+                "batch_size": batch_size,
+            },
+        )
+
+
+@instrumented_task(
+    name="sentry.data_export.tasks.assemble_download_partition",
+    queue="data_export",
+    default_retry_delay=60,
+    max_retries=3,
+    acks_late=True,
+)
+def assemble_download_partition(
+    data_export_id,
+    partition,
+    cursor,
+    export_limit=EXPORTED_ROWS_LIMIT,
+    batch_size=SNUBA_MAX_RESULTS,
+    bytes_written=0,
+    export_retries=3,
+    countdown=60,
+    **kwargs,
+):
+    """
+    Exports a time partition of a discover export, paginating by timestamp rather than
+    by offset. The blobs of each partition are stored `PARTITION_OFFSET_STRIDE` bytes
+    apart, and the last partition to finish merges them.
+    """
+    with sentry_sdk.start_span(op="assemble"):
+        try:
+            data_export = ExportedData.objects.get(id=data_export_id)
+        except ExportedData.DoesNotExist:
+            # Another partition may have failed the export.
+            return
+
+        logger.info(
+            "dataexport.run",
+            extra={"data_export_id": data_export_id, "partition": partition, "cursor": cursor},
+        )
+        set_export_scope(data_export)
+
+        base_cursor = cursor
+        base_bytes_written = bytes_written
+        # Rows and bytes counted against the limits by this task, given back if it is retried.
+        reserved_rows = 0
+        reserved_bytes = 0
+
+        try:
+            processor = get_processor(data_export, None)
+
+            with tempfile.TemporaryFile(mode="w+b") as tf:
+                tfw = codecs.getwriter("utf-8")(tf)
+                writer = csv.DictWriter(tfw, processor.header_fields, extrasaction="ignore")
+                if partition == 0 and bytes_written == 0:
+                    writer.writeheader()
+                starting_pos = tf.tell()
+
+                for _ in range(MAX_FRAGMENTS_PER_BATCH):
+                    rows, cursor = process_discover_keyset(processor, cursor, batch_size)
+                    allowed_rows = reserve_export_rows(data_export_id, rows, export_limit)
+                    reserved_rows += len(rows)
+                    writer.writerows(processor.handle_fields(allowed_rows))
+
+                    if len(allowed_rows) < len(rows):
+                        cursor = None
+                    if cursor is None or tf.tell() - starting_pos >= MAX_BATCH_SIZE:
+                        break
+
+                chunk_size = tf.tell()
+                if reserve_export_bytes(data_export_id, chunk_size):
+                    reserved_bytes = chunk_size
+                    tf.seek(0)
+                    new_bytes_written = store_export_chunk_as_blob(
+                        data_export,
+                        bytes_written,
+                        tf,
+                        base_offset=partition * PARTITION_OFFSET_STRIDE,
+                    )
+                else:
+                    new_bytes_written = 0
+                if not new_bytes_written:
+                    # The export is full, stop this partition on the previous chunk.
+                    release_export_rows(data_export_id, reserved_rows)
+                    release_export_bytes(data_export_id, reserved_bytes)
+                bytes_written += new_bytes_written
+        except ExportError as error:
+            release_export_rows(data_export_id, reserved_rows)
+            release_export_bytes(data_export_id, reserved_bytes)
+            if error.recoverable and export_retries > 0:
+                assemble_download_partition.apply_async(
+                    args=[data_export_id],
+                    kwargs={
+                        "partition": partition,
+                        "cursor": base_cursor,
+                        "export_limit": export_limit,
+                        "batch_size": batch_size // 2,
+                        "bytes_written": base_bytes_written,
+                        "export_retries": export_retries - 1,
+                    },
+                    countdown=countdown,
+                )
+            else:
+                return data_export.email_failure(message=str(error))
+        except Exception as error:
+            release_export_rows(data_export_id, reserved_rows)
+            release_export_bytes(data_export_id, reserved_bytes)
+            metrics.incr("dataexport.error", tags={"error": str(error)}, sample_rate=1.0)
+            logger.error(
+                "dataexport.error: %s",
+                str(error),
+                extra={"query": data_export.payload, "org": data_export.organization_id},
+            )
+            capture_exception(error)
+
+            try:
+                current.retry()
+            except MaxRetriesExceededError:
+                metrics.incr(
+                    "dataexport.end",
+                    tags={"success": False, "error": str(error)},
+                    sample_rate=1.0,
+                )
+                return data_export.email_failure(message="Internal processing failure")
+        else:
+            if cursor is not None and new_bytes_written:
+                assemble_download_partition.apply_async(
+                    args=[data_export_id],
+                    kwargs={
+                        "partition": partition,
+                        "cursor": cursor,
+                        "export_limit": export_limit,
+                        "batch_size": batch_size,
+                        "bytes_written": bytes_written,
+                        "export_retries": export_retries,
+                    },
+                    countdown=3,
+                )
+            else:
+                finish_export_partition(data_export_id)
+
+
+def get_redis_client():
+    return redis.redis_clusters.get(settings.SENTRY_DATA_EXPORT_REDIS_CLUSTER)
+
+
+def build_partition_state_key(data_export_id, name):
+    return f"dataexport:{{{data_export_id}}}:{name}"
+
+
+def reserve_export_rows(data_export_id, rows, export_limit):
+    """
+    Counts rows against the row limit shared by the partitions of an export, returns the
+    ones that fit within it.
+    """
+    if not rows:
+        return rows
+
+    key = build_partition_state_key(data_export_id, "rows")
+    with get_redis_client().pipeline(transaction=False) as pipeline:
+        pipeline.incrby(key, len(rows))
+        pipeline.expire(key, PARTITION_STATE_TTL)
+        reserved = pipeline.execute()[0]
+    return rows[: max(0, len(rows) - max(0, reserved - export_limit))]
+
+
+def release_export_rows(data_export_id, count):
+    """
+    Gives back rows counted by `reserve_export_rows` which weren't stored.
+    """
+    if count:
+        get_redis_client().decrby(build_partition_state_key(data_export_id, "rows"), count)
+
+
+def reserve_export_bytes(data_export_id, size):
+    """
+    Counts a chunk against the file size limit shared by the partitions of an export, returns
+    whether it fits within it.
+    """
+    key = build_partition_state_key(data_export_id, "bytes")
+    client = get_redis_client()
+    with client.pipeline(transaction=False) as pipeline:
+        pipeline.incrby(key, size)
+        pipeline.expire(key, PARTITION_STATE_TTL)
+        reserved = pipeline.execute()[0]
+    if reserved >= min(MAX_FILE_SIZE, 2 ** 30):
+        client.decrby(key, size)
+        return False
+    return True
+
+
+def release_export_bytes(data_export_id, size):
+    """
+    Gives back bytes counted by `reserve_export_bytes` which weren't stored.
+    """
+    if size:
+        get_redis_client().decrby(build_partition_state_key(data_export_id, "bytes"), size)
+
+
+def finish_export_partition(data_export_id):
+    """
+    Marks a partition of an export as done, and merges the export once all of them are.
+    """
+    client = get_redis_client()
+    if client.decr(build_partition_state_key(data_export_id, "partitions")) > 0:
+        return
+
+    rows_key = build_partition_state_key(data_export_id, "rows")
+    metrics.timing("dataexport.row_count", int(client.get(rows_key) or 0), sample_rate=1.0)
+    client.delete(
+        rows_key,
+        build_partition_state_key(data_export_id, "bytes"),
+        build_partition_state_key(data_export_id, "partitions"),
+    )
+    merge_export_blobs.delay(data_export_id)
 
 
 def get_processor(data_export, environment_id):
@@ -260,11 +528,27 @@ def process_discover(processor, limit, offset):
     return processor.handle_fields(raw_data_unicode)
 
 
+@handle_snuba_errors(logger)
+def process_discover_keyset(processor, cursor, limit):
+    return processor.get_keyset_page(cursor, limit)
+
+
 class ExportDataFileTooBig(Exception):
     pass
 
 
-def store_export_chunk_as_blob(data_export, bytes_written, fileobj, blob_size=DEFAULT_BLOB_SIZE):
+def store_export_chunk_as_blob(
+    data_export,
+    bytes_written,
+    fileobj,
+    blob_size=DEFAULT_BLOB_SIZE,
+    base_offset=0,
+    checksum=None,
+):
+    """
+    Stores a chunk of an export as blobs, returns the number of bytes stored. If
+    `checksum` is given, it's updated with the stored contents.
+    """
     try:
         with atomic_transaction(
             using=(
@@ -281,8 +565,12 @@ def store_export_chunk_as_blob(data_export, bytes_written, fileobj, blob_size=DE
 
                 blob_fileobj = ContentFile(contents)
                 blob = FileBlob.from_file(blob_fileobj, logger=logger)
+                if checksum is not None:
+                    checksum.update(contents)
                 ExportedDataBlob.objects.get_or_create(
-                    data_export=data_export, blob_id=blob.id, offset=bytes_written + bytes_offset
+                    data_export=data_export,
+                    blob_id=blob.id,
+                    offset=base_offset + bytes_written + bytes_offset,
                 )
 
                 bytes_offset += blob.size
@@ -296,8 +584,34 @@ def store_export_chunk_as_blob(data_export, bytes_written, fileobj, blob_size=DE
         return 0
 
 
+def get_export_blobs(data_export):
+    """
+    Returns the blobs of an export in the order of the file.
+    """
+    export_blobs = list(ExportedDataBlob.objects.filter(data_export=data_export).order_by("offset"))
+    blobs_by_id = FileBlob.objects.in_bulk([export_blob.blob_id for export_blob in export_blobs])
+    return [blobs_by_id[export_blob.blob_id] for export_blob in export_blobs]
+
+
+def get_export_checksum(blobs):
+    """
+    Computes the checksum of an export file by reading its blobs. Blobs were
+    checksummed from their contents when they were stored, so they aren't verified.
+    """
+    checksum = sha1(b"")
+    for blob in blobs:
+        for chunk in blob.getfile().chunks():
+            checksum.update(chunk)
+    return checksum.hexdigest()
+
+
 @instrumented_task(name="sentry.data_export.tasks.merge_blobs", queue="data_export", acks_late=True)
-def merge_export_blobs(data_export_id, **kwargs):
+def merge_export_blobs(data_export_id, checksum=None, **kwargs):
+    """
+    Assembles the file of an export from its blobs. The checksum of the file is passed by
+    exports written by a single task. Exports written by a chain of tasks or in partitions
+    have their blobs read to compute it, as a SHA-1 can't be resumed or combined from parts.
+    """
     with sentry_sdk.start_span(op="merge"):
         try:
             data_export = ExportedData.objects.get(id=data_export_id)
@@ -305,22 +619,15 @@ def merge_export_blobs(data_export_id, **kwargs):
             logger.exception(error)
             return
 
-        with sentry_sdk.configure_scope() as scope:
-            if data_export.user:
-                user = {}
-                if data_export.user.id:
-                    user["id"] = data_export.user.id
-                if data_export.user.username:
-                    user["username"] = data_export.user.username
-                if data_export.user.email:
-                    user["email"] = data_export.user.email
-                scope.user = user
-            scope.set_tag("organization.slug", data_export.organization.slug)
-            scope.set_tag("export.type", ExportQueryType.as_str(data_export.query_type))
-            scope.set_extra("export.query", data_export.query_info)
+        set_export_scope(data_export)
 
         # adapted from `putfile` in  `src/sentry/models/file.py`
         try:
+            blobs = get_export_blobs(data_export)
+            if checksum is None:
+                metrics.incr("dataexport.merge.read_blobs", sample_rate=1.0)
+                checksum = get_export_checksum(blobs)
+
             with atomic_transaction(
                 using=(
                     router.db_for_write(File),
@@ -331,28 +638,15 @@ def merge_export_blobs(data_export_id, **kwargs):
                     name=data_export.file_name,
                     type="export.csv",
                     headers={"Content-Type": "text/csv"},
+                    size=sum(blob.size for blob in blobs),
+                    checksum=checksum,
                 )
-                size = 0
-                file_checksum = sha1(b"")
-
-                for export_blob in ExportedDataBlob.objects.filter(
-                    data_export=data_export
-                ).order_by("offset"):
-                    blob = FileBlob.objects.get(pk=export_blob.blob_id)
-                    FileBlobIndex.objects.create(file=file, blob=blob, offset=size)
-                    size += blob.size
-                    blob_checksum = sha1(b"")
-
-                    for chunk in blob.getfile().chunks():
-                        blob_checksum.update(chunk)
-                        file_checksum.update(chunk)
-
-                    if blob.checksum != blob_checksum.hexdigest():
-                        raise AssembleChecksumMismatch("Checksum mismatch")
-
-                file.size = size
-                file.checksum = file_checksum.hexdigest()
-                file.save()
+                offset = 0
+                blob_indexes = []
+                for blob in blobs:
+                    blob_indexes.append(FileBlobIndex(file=file, blob=blob, offset=offset))
+                    offset += blob.size
+                FileBlobIndex.objects.bulk_create(blob_indexes)
 
                 # This is in a separate atomic transaction because in prod, files exist
                 # outside of the primary database which means that the transaction to
@@ -10,8 +10,9 @@ from django.db.models import Model
 from django.db.models.manager import BaseManager as DjangoBaseManager
 from django.db.models.signals import class_prepared, post_delete, post_init, post_save
 
-from sentry.db.models.manager import M, make_key
+from sentry.db.models.manager import M, make_key, process_cache
 from sentry.db.models.manager.base_query_set import BaseQuerySet
+from sentry.db.models.manager.encoding import decode_instance, encode_instance
 from sentry.db.models.query import create_or_update
 from sentry.utils.cache import cache
 from sentry.utils.compat import zip
@@ -116,6 +117,9 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
             return
 
         post_init.connect(self.__post_init, sender=sender, weak=False)
+        # Needs to run before `__post_save` replaces the tracked state of the instance.
+        post_save.connect(self.__invalidate_process_cache, sender=sender, weak=False)
+        post_delete.connect(self.__invalidate_process_cache, sender=sender, weak=False)
         post_save.connect(self.__post_save, sender=sender, weak=False)
         post_delete.connect(self.__post_delete, sender=sender, weak=False)
 
@@ -161,7 +165,7 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
         try:
             cache.set(
                 key=self.__get_lookup_cache_key(**{pk_name: pk_val}),
-                value=instance,
+                value=self.__encode_instance(instance),
                 timeout=self.cache_ttl,
                 version=self.cache_version,
             )
@@ -183,6 +187,25 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
 
         self.__cache_state(instance)
 
+    def __invalidate_process_cache(self, instance: M, created: bool = False, **kwargs: Any) -> None:
+        """
+        Drops every lookup of a changed instance, by its current and previous values,
+        from the process caches.
+        """
+        if created or self.model._meta.label not in settings.SENTRY_MODEL_PROCESS_CACHE:
+            return
+
+        pk_name = instance._meta.pk.name
+        keys = {self.__get_lookup_cache_key(**{pk_name: instance.pk})}
+        previous_values = self.__cache.get(instance, {})
+        for key in self.cache_fields:
+            if key in ("pk", pk_name):
+                continue
+            keys.add(self.__get_lookup_cache_key(**{key: self.__value_for_field(instance, key)}))
+            if key in previous_values:
+                keys.add(self.__get_lookup_cache_key(**{key: previous_values[key]}))
+        process_cache.invalidate(self.model, sorted(keys))
+
     def __post_delete(self, instance: M, **kwargs: Any) -> None:
         """
         Drops instance from all cache storages.
@@ -201,6 +224,25 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
             key=self.__get_lookup_cache_key(**{pk_name: instance.pk}), version=self.cache_version
         )
 
+    def __encode_instance(self, instance: M) -> Any:
+        """
+        Returns the value an instance is cached as: its field values in the compact format
+        if enabled and possible, otherwise the pickled instance.
+        """
+        if settings.SENTRY_MODEL_CACHE_COMPACT_FORMAT:
+            encoded = encode_instance(instance)
+            if encoded is not None:
+                return encoded
+        return instance
+
+    def __decode_instance(self, value: Any) -> Any:
+        """
+        Returns the instance of a cached value, in either format.
+        """
+        if isinstance(value, bytes):
+            return decode_instance(self.model, value)
+        return value
+
     def __get_lookup_cache_key(self, **kwargs: Any) -> str:
         return make_key(self.model, "modelcache", kwargs)
 
@@ -256,13 +298,28 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
                 if result is not None:
                     return result
 
+            model_process_cache = process_cache.get_process_cache(self.model)
+            if model_process_cache is not None:
+                result = model_process_cache.get(cache_key)
+                if result is not None:
+                    result._state.db = router.db_for_read(self.model, **kwargs)
+                    if local_cache is not None:
+                        local_cache[cache_key] = result
+                    return result
+
             retval = cache.get(cache_key, version=self.cache_version)
+            if retval is not None and key == pk_name:
+                # Entries written in another format version can't be decoded, and are
+                # refetched like misses.
+                retval = self.__decode_instance(retval)
             if retval is None:
                 result = self.get(**kwargs)
                 # Ensure we're pushing it into the cache
                 self.__post_save(instance=result)
                 if local_cache is not None:
                     local_cache[cache_key] = result
+                if model_process_cache is not None:
+                    self.__set_process_cache(model_process_cache, cache_key, result)
                 return result
 
             # If we didn't look up by pk we need to hit the reffed
@@ -271,6 +328,9 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
                 result = self.get_from_cache(**{pk_name: retval})
                 if local_cache is not None:
                     local_cache[cache_key] = result
+                if model_process_cache is not None:
+                    # Saves the pointer lookup on the next call
+                    self.__set_process_cache(model_process_cache, cache_key, result)
                 return result
 
             if not isinstance(retval, self.model):
@@ -285,6 +345,8 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
                 logger.error("Cache response returned invalid value %r", retval)
                 return self.get(**kwargs)
 
+            if model_process_cache is not None:
+                model_process_cache.set(cache_key, retval)
             retval._state.db = router.db_for_read(self.model, **kwargs)
 
             # Explicitly typing to satisfy mypy.
@@ -293,6 +355,17 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
         else:
             raise ValueError("We cannot cache this query. Just hit the database.")
 
+    def __set_process_cache(
+        self, model_process_cache: process_cache.ProcessCache, cache_key: str, instance: M
+    ) -> None:
+        # Ensure we don't serialize the database into the cache
+        db = instance._state.db
+        instance._state.db = None
+        try:
+            model_process_cache.set(cache_key, instance)
+        finally:
+            instance._state.db = db
+
     def get_many_from_cache(self, values: Sequence[str], key: str = "pk") -> Sequence[Any]:
         """
         Wrapper around `QuerySet.filter(pk__in=values)` which supports caching of
@@ -348,6 +421,9 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
 
         for cache_key, value in zip(cache_lookup_cache_keys, cache_lookup_values):
             cache_result = cache_results.get(cache_key)
+            if cache_result is not None and key == pk_name:
+                # Entries written in another format version are refetched like misses.
+                cache_result = self.__decode_instance(cache_result)
             if cache_result is None:
                 db_lookup_cache_keys.append(cache_key)
                 db_lookup_values.append(value)
@@ -417,6 +493,7 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
         pk_name = self.model._meta.pk.name
         cache_key = self.__get_lookup_cache_key(**{pk_name: instance_id})
         cache.delete(cache_key, version=self.cache_version)
+        process_cache.invalidate(self.model, [cache_key])
 
     def post_save(self, instance: M, **kwargs: Any) -> None:
         """
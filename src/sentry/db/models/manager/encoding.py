@@ -0,0 +1,94 @@
+"""
+Compact cache format of the model instances cached by `BaseManager`.
+
+Rather than pickling the whole instance, including its `_state` and cached relations,
+only the values of its concrete fields are stored, as a msgpack array behind a format
+version. Instances whose values can't be represented (e.g. arbitrary objects in pickled
+fields) are still pickled, and readers understand both formats.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Any, Optional, Type
+from uuid import UUID
+
+import msgpack
+from django.db.models import Model
+
+from bitfield.types import BitHandler
+
+FORMAT_VERSION = 1
+
+_EXT_DATETIME = 1
+_EXT_DATE = 2
+_EXT_UUID = 3
+_EXT_TUPLE = 4
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return msgpack.ExtType(_EXT_DATETIME, value.isoformat().encode("ascii"))
+    if isinstance(value, date):
+        return msgpack.ExtType(_EXT_DATE, value.isoformat().encode("ascii"))
+    if isinstance(value, UUID):
+        return msgpack.ExtType(_EXT_UUID, value.bytes)
+    if isinstance(value, tuple):
+        return msgpack.ExtType(_EXT_TUPLE, _pack(list(value)))
+    if isinstance(value, BitHandler):
+        return int(value)
+    raise TypeError(f"Cannot encode value of type {type(value).__name__}")
+
+
+def _ext_hook(code: int, data: bytes) -> Any:
+    if code == _EXT_DATETIME:
+        return datetime.fromisoformat(data.decode("ascii"))
+    if code == _EXT_DATE:
+        return date.fromisoformat(data.decode("ascii"))
+    if code == _EXT_UUID:
+        return UUID(bytes=data)
+    if code == _EXT_TUPLE:
+        return tuple(_unpack(data))
+    return msgpack.ExtType(code, data)
+
+
+def _pack(value: Any) -> bytes:
+    # `strict_types` passes tuples and subclasses of the builtin types to `_default`,
+    # so that they either round trip or aren't encoded at all.
+    packed: bytes = msgpack.packb(value, default=_default, use_bin_type=True, strict_types=True)
+    return packed
+
+
+def _unpack(data: bytes) -> Any:
+    return msgpack.unpackb(data, ext_hook=_ext_hook, raw=False, strict_map_key=False)
+
+
+def encode_instance(instance: Model) -> Optional[bytes]:
+    """
+    Encodes the field values of an instance, returns `None` if they can't be encoded.
+    """
+    if instance.get_deferred_fields():
+        return None
+
+    try:
+        return _pack(
+            [FORMAT_VERSION, [getattr(instance, f.attname) for f in instance._meta.concrete_fields]]
+        )
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def decode_instance(model: Type[Model], data: bytes) -> Optional[Model]:
+    """
+    Builds an instance from the output of `encode_instance`, returns `None` if the data
+    was encoded in another format or for another version of the model.
+    """
+    try:
+        version, values = _unpack(data)
+    except (ValueError, TypeError, msgpack.UnpackException):
+        return None
+
+    fields = model._meta.concrete_fields
+    if version != FORMAT_VERSION or len(values) != len(fields):
+        return None
+    return model.from_db(None, [f.attname for f in fields], values)
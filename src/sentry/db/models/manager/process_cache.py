@@ -0,0 +1,166 @@
+"""
+Per-process tier of the model cache used by `BaseManager.get_from_cache`.
+
+Models listed in `SENTRY_MODEL_PROCESS_CACHE` are additionally kept in memory for a short
+time, saving the cache round trip for the hot models every worker looks up over and over
+(projects, organizations, project keys). Entries are dropped when the instance is saved
+or deleted, and if `SENTRY_MODEL_PROCESS_CACHE_PUBSUB` is configured, the invalidations
+are broadcast to every other process through redis pub/sub. The TTL bounds how stale an
+entry can get when a broadcast is missed.
+"""
+
+from __future__ import annotations
+
+import logging
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+from sentry.utils import json, metrics
+from sentry.utils.pubsub import RedisPublisher, RedisSubscriber
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "sentry:modelcache:invalidate"
+
+_caches: Dict[str, ProcessCache] = {}
+_publisher: Optional[RedisPublisher] = None
+_listener: Optional[RedisSubscriber] = None
+_lock = threading.Lock()
+
+
+class ProcessCache:
+    """
+    A TTL-bounded LRU cache of model instances. Instances are stored pickled, so that
+    callers never share (and mutate) the same instance.
+    """
+
+    def __init__(self, name: str, ttl: int, max_size: int) -> None:
+        self.name = name
+        self.ttl = ttl
+        self.max_size = max_size
+        self._values: OrderedDict[str, Tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._values.move_to_end(key)
+                else:
+                    del self._values[key]
+                    entry = None
+
+        if entry is None:
+            metrics.incr("modelcache.process.miss", tags={"model": self.name}, sample_rate=0.01)
+            return None
+        metrics.incr("modelcache.process.hit", tags={"model": self.name}, sample_rate=0.01)
+        return pickle.loads(entry[1])
+
+    def set(self, key: str, value: Any) -> None:
+        encoded = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._values[key] = (time.monotonic() + self.ttl, encoded)
+            self._values.move_to_end(key)
+            while len(self._values) > self.max_size:
+                self._values.popitem(last=False)
+
+    def delete_many(self, keys: Sequence[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._values.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+def get_process_cache(model: Any) -> Optional[ProcessCache]:
+    """
+    Returns the process cache of a model, or `None` if the model isn't configured to be
+    cached in process.
+    """
+    label = model._meta.label
+    config = settings.SENTRY_MODEL_PROCESS_CACHE.get(label)
+    if config is None:
+        return None
+
+    process_cache = _caches.get(label)
+    if process_cache is None:
+        with _lock:
+            process_cache = _caches.get(label)
+            if process_cache is None:
+                process_cache = ProcessCache(
+                    model.__name__, config.get("ttl", 10), config.get("max_size", 1000)
+                )
+                _caches[label] = process_cache
+                _start_listener()
+    return process_cache
+
+
+def clear_process_caches() -> None:
+    _caches.clear()
+
+
+def invalidate(model: Any, keys: Sequence[str]) -> None:
+    """
+    Drops keys from the process cache of a model, in this process and in every process
+    listening for invalidations.
+    """
+    label = model._meta.label
+    if label not in settings.SENTRY_MODEL_PROCESS_CACHE:
+        return
+
+    process_cache = _caches.get(label)
+    if process_cache is not None:
+        process_cache.delete_many(keys)
+
+    publisher = _get_publisher()
+    if publisher is not None:
+        try:
+            publisher.publish(INVALIDATION_CHANNEL, json.dumps({"model": label, "keys": keys}))
+        except Exception:
+            logger.exception("modelcache.process.publish-failed")
+
+
+def _get_publisher() -> Optional[RedisPublisher]:
+    global _publisher
+    if _publisher is None and settings.SENTRY_MODEL_PROCESS_CACHE_PUBSUB:
+        _publisher = RedisPublisher(settings.SENTRY_MODEL_PROCESS_CACHE_PUBSUB)
+    return _publisher
+
+
+def _handle_invalidation(data: Any) -> None:
+    message = json.loads(data)
+    process_cache = _caches.get(message["model"])
+    if process_cache is not None:
+        process_cache.delete_many(message["keys"])
+
+
+def _clear_all() -> None:
+    # Entries may have changed while we weren't listening.
+    for process_cache in list(_caches.values()):
+        process_cache.clear()
+
+
+def _start_listener() -> None:
+    global _listener
+    if _listener is not None or not settings.SENTRY_MODEL_PROCESS_CACHE_PUBSUB:
+        return
+
+    _listener = RedisSubscriber(
+        settings.SENTRY_MODEL_PROCESS_CACHE_PUBSUB,
+        INVALIDATION_CHANNEL,
+        _handle_invalidation,
+        on_reconnect=_clear_all,
+    )
+    _listener.start()
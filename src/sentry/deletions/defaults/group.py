@@ -1,4 +1,5 @@
 import os
+from collections import defaultdict
 
 from sentry import eventstore, models, nodestore
 from sentry.eventstore.models import Event
@@ -41,13 +42,14 @@ _GROUP_RELATED_MODELS = DIRECT_GROUP_RELATED_MODELS + (
 
 class EventDataDeletionTask(BaseDeletionTask):
     """
-    Deletes nodestore data, EventAttachment and UserReports for group
+    Deletes nodestore data, EventAttachment and UserReports for group, or for all the
+    groups in `group_ids`, which must belong to the same project
     """
 
     DEFAULT_CHUNK_SIZE = 10000
 
-    def __init__(self, manager, group_id, project_id, **kwargs):
-        self.group_id = group_id
+    def __init__(self, manager, project_id, group_id=None, group_ids=None, **kwargs):
+        self.group_ids = group_ids if group_ids is not None else [group_id]
         self.project_id = project_id
         self.last_event = None
         super().__init__(manager, **kwargs)
@@ -67,7 +69,7 @@ class EventDataDeletionTask(BaseDeletionTask):
 
         events = eventstore.get_unfetched_events(
             filter=eventstore.Filter(
-                conditions=conditions, project_ids=[self.project_id], group_ids=[self.group_id]
+                conditions=conditions, project_ids=[self.project_id], group_ids=self.group_ids
             ),
             limit=self.DEFAULT_CHUNK_SIZE,
             referrer="deletions.group",
@@ -98,7 +100,41 @@ class EventDataDeletionTask(BaseDeletionTask):
 
 
 class GroupDeletionTask(ModelDeletionTask):
+    """
+    Deletes groups and their related data. In `bulk` mode, related rows are deleted with
+    set-based queries for all the groups of a chunk at once, rather than group by group.
+    """
+
+    def __init__(self, manager, bulk=False, **kwargs):
+        self.bulk = bulk
+        super().__init__(manager, **kwargs)
+
+    def get_child_relations_bulk(self, instance_list):
+        if not self.bulk:
+            return []
+
+        group_ids = [instance.id for instance in instance_list]
+        relations = [ModelRelation(m, {"group_id__in": group_ids}) for m in _GROUP_RELATED_MODELS]
+
+        # Skip EventDataDeletionTask if this is being called from cleanup.py
+        if not os.environ.get("_SENTRY_CLEANUP"):
+            group_ids_by_project = defaultdict(list)
+            for instance in instance_list:
+                group_ids_by_project[instance.project_id].append(instance.id)
+            relations.extend(
+                BaseRelation(
+                    {"group_ids": project_group_ids, "project_id": project_id},
+                    EventDataDeletionTask,
+                )
+                for project_id, project_group_ids in group_ids_by_project.items()
+            )
+
+        return relations
+
     def get_child_relations(self, instance):
+        if self.bulk:
+            return []
+
         relations = []
 
         relations.extend(
@@ -126,6 +162,29 @@ class GroupDeletionTask(ModelDeletionTask):
 
         return super().delete_instance(instance)
 
+    def delete_instance_bulk(self, instance_list):
+        if not self.bulk:
+            return super().delete_instance_bulk(instance_list)
+
+        from sentry import similarity
+        from sentry.models import Group
+
+        if not self.skip_models or similarity not in self.skip_models:
+            for instance in instance_list:
+                similarity.delete(None, instance)
+
+        Group.objects.filter(id__in=[instance.id for instance in instance_list]).delete()
+        for instance in instance_list:
+            self.logger.info(
+                "object.delete.executed",
+                extra={
+                    "object_id": instance.id,
+                    "transaction_id": self.transaction_id,
+                    "app_label": instance._meta.app_label,
+                    "model": type(instance).__name__,
+                },
+            )
+
     def mark_deletion_in_progress(self, instance_list):
         from sentry.models import Group, GroupStatus
 
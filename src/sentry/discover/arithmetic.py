@@ -1,9 +1,11 @@
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, List, Optional, Tuple, Union
 
 from parsimonious.exceptions import ParseError
 from parsimonious.grammar import Grammar, NodeVisitor
+from parsimonious.nodes import Node
 
 from sentry.exceptions import InvalidSearchQuery
 
@@ -286,12 +288,19 @@ class ArithmeticVisitor(NodeVisitor):
         return children or node
 
 
+@lru_cache(maxsize=1000)
+def _parse_equation(equation: str) -> Node:
+    """Parses an equation into its parse tree, which only depends on the equation string.
+    Validation and the conversion into Operations happen in `ArithmeticVisitor`."""
+    return arithmetic_grammar.parse(equation)
+
+
 def parse_arithmetic(
     equation: str, max_operators: Optional[int] = None, use_snql: Optional[bool] = False
 ) -> Tuple[Operation, List[str], List[str]]:
     """Given a string equation try to parse it into a set of Operations"""
     try:
-        tree = arithmetic_grammar.parse(equation)
+        tree = _parse_equation(equation)
     except ParseError:
         raise ArithmeticParseError(
             "Unable to parse your equation, make sure it is well formed arithmetic"
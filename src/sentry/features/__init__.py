@@ -198,6 +198,8 @@ entity_features = default_manager.entity_features
 get = default_manager.get
 has = default_manager.has
 batch_has = default_manager.batch_has
+evaluation_scope = default_manager.evaluation_scope
+prefetch = default_manager.prefetch
 all = default_manager.all
 add_handler = default_manager.add_handler
 add_entity_handler = default_manager.add_entity_handler
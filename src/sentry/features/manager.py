@@ -2,29 +2,78 @@ __all__ = ["FeatureManager"]
 
 import abc
 from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import (
     TYPE_CHECKING,
     Any,
+    Hashable,
     Iterable,
+    Iterator,
     List,
     Mapping,
     MutableMapping,
     MutableSet,
     Optional,
     Sequence,
+    Tuple,
     Type,
 )
 
 import sentry_sdk
 from django.conf import settings
 
-from .base import Feature
+from sentry.utils import metrics
+
+from .base import Feature, OrganizationFeature, ProjectFeature, ProjectPluginFeature
 from .exceptions import FeatureNotRegistered
 
 if TYPE_CHECKING:
     from sentry.features.handler import FeatureHandler
     from sentry.models import Organization, Project, User
 
+# Results of the feature checks made within the current evaluation scope, see
+# `FeatureManager.evaluation_scope`.
+_evaluation_cache: ContextVar[Optional[MutableMapping[Hashable, bool]]] = ContextVar(
+    "feature_evaluation_cache", default=None
+)
+
+
+def _get_actor_key(actor: Optional["User"]) -> Optional[Tuple[str, int]]:
+    if actor is None:
+        return None
+    actor_id = getattr(actor, "id", None)
+    if actor_id is None:
+        raise ValueError(actor)
+    return (type(actor).__name__, actor_id)
+
+
+def _get_evaluation_key(
+    feature: Feature, actor: Optional["User"], skip_entity: Optional[bool]
+) -> Optional[Hashable]:
+    """
+    Returns the key a feature check is memoized under, or `None` if it can't be
+    memoized because its result may depend on more than the checked entity.
+    """
+    if isinstance(feature, ProjectPluginFeature):
+        return None
+    elif isinstance(feature, ProjectFeature):
+        entity = f"project:{feature.project.id}" if feature.project.id else None
+    elif isinstance(feature, OrganizationFeature):
+        entity = f"organization:{feature.organization.id}" if feature.organization.id else None
+    elif type(feature) is Feature:
+        entity = "global"
+    else:
+        return None
+
+    if entity is None:
+        return None
+    try:
+        actor_key = _get_actor_key(actor)
+    except ValueError:
+        return None
+    return (feature.name, entity, actor_key, bool(skip_entity))
+
 
 class RegisteredFeatureManager:
     """
@@ -168,6 +217,90 @@ class FeatureManager(RegisteredFeatureManager):
         cls = self._get_feature_class(name)
         return cls(name, *args, **kwargs)
 
+    @contextmanager
+    def evaluation_scope(self) -> Iterator[None]:
+        """
+        Memoizes the results of ``has`` for the duration of the block, so that
+        checking the same feature for the same entity and actor again is a dict
+        lookup. Scopes are meant to wrap a unit of work like a request, a task
+        or a batch of messages, during which flags are not expected to change.
+
+        Nested scopes share the results of the outermost one.
+
+        >>> with features.evaluation_scope():
+        >>>     features.prefetch(names, organization, projects=projects)
+        >>>     features.has('projects:feature', project)
+        """
+        if _evaluation_cache.get() is not None:
+            yield
+            return
+
+        cache: MutableMapping[Hashable, bool] = {}
+        token = _evaluation_cache.set(cache)
+        try:
+            yield
+        finally:
+            _evaluation_cache.reset(token)
+            metrics.timing("features.evaluation_scope.size", len(cache))
+
+    def prefetch(
+        self,
+        feature_names: Sequence[str],
+        organization: "Organization",
+        projects: Optional[Sequence["Project"]] = None,
+        actor: Optional["User"] = None,
+    ) -> None:
+        """
+        Checks organization and project features of an organization and its
+        projects in bulk with ``batch_has``, and memoizes the results in the
+        current evaluation scope. Does nothing outside of a scope.
+
+        Only features without registered handlers are prefetched, the entity
+        handler doesn't know about those. Features the entity handler doesn't
+        handle are left to be checked by ``has``.
+        """
+        cache = _evaluation_cache.get()
+        if cache is None or self._entity_handler is None:
+            return
+
+        try:
+            actor_key = _get_actor_key(actor)
+        except ValueError:
+            return
+
+        organization_features = []
+        project_features = []
+        for name in feature_names:
+            if self._handler_registry.get(name):
+                continue
+            cls = self._get_feature_class(name)
+            if issubclass(cls, ProjectPluginFeature):
+                continue
+            elif issubclass(cls, ProjectFeature):
+                project_features.append(name)
+            elif issubclass(cls, OrganizationFeature):
+                organization_features.append(name)
+
+        batches = []
+        if organization_features:
+            batches.append((organization_features, None))
+        if project_features and projects:
+            batches.append((project_features, projects))
+
+        prefetched = 0
+        for names, batch_projects in batches:
+            with sentry_sdk.start_span(op="feature.prefetch", description=f"{len(names)} features"):
+                result = self.batch_has(
+                    names, actor=actor, projects=batch_projects, organization=organization
+                )
+            for entity, flags in (result or {}).items():
+                for name, flag in flags.items():
+                    if flag is not None:
+                        cache[(name, entity, actor_key, False)] = flag
+                        prefetched += 1
+
+        metrics.incr("features.evaluation_scope.prefetched", amount=prefetched)
+
     def add_entity_handler(self, handler: "FeatureHandler") -> None:
         """
         Registers a handler that doesn't require a feature name match
@@ -210,6 +343,23 @@ class FeatureManager(RegisteredFeatureManager):
         actor = kwargs.pop("actor", None)
         feature = self.get(name, *args, **kwargs)
 
+        cache = _evaluation_cache.get()
+        if cache is None:
+            return self._has(feature, actor, skip_entity)
+
+        key = _get_evaluation_key(feature, actor, skip_entity)
+        if key is None:
+            return self._has(feature, actor, skip_entity)
+
+        rv = cache.get(key)
+        if rv is not None:
+            metrics.incr("features.evaluation_scope.hit", sample_rate=0.01)
+            return rv
+
+        rv = cache[key] = self._has(feature, actor, skip_entity)
+        return rv
+
+    def _has(self, feature: Feature, actor: Optional["User"], skip_entity: Optional[bool]) -> bool:
         # Check registered feature handlers
         rv = self._get_handler(feature, actor)
         if rv is not None:
@@ -316,6 +316,45 @@ class AlertRuleManager(BaseManager):
 
         return alert_rule
 
+    def get_for_subscriptions(self, subscriptions):
+        """
+        Fetches the AlertRules associated with Subscriptions, as a dict keyed by
+        subscription id. Attempts to fetch from cache then hits the database once for all
+        the missing ones. Subscriptions without an AlertRule are left out.
+        """
+        subscriptions_by_key = {
+            self.__build_subscription_cache_key(subscription.id): subscription
+            for subscription in subscriptions
+        }
+        cached = cache.get_many(list(subscriptions_by_key))
+        result = {
+            subscriptions_by_key[cache_key].id: alert_rule
+            for cache_key, alert_rule in cached.items()
+            if alert_rule is not None
+        }
+
+        missing = {
+            cache_key: subscription
+            for cache_key, subscription in subscriptions_by_key.items()
+            if subscription.id not in result
+        }
+        if missing:
+            alert_rules = {
+                alert_rule.snuba_query_id: alert_rule
+                for alert_rule in AlertRule.objects.filter(
+                    snuba_query_id__in={s.snuba_query_id for s in missing.values()}
+                )
+            }
+            to_cache = {}
+            for cache_key, subscription in missing.items():
+                alert_rule = alert_rules.get(subscription.snuba_query_id)
+                if alert_rule is not None:
+                    result[subscription.id] = to_cache[cache_key] = alert_rule
+            if to_cache:
+                cache.set_many(to_cache, 3600)
+
+        return result
+
     @classmethod
     def clear_subscription_cache(cls, instance, **kwargs):
         cache.delete(cls.__build_subscription_cache_key(instance.id))
@@ -461,6 +500,43 @@ class AlertRuleTriggerManager(BaseManager):
             cache.set(cache_key, triggers, 3600)
         return triggers
 
+    def get_for_alert_rules(self, alert_rules):
+        """
+        Fetches the AlertRuleTriggers associated with AlertRules, as a dict keyed by
+        alert rule id. Attempts to fetch from cache then hits the database once for all
+        the missing ones.
+        """
+        alert_rule_ids_by_key = {
+            self._build_trigger_cache_key(alert_rule.id): alert_rule.id
+            for alert_rule in alert_rules
+        }
+        cached = cache.get_many(list(alert_rule_ids_by_key))
+        result = {
+            alert_rule_ids_by_key[cache_key]: triggers
+            for cache_key, triggers in cached.items()
+            if triggers is not None
+        }
+
+        missing = {
+            cache_key: alert_rule_id
+            for cache_key, alert_rule_id in alert_rule_ids_by_key.items()
+            if alert_rule_id not in result
+        }
+        if missing:
+            triggers_by_alert_rule = {alert_rule_id: [] for alert_rule_id in missing.values()}
+            for trigger in AlertRuleTrigger.objects.filter(alert_rule_id__in=missing.values()):
+                triggers_by_alert_rule[trigger.alert_rule_id].append(trigger)
+            result.update(triggers_by_alert_rule)
+            cache.set_many(
+                {
+                    cache_key: triggers_by_alert_rule[alert_rule_id]
+                    for cache_key, alert_rule_id in missing.items()
+                },
+                3600,
+            )
+
+        return result
+
     @classmethod
     def clear_trigger_cache(cls, instance, **kwargs):
         cache.delete(cls._build_trigger_cache_key(instance.alert_rule_id))
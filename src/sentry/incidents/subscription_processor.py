@@ -67,21 +67,64 @@ class SubscriptionProcessor:
         AlertRuleThresholdType.BELOW: (operator.lt, operator.gt),
     }
 
+    # When set, stats updates are queued on this redis pipeline, and it is up to the
+    # caller to execute it.
+    pipeline = None
+
     def __init__(self, subscription):
         self.subscription = subscription
         try:
-            self.alert_rule = AlertRule.objects.get_for_subscription(subscription)
+            alert_rule = AlertRule.objects.get_for_subscription(subscription)
         except AlertRule.DoesNotExist:
             return
 
-        self.triggers = AlertRuleTrigger.objects.get_for_alert_rule(self.alert_rule)
-        self.triggers.sort(key=lambda trigger: trigger.alert_threshold)
+        triggers = AlertRuleTrigger.objects.get_for_alert_rule(alert_rule)
+        triggers.sort(key=lambda trigger: trigger.alert_threshold)
+        self._setup(alert_rule, triggers, get_alert_rule_stats(alert_rule, subscription, triggers))
 
-        (
-            self.last_update,
-            self.trigger_alert_counts,
-            self.trigger_resolve_counts,
-        ) = get_alert_rule_stats(self.alert_rule, self.subscription, self.triggers)
+    @classmethod
+    def for_subscriptions(cls, subscriptions, pipeline=None):
+        """
+        Builds processors for many subscriptions at once, loading their alert rules,
+        triggers and stats in bulk.
+        :return: A dict of `SubscriptionProcessor` keyed by subscription id
+        """
+        alert_rules = AlertRule.objects.get_for_subscriptions(subscriptions)
+        triggers_by_alert_rule = {
+            alert_rule_id: sorted(triggers, key=lambda trigger: trigger.alert_threshold)
+            for alert_rule_id, triggers in AlertRuleTrigger.objects.get_for_alert_rules(
+                alert_rules.values()
+            ).items()
+        }
+
+        rule_subscriptions = [s for s in subscriptions if s.id in alert_rules]
+        stats = get_many_alert_rule_stats(
+            [
+                (alert_rules[s.id], s, triggers_by_alert_rule[alert_rules[s.id].id])
+                for s in rule_subscriptions
+            ]
+        )
+        stats_by_subscription = {s.id: s_stats for s, s_stats in zip(rule_subscriptions, stats)}
+
+        processors = {}
+        for subscription in subscriptions:
+            processor = cls.__new__(cls)
+            processor.subscription = subscription
+            processor.pipeline = pipeline
+            if subscription.id in alert_rules:
+                alert_rule = alert_rules[subscription.id]
+                processor._setup(
+                    alert_rule,
+                    triggers_by_alert_rule[alert_rule.id],
+                    stats_by_subscription[subscription.id],
+                )
+            processors[subscription.id] = processor
+        return processors
+
+    def _setup(self, alert_rule, triggers, stats):
+        self.alert_rule = alert_rule
+        self.triggers = triggers
+        self.last_update, self.trigger_alert_counts, self.trigger_resolve_counts = stats
         self.orig_trigger_alert_counts = deepcopy(self.trigger_alert_counts)
         self.orig_trigger_resolve_counts = deepcopy(self.trigger_resolve_counts)
 
@@ -609,7 +652,12 @@ class SubscriptionProcessor:
             self.last_update,
             updated_trigger_alert_counts,
             updated_trigger_resolve_counts,
+            pipeline=self.pipeline,
         )
+        # The processor may handle further updates, which only need to write what
+        # changed since.
+        self.orig_trigger_alert_counts = deepcopy(self.trigger_alert_counts)
+        self.orig_trigger_resolve_counts = deepcopy(self.trigger_resolve_counts)
 
 
 def build_alert_rule_stat_keys(alert_rule, subscription):
@@ -663,28 +711,56 @@ def get_alert_rule_stats(alert_rule, subscription, triggers):
        trigger id, and the value is an int representing how many consecutive times we
        have triggered the resolve threshold
     """
-    alert_rule_keys = build_alert_rule_stat_keys(alert_rule, subscription)
-    trigger_keys = build_trigger_stat_keys(alert_rule, subscription, triggers)
-    results = get_redis_client().mget(alert_rule_keys + trigger_keys)
-    results = tuple(0 if result is None else int(result) for result in results)
-    last_update = to_datetime(results[0])
-    trigger_results = results[1:]
-    trigger_alert_counts = {}
-    trigger_resolve_counts = {}
-    for trigger, trigger_result in zip(
-        triggers, partition(trigger_results, len(ALERT_RULE_TRIGGER_STAT_KEYS))
-    ):
-        trigger_alert_counts[trigger.id] = trigger_result[0]
-        trigger_resolve_counts[trigger.id] = trigger_result[1]
-
-    return last_update, trigger_alert_counts, trigger_resolve_counts
-
-
-def update_alert_rule_stats(alert_rule, subscription, last_update, alert_counts, resolve_counts):
+    return get_many_alert_rule_stats([(alert_rule, subscription, triggers)])[0]
+
+
+def get_many_alert_rule_stats(alert_rule_subscriptions):
+    """
+    Fetches stats about many alert rules with a single redis query.
+    :param alert_rule_subscriptions: A list of (alert_rule, subscription, triggers) tuples
+    :return: A list of tuples as returned by `get_alert_rule_stats`, in the same order
+    """
+    keys = []
+    for alert_rule, subscription, triggers in alert_rule_subscriptions:
+        keys.extend(build_alert_rule_stat_keys(alert_rule, subscription))
+        keys.extend(build_trigger_stat_keys(alert_rule, subscription, triggers))
+    if not keys:
+        return []
+
+    results = get_redis_client().mget(keys)
+    results = [0 if result is None else int(result) for result in results]
+
+    all_stats = []
+    offset = 0
+    for _, _, triggers in alert_rule_subscriptions:
+        last_update = to_datetime(results[offset])
+        offset += len(ALERT_RULE_STAT_KEYS)
+        trigger_count = len(triggers) * len(ALERT_RULE_TRIGGER_STAT_KEYS)
+        trigger_results = results[offset : offset + trigger_count]
+        offset += trigger_count
+
+        trigger_alert_counts = {}
+        trigger_resolve_counts = {}
+        for trigger, trigger_result in zip(
+            triggers, partition(trigger_results, len(ALERT_RULE_TRIGGER_STAT_KEYS))
+        ):
+            trigger_alert_counts[trigger.id] = trigger_result[0]
+            trigger_resolve_counts[trigger.id] = trigger_result[1]
+        all_stats.append((last_update, trigger_alert_counts, trigger_resolve_counts))
+
+    return all_stats
+
+
+def update_alert_rule_stats(
+    alert_rule, subscription, last_update, alert_counts, resolve_counts, pipeline=None
+):
     """
     Updates stats about the alert rule, subscription and triggers if they've changed.
+    If a pipeline is passed, the updates are only queued on it.
     """
-    pipeline = get_redis_client().pipeline()
+    execute = pipeline is None
+    if execute:
+        pipeline = get_redis_client().pipeline()
 
     counts_with_stat_keys = zip(ALERT_RULE_TRIGGER_STAT_KEYS, (alert_counts, resolve_counts))
     for stat_key, trigger_counts in counts_with_stat_keys:
@@ -699,7 +775,8 @@ def update_alert_rule_stats(alert_rule, subscription, last_update, alert_counts,
 
     last_update_key = build_alert_rule_stat_keys(alert_rule, subscription)[0]
     pipeline.set(last_update_key, int(to_timestamp(last_update)), ex=REDIS_TTL)
-    pipeline.execute()
+    if execute:
+        pipeline.execute()
 
 
 def get_redis_client():
@@ -17,7 +17,7 @@ from sentry.incidents.models import (
 )
 from sentry.models import Project
 from sentry.snuba.models import QueryDatasets
-from sentry.snuba.query_subscription_consumer import register_subscriber
+from sentry.snuba.query_subscription_consumer import register_batch_subscriber, register_subscriber
 from sentry.tasks.base import instrumented_task
 from sentry.utils import metrics
 from sentry.utils.email import MessageBuilder
@@ -140,6 +140,34 @@ def handle_snuba_query_update(subscription_update, subscription):
         SubscriptionProcessor(subscription).process_update(subscription_update)
 
 
+@register_batch_subscriber(INCIDENTS_SNUBA_SUBSCRIPTION_TYPE)
+def handle_snuba_query_updates(updates):
+    """
+    Handles a batch of subscription updates for `QuerySubscription`s. A single processor
+    is used for all the updates of a subscription, and the alert rule stats of the whole
+    batch are written to redis at once.
+    :param updates: A list of (subscription_update, subscription) tuples, in the order
+    they were received
+    """
+    from sentry.incidents.subscription_processor import SubscriptionProcessor, get_redis_client
+
+    pipeline = get_redis_client().pipeline()
+    with metrics.timer("incidents.subscription_procesor.process_updates"):
+        processors = SubscriptionProcessor.for_subscriptions(
+            list({subscription.id: subscription for _, subscription in updates}.values()),
+            pipeline=pipeline,
+        )
+        for subscription_update, subscription in updates:
+            try:
+                processors[subscription.id].process_update(subscription_update)
+            except Exception:
+                logger.exception(
+                    "Failed to process subscription update",
+                    extra={"subscription_id": subscription.id},
+                )
+        pipeline.execute()
+
+
 @instrumented_task(
     name="sentry.incidents.tasks.handle_trigger_action",
     queue="incidents",
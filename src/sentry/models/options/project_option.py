@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Mapping, Sequence
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Sequence
 
 from django.db import models
 
@@ -71,6 +71,37 @@ class ProjectOptionManager(OptionManager["Project"]):
         values: Mapping[str, Value] = self._option_cache.get(cache_key, {})
         return values
 
+    def prefetch_all_values(self, project_ids: Sequence[int]) -> None:
+        """
+        Loads the options of many projects into the local cache, with a single cache
+        round trip and a single query for the projects missing from the cache.
+        """
+        cache_keys = {
+            self._make_key(project_id): project_id
+            for project_id in project_ids
+            if self._make_key(project_id) not in self._option_cache
+        }
+        if not cache_keys:
+            return
+
+        cached = cache.get_many(list(cache_keys))
+        self._option_cache.update(cached)
+
+        missing: Dict[int, Dict[str, Value]] = {
+            project_id: {}
+            for cache_key, project_id in cache_keys.items()
+            if cache_key not in cached
+        }
+        if not missing:
+            return
+
+        for option in self.filter(project__in=list(missing)):
+            missing[option.project_id][option.key] = option.value
+
+        values = {self._make_key(project_id): result for project_id, result in missing.items()}
+        cache.set_many(values)
+        self._option_cache.update(values)
+
     def reload_cache(self, project_id: int, update_reason: str) -> Mapping[str, Value]:
         if update_reason != "projectoption.get_all_values":
             schedule_update_config_cache(
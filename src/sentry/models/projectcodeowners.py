@@ -3,6 +3,7 @@ from __future__ import annotations
 import logging
 
 from django.db import models
+from django.db.models.signals import post_delete, post_save
 from django.utils import timezone
 from rest_framework.exceptions import ValidationError
 
@@ -111,3 +112,13 @@ class ProjectCodeOwners(DefaultFieldsModel):
                 self.save()
         except ValidationError:
             return
+
+
+def invalidate_codeowners_cache(instance, **kwargs):
+    # A project can have several CODEOWNERS files which are merged on read,
+    # so drop the cached merge instead of trying to update it in place.
+    cache.delete(ProjectCodeOwners.get_cache_key(instance.project_id))
+
+
+post_save.connect(invalidate_codeowners_cache, sender=ProjectCodeOwners, weak=False)
+post_delete.connect(invalidate_codeowners_cache, sender=ProjectCodeOwners, weak=False)
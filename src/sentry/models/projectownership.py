@@ -7,11 +7,23 @@ from django.utils import timezone
 from sentry.db.models import Model, sane_repr
 from sentry.db.models.fields import FlexibleForeignKey, JSONField
 from sentry.models import ActorTuple
-from sentry.ownership.grammar import Rule, load_schema, resolve_actors
+from sentry.ownership.grammar import (
+    Rule,
+    get_schema_matcher_types,
+    hash_matcher_relevant_data,
+    load_schema,
+    resolve_actors,
+)
 from sentry.utils import metrics
 from sentry.utils.cache import cache
+from sentry.utils.hashlib import hash_values
 
 READ_CACHE_DURATION = 3600
+# How long the outcome of evaluating the ownership rules against a given set of
+# matcher-relevant event fields is kept around. Changes to the rules themselves
+# invalidate entries immediately since the schema is part of the cache key, this
+# only bounds how stale actor resolution (team/member changes) can get.
+EVALUATION_CACHE_DURATION = 600
 
 
 class ProjectOwnership(Model):
@@ -80,6 +92,26 @@ class ProjectOwnership(Model):
             cache.set(cache_key, ownership, READ_CACHE_DURATION)
         return ownership or None
 
+    @classmethod
+    def get_evaluation_cache_key(cls, kind, project_id, ownership, codeowners, data):
+        """
+        Cache key for the result of evaluating ownership rules against an event.
+
+        The key is derived from the content of the ownership and codeowners
+        records, so any change to either of them results in a new key, and from
+        the event fields the rules can actually match on, so events with the same
+        stack trace, url and relevant tags share the same key.
+        """
+        codeowners_schema = codeowners.schema if codeowners else None
+        schema_hash = hash_values(
+            [ownership.schema, codeowners_schema, ownership.fallthrough, ownership.auto_assignment]
+        )
+        matcher_types = get_schema_matcher_types(ownership.schema) | get_schema_matcher_types(
+            codeowners_schema
+        )
+        data_hash = hash_matcher_relevant_data(matcher_types, data)
+        return f"projectownership_{kind}:2:{project_id}:{schema_hash}:{data_hash}"
+
     @classmethod
     def get_owners(
         cls, project_id: int, data: Mapping[str, Any]
@@ -107,11 +139,31 @@ class ProjectOwnership(Model):
         codeowners = ProjectCodeOwners.get_codeowners_cached(project_id)
         ownership.schema = cls.get_combined_schema(ownership, codeowners)
 
-        rules = cls._matching_ownership_rules(ownership, project_id, data)
-
+        cache_key = cls.get_evaluation_cache_key("owners", project_id, ownership, codeowners, data)
+        result = cache.get(cache_key)
+        if result is None:
+            metrics.incr("projectownership.get_owners.cache", tags={"result": "miss"})
+            rules = cls._matching_ownership_rules(ownership, project_id, data)
+            result = (cls._ordered_actors(project_id, rules), rules)
+            cache.set(cache_key, result, EVALUATION_CACHE_DURATION)
+        else:
+            metrics.incr("projectownership.get_owners.cache", tags={"result": "hit"})
+
+        ordered_actors, rules = result
         if not rules:
             return cls.Everyone if ownership.fallthrough else [], None
 
+        return ordered_actors, rules
+
+    @classmethod
+    def _ordered_actors(cls, project_id, rules):
+        """
+        Resolve the owners of the matching rules, in the order of the rules
+        they appear in first.
+        """
+        if not rules:
+            return []
+
         owners = {o for rule in rules for o in rule.owners}
         owners_to_actors = resolve_actors(owners, project_id)
         ordered_actors = []
@@ -121,22 +173,17 @@ class ProjectOwnership(Model):
                     ordered_actors.append(owners_to_actors[o])
                     owners.remove(o)
 
-        return ordered_actors, rules
+        return ordered_actors
 
     @classmethod
-    def _find_actors(cls, project_id, rules, limit):
+    def _find_actors(cls, rules, owners_to_actors, limit):
         """
         Get the last matching rule to take the most precedence.
         """
         owners = [owner for rule in rules for owner in rule.owners]
         owners.reverse()
-        actors = {
-            key: val
-            for key, val in resolve_actors({owner for owner in owners}, project_id).items()
-            if val
-        }
-        actors = [actors[owner] for owner in owners if owner in actors][:limit]
-        return actors
+        actors = [owners_to_actors[owner] for owner in owners if owners_to_actors.get(owner)]
+        return actors[:limit]
 
     @classmethod
     def get_autoassign_owners(cls, project_id, data, limit=2):
@@ -159,37 +206,59 @@ class ProjectOwnership(Model):
             if not ownership:
                 ownership = cls(project_id=project_id)
 
-            ownership_rules = cls._matching_ownership_rules(ownership, project_id, data)
-            codeowners_rules = (
-                cls._matching_ownership_rules(codeowners, project_id, data) if codeowners else []
+            cache_key = cls.get_evaluation_cache_key(
+                f"autoassign:{limit}", project_id, ownership, codeowners, data
             )
-
-            if not (codeowners_rules or ownership_rules):
-                return ownership.auto_assignment, [], assigned_by_codeowners
-
-            ownership_actors = cls._find_actors(project_id, ownership_rules, limit)
-            codeowners_actors = cls._find_actors(project_id, codeowners_rules, limit)
-
-            # Can happen if the ownership rule references a user/team that no longer
-            # is assigned to the project or has been removed from the org.
-            if not (ownership_actors or codeowners_actors):
-                return ownership.auto_assignment, [], assigned_by_codeowners
-
-            # Ownership rules take precedence over codeowner rules.
-            actors = [*ownership_actors, *codeowners_actors][:limit]
-
-            # Only the first item in the list is used for assignment, the rest are just used to suggest suspect owners.
-            # So if ownership_actors is empty, it will be assigned by codeowners_actors
-            if len(ownership_actors) == 0:
-                assigned_by_codeowners = True
-
+            result = cache.get(cache_key)
+            if result is not None:
+                metrics.incr("projectownership.get_autoassign_owners.cache", tags={"result": "hit"})
+            else:
+                metrics.incr(
+                    "projectownership.get_autoassign_owners.cache", tags={"result": "miss"}
+                )
+                result = cls._get_autoassign_owners(ownership, codeowners, project_id, data, limit)
+                cache.set(cache_key, result, EVALUATION_CACHE_DURATION)
+
+            # Only the actors are cached, so that users and teams that changed since are
+            # resolved as they are now.
             from sentry.models import ActorTuple
 
-            return (
-                ownership.auto_assignment,
-                ActorTuple.resolve_many(actors),
-                assigned_by_codeowners,
-            )
+            auto_assignment, actors, assigned_by_codeowners = result
+            return auto_assignment, ActorTuple.resolve_many(actors), assigned_by_codeowners
+
+    @classmethod
+    def _get_autoassign_owners(cls, ownership, codeowners, project_id, data, limit):
+        assigned_by_codeowners = False
+        ownership_rules = cls._matching_ownership_rules(ownership, project_id, data)
+        codeowners_rules = (
+            cls._matching_ownership_rules(codeowners, project_id, data) if codeowners else []
+        )
+
+        if not (codeowners_rules or ownership_rules):
+            return ownership.auto_assignment, [], assigned_by_codeowners
+
+        # Resolve the owners of both rule sets in one go.
+        owners_to_actors = resolve_actors(
+            {owner for rule in [*ownership_rules, *codeowners_rules] for owner in rule.owners},
+            project_id,
+        )
+        ownership_actors = cls._find_actors(ownership_rules, owners_to_actors, limit)
+        codeowners_actors = cls._find_actors(codeowners_rules, owners_to_actors, limit)
+
+        # Can happen if the ownership rule references a user/team that no longer
+        # is assigned to the project or has been removed from the org.
+        if not (ownership_actors or codeowners_actors):
+            return ownership.auto_assignment, [], assigned_by_codeowners
+
+        # Ownership rules take precedence over codeowner rules.
+        actors = [*ownership_actors, *codeowners_actors][:limit]
+
+        # Only the first item in the list is used for assignment, the rest are just used to suggest suspect owners.
+        # So if ownership_actors is empty, it will be assigned by codeowners_actors
+        if len(ownership_actors) == 0:
+            assigned_by_codeowners = True
+
+        return ownership.auto_assignment, actors, assigned_by_codeowners
 
     @classmethod
     def _matching_ownership_rules(
@@ -217,10 +217,18 @@ register("snuba.search.pre-snuba-candidates-percentage", default=0.2)
 register("snuba.search.project-group-count-cache-time", default=24 * 60 * 60)
 register("snuba.search.min-pre-snuba-candidates", default=500)
 register("snuba.search.max-pre-snuba-candidates", default=5000)
+# Candidate sets up to this size are used to post-filter snuba results in memory
+register("snuba.search.max-post-filter-candidates", default=0)
+# How long candidate sets are reused across the pages of a search, 0 to disable
+register("snuba.search.candidates-cache-ttl", default=0)
 register("snuba.search.chunk-growth-rate", default=1.5)
 register("snuba.search.max-chunk-size", default=2000)
 register("snuba.search.max-total-chunk-time-seconds", default=30.0)
 register("snuba.search.hits-sample-size", default=100)
+# How long hits estimates are reused across the pages of a search
+register("snuba.search.hits-cache-ttl", default=60)
+# Estimate the hits of the first page of a search in a task rather than in the request
+register("snuba.search.hits-estimate-async", type=Bool, default=False)
 register("snuba.track-outcomes-sample-rate", default=0.0)
 
 # The percentage of tagkeys that we want to cache. Set to 1.0 in order to cache everything, <=0.0 to stop caching
@@ -360,6 +368,9 @@ register("processing.use-release-archives-sample-rate", default=0.0)  # unused
 
 # All Relay options (statically authenticated Relays can be registered here)
 register("relay.static_auth", default={}, flags=FLAG_NOSTORE)
+# Serve full project configs requested by internal relays from the projectconfig cache,
+# only computing the configs that are not cached.
+register("relay.project-config-cache-read-through", default=False)
 
 # Write new kafka headers in eventstream
 register("eventstream:kafka-headers", default=False)
@@ -1,5 +1,6 @@
 import logging
 import sys
+from time import time
 
 from django.conf import settings
 
@@ -60,6 +61,37 @@ class OptionsManager:
     def __init__(self, store):
         self.store = store
         self.registry = {}
+        self._next_bootstrap = 0
+
+    def bootstrap(self):
+        """
+        Loads every registered option from the store at once, rather than one by one as
+        they are first read.
+        """
+        return self.store.bootstrap(
+            [opt for opt in self.registry.values() if not opt.flags & FLAG_NOSTORE]
+        )
+
+    def maybe_bootstrap(self):
+        """
+        Bootstraps the options every `SENTRY_OPTIONS_BOOTSTRAP_INTERVAL` seconds, so
+        that reading them never has to leave the process in steady state.
+        """
+        interval = settings.SENTRY_OPTIONS_BOOTSTRAP_INTERVAL
+        if not interval:
+            return
+
+        now = time()
+        if now < self._next_bootstrap:
+            return
+
+        # Set first, so that concurrent reads don't all bootstrap.
+        self._next_bootstrap = now + interval
+        if self.bootstrap():
+            self.store.subscribe()
+        else:
+            # The store isn't configured yet, or is unavailable
+            self._next_bootstrap = now + 1
 
     def set(self, key, value, coerce=True):
         """
@@ -140,6 +172,7 @@ class OptionsManager:
                     return result
 
         if not (opt.flags & FLAG_NOSTORE):
+            self.maybe_bootstrap()
             result = self.store.get(opt, silent=silent)
             if result is not None:
                 # HACK(mattrobenolt): SENTRY_URL_PREFIX must be kept in sync
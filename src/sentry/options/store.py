@@ -3,17 +3,21 @@ from collections import namedtuple
 from random import random
 from time import time
 
+from django.conf import settings
 from django.db.utils import OperationalError, ProgrammingError
 from django.utils import timezone
 from django.utils.functional import cached_property
 
 from sentry.utils.hashlib import md5_text
+from sentry.utils.pubsub import RedisPublisher, RedisSubscriber
 
 Key = namedtuple("Key", ("name", "default", "type", "flags", "ttl", "grace", "cache_key"))
 
 CACHE_FETCH_ERR = "Unable to fetch option cache for %s"
 CACHE_UPDATE_ERR = "Unable to update option cache for %s"
 
+INVALIDATION_CHANNEL = "sentry:options:invalidate"
+
 logger = logging.getLogger("sentry")
 
 
@@ -41,6 +45,8 @@ class OptionsStore:
     def __init__(self, cache=None, ttl=None):
         self.cache = cache
         self.ttl = ttl
+        self._publisher = None
+        self._subscriber = None
         self.flush_local_cache()
 
     @cached_property
@@ -56,6 +62,9 @@ class OptionsStore:
         """
         Fetches a value from the options store.
         """
+        if self.is_unset_locally(key):
+            return None
+
         result = self.get_cache(key, silent=silent)
         if result is not None:
             return result
@@ -138,6 +147,69 @@ class OptionsStore:
         # in grace, too bad. The value is considered bad.
         return None
 
+    def is_unset_locally(self, key):
+        """
+        Checks whether the last bootstrap found the key to not be set in the store.
+        """
+        try:
+            value, expires, _ = self._local_cache[key.cache_key]
+        except KeyError:
+            return False
+        return value is None and int(time()) < expires
+
+    def bootstrap(self, keys, silent=False):
+        """
+        Loads the values of many keys into the local cache, with a single network cache
+        round trip and a single query for the keys missing from the network cache. Keys
+        which aren't set are remembered as such until they expire, so that reading them
+        doesn't go to the database.
+
+        Returns whether the values could be loaded.
+        """
+        if self.cache is None:
+            return False
+
+        keys = [key for key in keys if key.ttl > 0]
+        try:
+            cached = self.cache.get_many([key.cache_key for key in keys])
+        except Exception:
+            if not silent:
+                logger.warning("option.failed-bootstrap-cache", exc_info=True)
+            cached = {}
+
+        missing = {key.name: key for key in keys if cached.get(key.cache_key) is None}
+        stored = {}
+        if missing:
+            try:
+                stored = {
+                    name: value
+                    for name, value in self.model.objects.filter(key__in=list(missing)).values_list(
+                        "key", "value"
+                    )
+                }
+            except Exception:
+                if not silent:
+                    logger.exception("option.failed-bootstrap")
+                return False
+
+        local_cache = {}
+        for key in keys:
+            value = cached.get(key.cache_key)
+            if value is None:
+                value = stored.get(key.name)
+            local_cache[key.cache_key] = _make_cache_value(key, value)
+        self._local_cache.update(local_cache)
+
+        if stored:
+            try:
+                self.cache.set_many(
+                    {missing[name].cache_key: value for name, value in stored.items()}, self.ttl
+                )
+            except Exception:
+                if not silent:
+                    logger.warning("option.failed-bootstrap-cache", exc_info=True)
+        return True
+
     def get_store(self, key, silent=False):
         """
         Attempt to fetch value from the database. If successful,
@@ -182,7 +254,9 @@ class OptionsStore:
         assert self.cache is not None, "cache must be configured before mutating options"
 
         self.set_store(key, value)
-        return self.set_cache(key, value)
+        result = self.set_cache(key, value)
+        self.publish_invalidation(key)
+        return result
 
     def set_store(self, key, value):
         from sentry.db.models.query import create_or_update
@@ -217,7 +291,9 @@ class OptionsStore:
         assert self.cache is not None, "cache must be configured before mutating options"
 
         self.delete_store(key)
-        return self.delete_cache(key)
+        result = self.delete_cache(key)
+        self.publish_invalidation(key)
+        return result
 
     def delete_store(self, key):
         self.model.objects.filter(key=key.name).delete()
@@ -236,6 +312,26 @@ class OptionsStore:
             logger.warning(CACHE_UPDATE_ERR, key.name, extra={"key": key.name}, exc_info=True)
             return False
 
+    def publish_invalidation(self, key):
+        """
+        Tells every process listening for invalidations to drop the key from its local
+        cache, so that changes don't wait for the local cache to expire.
+        """
+        if not settings.SENTRY_OPTIONS_PUBSUB:
+            return
+
+        if self._publisher is None:
+            self._publisher = RedisPublisher(settings.SENTRY_OPTIONS_PUBSUB)
+        try:
+            self._publisher.publish(INVALIDATION_CHANNEL, key.cache_key)
+        except Exception:
+            logger.warning("option.failed-publish", extra={"key": key.name}, exc_info=True)
+
+    def _handle_invalidation(self, cache_key):
+        if isinstance(cache_key, bytes):
+            cache_key = cache_key.decode("utf-8")
+        self._local_cache.pop(cache_key, None)
+
     def clean_local_cache(self):
         """
         Iterate over our local cache items, and
@@ -288,3 +384,18 @@ class OptionsStore:
 
         task_postrun.connect(self.maybe_clean_local_cache)
         request_finished.connect(self.maybe_clean_local_cache)
+
+    def subscribe(self):
+        """
+        Starts listening for the invalidations published by other processes.
+        """
+        if not settings.SENTRY_OPTIONS_PUBSUB or self._subscriber is not None:
+            return
+
+        self._subscriber = RedisSubscriber(
+            settings.SENTRY_OPTIONS_PUBSUB,
+            INVALIDATION_CHANNEL,
+            self._handle_invalidation,
+            on_reconnect=self.flush_local_cache,
+        )
+        self._subscriber.start()
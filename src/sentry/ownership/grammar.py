@@ -2,7 +2,7 @@ import operator
 import re
 from collections import namedtuple
 from functools import reduce
-from typing import Iterable, List, Mapping, Pattern, Tuple
+from typing import Any, Iterable, List, Mapping, Pattern, Tuple
 
 from django.db.models import Q
 from parsimonious.exceptions import ParseError  # noqa
@@ -11,9 +11,10 @@ from rest_framework.serializers import ValidationError
 
 from sentry.models import ActorTuple
 from sentry.utils.glob import glob_match
+from sentry.utils.hashlib import hash_values
 from sentry.utils.safe import get_path
 
-__all__ = ("parse_rules", "dump_schema", "load_schema")
+__all__ = ("parse_rules", "dump_schema", "load_schema", "hash_matcher_relevant_data")
 
 VERSION = 1
 
@@ -355,6 +356,56 @@ def load_schema(schema):
     return [Rule.load(r) for r in schema["rules"]]
 
 
+def get_schema_matcher_types(schema):
+    """Return the set of matcher types referenced by a JSON schema"""
+    if not schema:
+        return set()
+    return {rule["matcher"]["type"] for rule in schema["rules"]}
+
+
+def hash_matcher_relevant_data(matcher_types: Iterable[str], data: Mapping[str, Any]) -> str:
+    """
+    Compute a digest over the parts of an event that matchers of the given
+    types inspect: the request url, frame paths and modules, and the values
+    of the tags referenced by `tags.*` matchers.
+
+    Two events with the same digest are guaranteed to match the same rules
+    of a schema using only those matcher types.
+    """
+    matcher_types = set(matcher_types)
+
+    frame_keys = []
+    if PATH in matcher_types or CODEOWNERS in matcher_types:
+        frame_keys.extend(["filename", "abs_path"])
+    if MODULE in matcher_types:
+        frame_keys.append("module")
+
+    tag_keys = {type[5:] for type in matcher_types if type.startswith("tags.")}
+
+    def _coerce(value):
+        return value if value is None else str(value)
+
+    values = []
+    if URL in matcher_types:
+        values.append(_coerce(get_path(data, "request", "url")))
+
+    if frame_keys:
+        values.append(
+            [[_coerce(frame.get(key)) for key in frame_keys] for frame in _iter_frames(data)]
+        )
+
+    if tag_keys:
+        values.append(
+            [
+                [_coerce(k), _coerce(v)]
+                for k, v in get_path(data, "tags", filter=True) or ()
+                if k in tag_keys
+            ]
+        )
+
+    return hash_values(values)
+
+
 def convert_schema_to_rules_text(schema):
     rules = load_schema(schema)
     text = ""
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
 import logging
+import threading
+from dataclasses import dataclass
 from time import time
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Dict, Iterable
 
 from django.conf import settings
 from redis.exceptions import RedisError
 
 from sentry.exceptions import InvalidConfiguration
 from sentry.ratelimits.base import RateLimiter
-from sentry.utils import redis
+from sentry.utils import metrics, redis
 from sentry.utils.hashlib import md5_text
 
 if TYPE_CHECKING:
@@ -28,10 +30,49 @@ def _bucket_start_time(bucket_number: int, window: int) -> int:
     return bucket_number * window
 
 
+@dataclass
+class _Reservation:
+    """
+    Counter values reserved by this process in a rate limit window. The values from
+    `next_value` up to `last_value` are handed out locally, one per request.
+    """
+
+    reset_time: int
+    next_value: int
+    last_value: int
+    size: int
+
+
 class RedisRateLimiter(RateLimiter):
-    def __init__(self, **options: Any) -> None:
+    """
+    Fixed window rate limiter counting requests in redis.
+
+    Keys of the categories listed in `approximate_categories` (the prefix of the key
+    up to the first colon, e.g. "ip", "user" or "org" for API rate limits) are limited
+    approximately: rather than incrementing the counter for every request, each
+    process reserves a slice of the window's counter values at a time and hands them
+    out locally. Slices start at a single value and double for every reservation in
+    the same window, up to `reservation_fraction` of the limit, so that only keys that
+    are busy in this process reserve ahead. Values reserved but not used by the end
+    of the window are counted against the limit, and once the limit is reached, the
+    key stays limited in this process until the window ends without asking redis.
+    """
+
+    # Reservations kept before expired ones are dropped.
+    max_reservations = 10000
+
+    def __init__(
+        self,
+        approximate_categories: Iterable[str] = (),
+        reservation_fraction: float = 0.1,
+        **options: Any,
+    ) -> None:
         cluster_key = getattr(settings, "SENTRY_RATE_LIMIT_REDIS_CLUSTER", "default")
         self.client = redis.redis_clusters.get(cluster_key)
+        self.approximate_categories = frozenset(approximate_categories)
+        self.reservation_fraction = reservation_fraction
+        self._reservations: Dict[str, _Reservation] = {}
+        self._lock = threading.Lock()
 
     def _construct_redis_key(
         self,
@@ -104,9 +145,13 @@ class RedisRateLimiter(RateLimiter):
         expiration = window - int(request_time % window)
         # Reset Time = next time bucket's start time
         reset_time = _bucket_start_time(_time_bucket(request_time, window) + 1, window)
+        if key.split(":", 1)[0] in self.approximate_categories:
+            return self._is_limited_approximately(
+                redis_key, limit, request_time, expiration, reset_time
+            )
+
         try:
-            result = self.client.incr(redis_key)
-            self.client.expire(redis_key, expiration)
+            result = self._incr(redis_key, 1, expiration)
         except RedisError:
             # We don't want rate limited endpoints to fail when ratelimits
             # can't be updated. We do want to know when that happens.
@@ -114,3 +159,62 @@ class RedisRateLimiter(RateLimiter):
             return False, 0, reset_time
 
         return result > limit, result, reset_time
+
+    def _incr(self, redis_key: str, amount: int, expiration: int) -> int:
+        with self.client.pipeline(transaction=False) as pipeline:
+            pipeline.incrby(redis_key, amount)
+            pipeline.expire(redis_key, expiration)
+            result, _ = pipeline.execute()
+        return int(result)
+
+    def _is_limited_approximately(
+        self, redis_key: str, limit: int, request_time: float, expiration: int, reset_time: int
+    ) -> tuple[bool, int, int]:
+        with self._lock:
+            reservation = self._reservations.get(redis_key)
+            if reservation is not None:
+                value = reservation.next_value
+                if value <= reservation.last_value:
+                    reservation.next_value += 1
+                    metrics.incr("ratelimits.approximate.local", sample_rate=0.01)
+                    return False, value, reset_time
+                if value > limit:
+                    return True, value, reset_time
+
+            size = 1
+            if reservation is not None:
+                size = min(reservation.size * 2, max(1, int(limit * self.reservation_fraction)))
+
+        try:
+            result = self._incr(redis_key, size, expiration)
+        except RedisError:
+            logger.exception("Failed to retrieve current value from redis")
+            return False, 0, reset_time
+        metrics.incr("ratelimits.approximate.reserved", sample_rate=0.01)
+
+        # Values past the limit aren't handed out, the next request past the
+        # reservation is limited right away.
+        value = result - size + 1
+        with self._lock:
+            if (
+                redis_key not in self._reservations
+                and len(self._reservations) >= self.max_reservations
+            ):
+                self._drop_expired_reservations(request_time)
+            self._reservations[redis_key] = _Reservation(
+                reset_time=reset_time,
+                next_value=value + 1,
+                last_value=min(result, limit),
+                size=size,
+            )
+
+        return value > limit, value, reset_time
+
+    def _drop_expired_reservations(self, request_time: float) -> None:
+        self._reservations = {
+            redis_key: reservation
+            for redis_key, reservation in self._reservations.items()
+            if reservation.reset_time > request_time
+        }
+        if len(self._reservations) >= self.max_reservations:
+            self._reservations.clear()
@@ -1,5 +1,6 @@
 import logging
 import uuid
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, List, Mapping, Optional, TypedDict
 
@@ -31,21 +32,25 @@ EXPOSABLE_FEATURES = [
     "organizations:profiling",
 ]
 
-logger = logging.getLogger(__name__)
+# Features checked while computing configs, see `prefetch_features`.
+CONFIG_FEATURES = EXPOSABLE_FEATURES + [
+    "organizations:filters-and-sampling",
+    "organizations:performance-ops-breakdown",
+    "organizations:transaction-metrics-extraction",
+    "projects:custom-inbound-filters",
+    "projects:performance-suspect-spans-ingestion",
+]
 
+logger = logging.getLogger(__name__)
 
-def get_exposed_features(project: Project) -> List[str]:
 
+def _get_exposed_features(prefix: str, entity: Any) -> List[str]:
     active_features = []
     for feature in EXPOSABLE_FEATURES:
-        if feature.startswith("organizations:"):
-            has_feature = features.has(feature, project.organization)
-        elif feature.startswith("projects:"):
-            has_feature = features.has(feature, project)
-        else:
-            raise RuntimeError("EXPOSABLE_FEATURES must start with 'organizations:' or 'projects:'")
+        if not feature.startswith(prefix):
+            continue
 
-        if has_feature:
+        if features.has(feature, entity):
             metrics.incr(
                 "sentry.relay.config.features", tags={"outcome": "enabled", "feature": feature}
             )
@@ -58,6 +63,31 @@ def get_exposed_features(project: Project) -> List[str]:
     return active_features
 
 
+def get_exposed_features(project: Project, organization_features: Optional[List[str]] = None):
+    """
+    Returns the features from `EXPOSABLE_FEATURES` which are enabled for the project.
+
+    :param organization_features: Pre-computed organization features, as returned by
+        `get_organization_config`, to avoid checking them again for every project.
+    """
+    for feature in EXPOSABLE_FEATURES:
+        if not feature.startswith(("organizations:", "projects:")):
+            raise RuntimeError("EXPOSABLE_FEATURES must start with 'organizations:' or 'projects:'")
+
+    if organization_features is None:
+        organization_features = _get_exposed_features("organizations:", project.organization)
+
+    return organization_features + _get_exposed_features("projects:", project)
+
+
+def prefetch_features(organization, projects):
+    """
+    Checks the features used in the configs of the organization's projects in bulk.
+    The results are memoized for the current `features.evaluation_scope`.
+    """
+    features.prefetch(CONFIG_FEATURES, organization, projects=projects)
+
+
 def get_project_key_config(project_key):
     """Returns a dict containing the information for a specific project key"""
     return {"dsn": project_key.dsn_public}
@@ -123,7 +153,43 @@ def get_quotas(project, keys=None):
     return [quota.to_json() for quota in quotas.get_quotas(project, keys=keys)]
 
 
-def get_project_config(project, full_config=True, project_keys=None):
+@dataclass(frozen=True)
+class OrganizationConfig:
+    """
+    The parts of a project config which only depend on the organization.
+
+    These are computed once with `get_organization_config` and shared between all
+    projects of an organization, instead of being recomputed for every project.
+    Organization options which are merged with project options (PII config and
+    datascrubbing settings) are not part of it, they are read from the organization's
+    option cache.
+    """
+
+    trusted_relays: List[str]
+    features: List[str]
+    dynamic_sampling: bool
+    ops_breakdown: bool
+    transaction_metrics: bool
+    event_retention: Optional[int]
+
+
+def get_organization_config(organization) -> OrganizationConfig:
+    with Hub.current.start_span(op="get_organization_config"):
+        return OrganizationConfig(
+            trusted_relays=[
+                r["public_key"] for r in organization.get_option("sentry:trusted-relays", []) if r
+            ],
+            features=_get_exposed_features("organizations:", organization),
+            dynamic_sampling=features.has("organizations:filters-and-sampling", organization),
+            ops_breakdown=features.has("organizations:performance-ops-breakdown", organization),
+            transaction_metrics=features.has(
+                "organizations:transaction-metrics-extraction", organization
+            ),
+            event_retention=quotas.get_event_retention(organization),
+        )
+
+
+def get_project_config(project, full_config=True, project_keys=None, organization_config=None):
     """
     Constructs the ProjectConfig information.
 
@@ -137,6 +203,8 @@ def get_project_config(project, full_config=True, project_keys=None):
         no project keys are provided it is assumed that the config does not
         need to contain auth information (this is the case when used in
         python's StoreView)
+    :param organization_config: Pre-computed `OrganizationConfig` of the
+        project's organization, to share it between projects.
 
     :return: a ProjectConfig object for the given project
     """
@@ -146,7 +214,38 @@ def get_project_config(project, full_config=True, project_keys=None):
     if project.status != ObjectStatus.VISIBLE:
         return ProjectConfig(project, disabled=True)
 
-    public_keys = get_public_key_configs(project, full_config, project_keys=project_keys)
+    cfg = _get_project_config_fragment(project, full_config, organization_config)
+    return _add_key_config_fragment(project, cfg, full_config, project_keys)
+
+
+def get_project_configs(project, project_keys, full_config=True, organization_config=None):
+    """
+    Constructs one ProjectConfig per project key, mapped by public key.
+
+    This returns the same as calling `get_project_config` with each key on its own, but
+    only computes the parts of the config which don't depend on the key once.
+
+    :return: a dictionary of public key to ProjectConfig
+    """
+    with configure_scope() as scope:
+        scope.set_tag("project", project.id)
+
+    if project.status != ObjectStatus.VISIBLE:
+        return {key.public_key: ProjectConfig(project, disabled=True) for key in project_keys}
+
+    cfg = _get_project_config_fragment(project, full_config, organization_config)
+    return {
+        key.public_key: _add_key_config_fragment(project, cfg, full_config, [key])
+        for key in project_keys
+    }
+
+
+def _get_project_config_fragment(project, full_config, organization_config):
+    """
+    Returns the config of the project without the parts which depend on its keys.
+    """
+    if organization_config is None:
+        organization_config = get_organization_config(project.organization)
 
     with Hub.current.start_span(op="get_public_config"):
         now = datetime.utcnow().replace(tzinfo=utc)
@@ -156,37 +255,28 @@ def get_project_config(project, full_config=True, project_keys=None):
             "lastFetch": now,
             "lastChange": project.get_option("sentry:relay-rev-lastchange", now),
             "rev": project.get_option("sentry:relay-rev", uuid.uuid4().hex),
-            "publicKeys": public_keys,
             "config": {
                 "allowedDomains": list(get_origins(project)),
-                "trustedRelays": [
-                    r["public_key"]
-                    for r in project.organization.get_option("sentry:trusted-relays", [])
-                    if r
-                ],
+                "trustedRelays": organization_config.trusted_relays,
                 "piiConfig": get_pii_config(project),
                 "datascrubbingSettings": get_datascrubbing_settings(project),
-                "features": get_exposed_features(project),
+                "features": get_exposed_features(project, organization_config.features),
             },
             "organizationId": project.organization_id,
             "projectId": project.id,  # XXX: Unused by Relay, required by Python store
         }
-    allow_dynamic_sampling = features.has(
-        "organizations:filters-and-sampling",
-        project.organization,
-    )
-    if allow_dynamic_sampling:
+    if organization_config.dynamic_sampling:
         dynamic_sampling = project.get_option("sentry:dynamic_sampling")
         if dynamic_sampling is not None:
             cfg["config"]["dynamicSampling"] = dynamic_sampling
 
     if not full_config:
         # This is all we need for external Relay processors
-        return ProjectConfig(project, **cfg)
+        return cfg
 
-    if features.has("organizations:performance-ops-breakdown", project.organization):
+    if organization_config.ops_breakdown:
         cfg["config"]["breakdownsV2"] = project.get_option("sentry:breakdowns")
-    if features.has("organizations:transaction-metrics-extraction", project.organization):
+    if organization_config.transaction_metrics:
         cfg["config"]["transactionMetrics"] = get_transaction_metrics_settings(
             project, cfg["config"].get("breakdownsV2")
         )
@@ -196,10 +286,22 @@ def get_project_config(project, full_config=True, project_keys=None):
         cfg["config"]["filterSettings"] = get_filter_settings(project)
     with Hub.current.start_span(op="get_grouping_config_dict_for_project"):
         cfg["config"]["groupingConfig"] = get_grouping_config_dict_for_project(project)
-    with Hub.current.start_span(op="get_event_retention"):
-        cfg["config"]["eventRetention"] = quotas.get_event_retention(project.organization)
-    with Hub.current.start_span(op="get_all_quotas"):
-        cfg["config"]["quotas"] = get_quotas(project, keys=project_keys)
+    cfg["config"]["eventRetention"] = organization_config.event_retention
+
+    return cfg
+
+
+def _add_key_config_fragment(project, cfg, full_config, project_keys):
+    """
+    Completes a config returned by `_get_project_config_fragment` with the parts which
+    depend on the project keys. `cfg` is not modified so that it can be reused.
+    """
+    cfg = dict(cfg, publicKeys=get_public_key_configs(project, full_config, project_keys))
+
+    if full_config:
+        cfg["config"] = dict(cfg["config"])
+        with Hub.current.start_span(op="get_all_quotas"):
+            cfg["config"]["quotas"] = get_quotas(project, keys=project_keys)
 
     return ProjectConfig(project, **cfg)
 
@@ -1,14 +1,31 @@
+import zstandard
+
 from sentry.relay.projectconfig_cache.base import ProjectConfigCache
-from sentry.utils import json, redis
+from sentry.utils import json, metrics, redis
 from sentry.utils.redis import validate_dynamic_cluster
 
 REDIS_CACHE_TIMEOUT = 3600  # 1 hr
 
+# Header of configs stored in the compressed format, followed by the zstd-compressed JSON.
+# Configs stored as plain JSON always start with `{`, so both formats can be told apart
+# and read during a rollout.
+COMPRESSED_HEADER = b"\x00zstd:1:"
+
 
 class RedisProjectConfigCache(ProjectConfigCache):
+    """
+    Stores project configs in redis.
+
+    Configs are stored as plain JSON, unless the `compression` option is set, in which case
+    they are stored zstd-compressed behind a version header. Only enable compression once
+    every reader of the cache understands that format.
+    """
+
     def __init__(self, **options):
         cluster_key = options.get("cluster", "default")
-        self.cluster = redis.redis_clusters.get(cluster_key)
+        self.cluster = redis.redis_clusters.get_binary(cluster_key)
+        self.compression = options.get("compression", False)
+        self.compression_level = options.get("compression_level", 3)
 
         super().__init__(**options)
 
@@ -18,11 +35,29 @@ class RedisProjectConfigCache(ProjectConfigCache):
     def __get_redis_key(self, public_key):
         return f"relayconfig:{public_key}"
 
+    def __encode(self, config):
+        value = json.dumps(config).encode("utf-8")
+        metrics.timing("relay.projectconfig_cache.size", len(value))
+        if not self.compression:
+            return value
+
+        value = COMPRESSED_HEADER + zstandard.ZstdCompressor(level=self.compression_level).compress(
+            value
+        )
+        metrics.timing("relay.projectconfig_cache.compressed_size", len(value))
+        return value
+
+    def __decode_raw(self, value):
+        """Returns the serialized JSON of a stored config."""
+        if value.startswith(COMPRESSED_HEADER):
+            return zstandard.ZstdDecompressor().decompress(value[len(COMPRESSED_HEADER) :])
+        return value
+
     def set_many(self, configs):
         # Note: Those are multiple pipelines, one per cluster node
         p = self.cluster.pipeline()
         for public_key, config in configs.items():
-            p.setex(self.__get_redis_key(public_key), REDIS_CACHE_TIMEOUT, json.dumps(config))
+            p.setex(self.__get_redis_key(public_key), REDIS_CACHE_TIMEOUT, self.__encode(config))
 
         p.execute()
 
@@ -37,5 +72,18 @@ class RedisProjectConfigCache(ProjectConfigCache):
     def get(self, public_key):
         rv = self.cluster.get(self.__get_redis_key(public_key))
         if rv is not None:
-            return json.loads(rv)
+            return json.loads(self.__decode_raw(rv).decode("utf-8"))
         return None
+
+    def get_many(self, public_keys):
+        public_keys = list(public_keys)
+        # Note: Those are multiple pipelines, one per cluster node
+        p = self.cluster.pipeline()
+        for public_key in public_keys:
+            p.get(self.__get_redis_key(public_key))
+
+        return {
+            public_key: self.__decode_raw(rv)
+            for public_key, rv in zip(public_keys, p.execute())
+            if rv is not None
+        }
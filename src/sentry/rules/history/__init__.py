@@ -14,5 +14,6 @@ LazyServiceWrapper(
 if TYPE_CHECKING:
     __rule_history_backend__ = RuleHistoryBackend()
     record = __rule_history_backend__.record
+    flush = __rule_history_backend__.flush
     fetch_rule_groups_paginated = __rule_history_backend__.fetch_rule_groups_paginated
     fetch_rule_hourly_stats = __rule_history_backend__.fetch_rule_hourly_stats
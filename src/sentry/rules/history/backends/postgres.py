@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING, Sequence, TypedDict
+from typing import TYPE_CHECKING, Mapping, Sequence, TypedDict
 
 import pytz
 from django.db.models import Count, Max
@@ -29,6 +29,21 @@ def convert_results(results: Sequence[_Result]) -> Sequence[RuleGroupHistory]:
     ]
 
 
+def fill_hourly_buckets(
+    counts: Mapping[datetime, int], start: datetime, end: datetime
+) -> Sequence[TimeSeriesValue]:
+    """
+    Converts a mapping of hour -> count into a contiguous series of hourly buckets covering
+    `start` to `end`, filling hours without any fires with zeroes.
+    """
+    results = []
+    current = start.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    while current <= end.replace(minute=0, second=0, microsecond=0):
+        results.append(TimeSeriesValue(current, counts.get(current, 0)))
+        current += timedelta(hours=1)
+    return results
+
+
 class PostgresRuleHistoryBackend(RuleHistoryBackend):
     def record(self, rule: Rule, group: Group) -> None:
         RuleFireHistory.objects.create(project=rule.project, rule=rule, group=group)
@@ -60,6 +75,11 @@ class PostgresRuleHistoryBackend(RuleHistoryBackend):
     ) -> Sequence[TimeSeriesValue]:
         start = start.replace(tzinfo=pytz.utc)
         end = end.replace(tzinfo=pytz.utc)
+        return fill_hourly_buckets(self._fetch_hourly_counts(rule, start, end), start, end)
+
+    def _fetch_hourly_counts(
+        self, rule: Rule, start: datetime, end: datetime
+    ) -> Mapping[datetime, int]:
         qs = (
             RuleFireHistory.objects.filter(
                 rule=rule,
@@ -71,11 +91,4 @@ class PostgresRuleHistoryBackend(RuleHistoryBackend):
             .values("bucket")
             .annotate(count=Count("id"))
         )
-        existing_data = {row["bucket"]: TimeSeriesValue(row["bucket"], row["count"]) for row in qs}
-
-        results = []
-        current = start.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
-        while current <= end.replace(minute=0, second=0, microsecond=0):
-            results.append(existing_data.get(current, TimeSeriesValue(current, 0)))
-            current += timedelta(hours=1)
-        return results
+        return {row["bucket"]: row["count"] for row in qs}
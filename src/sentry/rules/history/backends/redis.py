@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from time import time
+from typing import TYPE_CHECKING, Any, Dict, List, MutableMapping, Sequence
+
+import pytz
+
+from sentry.models import Rule, RuleFireHistory
+from sentry.rules.history.backends.postgres import PostgresRuleHistoryBackend, fill_hourly_buckets
+from sentry.rules.history.base import TimeSeriesValue
+from sentry.utils import metrics, redis
+from sentry.utils.dates import to_datetime, to_timestamp
+
+if TYPE_CHECKING:
+    from sentry.models import Group
+
+logger = logging.getLogger(__name__)
+
+pop_records = redis.load_script("rules/history/pop_records.lua")
+
+BUFFER_KEY = "rulefirehistory:buffer"
+FLUSH_SCHEDULED_KEY = "rulefirehistory:flush-scheduled"
+# Timestamp of the first hour fully counted in the hourly buckets
+HOURLY_START_KEY = "rulefirehistory:hourly-start"
+
+DAY = 24 * 60 * 60
+HOUR = 60 * 60
+
+
+def _hourly_key(rule_id: int, day: int) -> str:
+    return f"rulefirehistory:hourly:{rule_id}:{day}"
+
+
+class RedisBufferedRuleHistoryBackend(PostgresRuleHistoryBackend):
+    """
+    Rule history backend that keeps `RuleFireHistory` in Postgres but doesn't write it
+    synchronously when a rule fires.
+
+    Each fire is appended to a buffer in Redis as a compact `project:rule:group:timestamp`
+    record, and the buffer is written out with bulk inserts by the
+    `sentry.rules.history.tasks.flush_rule_fire_history` task, which is scheduled
+    `flush_interval` seconds after the first buffered record, or as soon as `flush_size`
+    records are pending.
+
+    Alongside the buffer, fires are counted in per-rule hourly buckets, so that
+    `fetch_rule_hourly_stats` can be served from these pre-rolled counts instead of
+    aggregating raw rows, for ranges within `hourly_retention`. Hours before the backend
+    started counting fires are still aggregated from Postgres.
+    """
+
+    def __init__(self, **options: Any) -> None:
+        self.client = redis.redis_clusters.get(options.get("cluster", "default"))
+        self.flush_size = options.get("flush_size", 1000)
+        self.flush_interval = options.get("flush_interval", 10)
+        self.hourly_retention = options.get("hourly_retention", 90 * DAY)
+
+    def record(self, rule: Rule, group: Group) -> None:
+        timestamp = time()
+        day, hour = divmod(int(timestamp) // HOUR, 24)
+        hourly_key = _hourly_key(rule.id, day)
+
+        with self.client.pipeline(transaction=False) as pipeline:
+            pipeline.rpush(BUFFER_KEY, f"{rule.project_id}:{rule.id}:{group.id}:{timestamp}")
+            pipeline.hincrby(hourly_key, hour, 1)
+            pipeline.expire(hourly_key, self.hourly_retention + DAY)
+            # The current hour may have fires which weren't counted, start with the next.
+            pipeline.set(HOURLY_START_KEY, (int(timestamp) // HOUR + 1) * HOUR, nx=True)
+            pipeline.expire(HOURLY_START_KEY, self.hourly_retention)
+            pipeline.set(FLUSH_SCHEDULED_KEY, 1, ex=self.flush_interval, nx=True)
+            pending, _, _, _, _, flush_scheduled = pipeline.execute()
+
+        from sentry.rules.history.tasks import flush_rule_fire_history
+
+        if flush_scheduled:
+            flush_rule_fire_history.apply_async(countdown=self.flush_interval)
+        elif pending % self.flush_size == 0:
+            flush_rule_fire_history.delay()
+
+    def flush(self) -> None:
+        from sentry.rules.history.tasks import flush_rule_fire_history
+
+        while True:
+            # Flushes can run concurrently, records are popped atomically so that each of
+            # them is only written once.
+            records = pop_records(self.client, [BUFFER_KEY], [self.flush_size])
+            if not records:
+                return
+
+            try:
+                self._write_records(records)
+            except Exception:
+                # Put the records back, and make sure a flush retries them even if no
+                # other rule fires.
+                self.client.rpush(BUFFER_KEY, *records)
+                flush_rule_fire_history.apply_async(countdown=self.flush_interval)
+                raise
+
+            if len(records) < self.flush_size:
+                return
+
+    def _write_records(self, records: Sequence[bytes | str]) -> None:
+        rows: List[Dict[str, Any]] = []
+        for record in records:
+            if isinstance(record, bytes):
+                record = record.decode("utf-8")
+            try:
+                project_id, rule_id, group_id, timestamp = record.split(":")
+                rows.append(
+                    {
+                        "project_id": int(project_id),
+                        "rule_id": int(rule_id),
+                        "group_id": int(group_id),
+                        "date_added": to_datetime(float(timestamp)),
+                    }
+                )
+            except ValueError:
+                logger.error("rule_fire_history.invalid_record", extra={"record": record})
+
+        # `rule` is the only foreign key with a constraint, so drop fires of rules that were
+        # deleted while their records sat in the buffer.
+        existing_rule_ids = set(
+            Rule.objects.filter(id__in={row["rule_id"] for row in rows}).values_list(
+                "id", flat=True
+            )
+        )
+        history = [RuleFireHistory(**row) for row in rows if row["rule_id"] in existing_rule_ids]
+        RuleFireHistory.objects.bulk_create(history, batch_size=self.flush_size)
+        metrics.incr("rules.history.flush", amount=len(history), skip_internal=True)
+
+    def fetch_rule_hourly_stats(
+        self, rule: Rule, start: datetime, end: datetime
+    ) -> Sequence[TimeSeriesValue]:
+        start = start.replace(tzinfo=pytz.utc)
+        end = end.replace(tzinfo=pytz.utc)
+        if to_timestamp(start) < time() - self.hourly_retention:
+            return super().fetch_rule_hourly_stats(rule, start, end)
+
+        hourly_start_value = self.client.get(HOURLY_START_KEY)
+        if hourly_start_value is None:
+            return super().fetch_rule_hourly_stats(rule, start, end)
+        hourly_start = int(hourly_start_value)
+        if hourly_start >= to_timestamp(end):
+            return super().fetch_rule_hourly_stats(rule, start, end)
+
+        counts: MutableMapping[datetime, int] = {}
+        if to_timestamp(start) < hourly_start:
+            counts.update(self._fetch_hourly_counts(rule, start, to_datetime(hourly_start)))
+
+        days = range(
+            int(max(to_timestamp(start), hourly_start)) // DAY, int(to_timestamp(end)) // DAY + 1
+        )
+        with self.client.pipeline(transaction=False) as pipeline:
+            for day in days:
+                pipeline.hgetall(_hourly_key(rule.id, day))
+            buckets = pipeline.execute()
+
+        for day, hours in zip(days, buckets):
+            for hour, count in hours.items():
+                bucket = day * DAY + int(hour) * HOUR
+                if bucket >= hourly_start:
+                    counts[to_datetime(bucket)] = int(count)
+        return fill_hourly_buckets(counts, start, end)
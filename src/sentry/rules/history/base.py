@@ -29,7 +29,7 @@ class RuleHistoryBackend(Service):
     This backend is an interface for storing and retrieving issue alert fire history.
     """
 
-    __all__ = ("record", "fetch_rule_groups_paginated", "fetch_rule_hourly_stats")
+    __all__ = ("record", "flush", "fetch_rule_groups_paginated", "fetch_rule_hourly_stats")
 
     def record(self, rule: Rule, group: Group) -> None:
         """
@@ -37,6 +37,13 @@ class RuleHistoryBackend(Service):
         """
         raise NotImplementedError
 
+    def flush(self) -> None:
+        """
+        Writes out any records that were buffered by `record`. Backends that store records
+        synchronously don't need to implement this.
+        """
+        pass
+
     def fetch_rule_groups_paginated(
         self, rule: Rule, start: datetime, end: datetime, cursor: Cursor, per_page: int
     ) -> CursorResult:
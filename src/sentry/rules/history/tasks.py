@@ -0,0 +1,15 @@
+from sentry.tasks.base import instrumented_task
+
+
+@instrumented_task(
+    name="sentry.rules.history.tasks.flush_rule_fire_history",
+    time_limit=65,
+    soft_time_limit=60,
+)
+def flush_rule_fire_history(**kwargs):
+    """
+    Writes out rule fires buffered by the rule history backend.
+    """
+    from sentry.rules import history
+
+    history.flush()
@@ -29,6 +29,7 @@ class RuleProcessor:
         is_regression: bool,
         is_new_group_environment: bool,
         has_reappeared: bool,
+        rules: Sequence[Rule] | None = None,
     ) -> None:
         self.event = event
         self.group = event.group
@@ -38,6 +39,7 @@ class RuleProcessor:
         self.is_regression = is_regression
         self.is_new_group_environment = is_new_group_environment
         self.has_reappeared = has_reappeared
+        self.rules = rules
 
         self.grouped_futures: MutableMapping[
             str, Tuple[Callable[[Event, Sequence[RuleFuture]], None], List[RuleFuture]]
@@ -45,6 +47,8 @@ class RuleProcessor:
 
     def get_rules(self) -> Sequence[Rule]:
         """Get all of the rules for this project from the DB (or cache)."""
+        if self.rules is not None:
+            return self.rules
         rules_: Sequence[Rule] = Rule.get_for_project(self.project.id)
         return rules_
 
@@ -388,6 +388,18 @@ def post_process_forwarder(**options):
     type=click.Choice(["earliest", "latest"]),
     help="Force subscriptions to start from a particular offset",
 )
+@click.option(
+    "--max-batch-size",
+    default=1,
+    type=int,
+    help="How many messages to consume and handle at once. Messages are handled one by one by default.",
+)
+@click.option(
+    "--partition-workers",
+    default=1,
+    type=int,
+    help="How many partitions of a batch to handle concurrently.",
+)
 @log_options()
 @configuration
 def query_subscription_consumer(**options):
@@ -400,6 +412,8 @@ def query_subscription_consumer(**options):
         commit_batch_timeout_ms=options["commit_batch_timeout_ms"],
         initial_offset_reset=options["initial_offset_reset"],
         force_offset_reset=options["force_offset_reset"],
+        max_batch_size=options["max_batch_size"],
+        partition_workers=options["partition_workers"],
     )
 
     def handler(signum, frame):
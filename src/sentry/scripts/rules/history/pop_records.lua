@@ -0,0 +1,6 @@
+local key = KEYS[1]
+local count = tonumber(ARGV[1])
+
+local records = redis.call('LRANGE', key, 0, count - 1)
+redis.call('LTRIM', key, count, -1)
+return records
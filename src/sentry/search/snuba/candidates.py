@@ -0,0 +1,76 @@
+"""
+Candidate sets of the postgres side of issue searches.
+
+Before querying snuba, issue search fetches the ids of the groups matching the postgres
+filters of the search (status, assignee, bookmarks, ...). Small sets are passed down to
+snuba, larger ones are used to post-filter the snuba results in memory. Sets are cached
+for a short time in a compact encoding, so that following pages of a search don't have
+to run the query again.
+"""
+
+from __future__ import annotations
+
+import zlib
+from array import array
+from hashlib import md5
+from typing import FrozenSet, Optional, Sequence
+
+from django.core.exceptions import EmptyResultSet
+
+from sentry.db.models.manager.base_query_set import BaseQuerySet
+from sentry.utils import metrics
+from sentry.utils.cache import cache
+
+
+def encode_group_ids(group_ids: Sequence[int]) -> bytes:
+    """
+    Encodes a set of group ids as the zlib-compressed deltas of the sorted ids. Ids of a
+    project are mostly close to each other, so the deltas compress well.
+    """
+    deltas = array("Q")
+    previous = 0
+    for group_id in sorted(group_ids):
+        deltas.append(group_id - previous)
+        previous = group_id
+    return zlib.compress(deltas.tobytes())
+
+
+def decode_group_ids(value: bytes) -> FrozenSet[int]:
+    deltas = array("Q")
+    deltas.frombytes(zlib.decompress(value))
+    group_ids = []
+    current = 0
+    for delta in deltas:
+        current += delta
+        group_ids.append(current)
+    return frozenset(group_ids)
+
+
+def get_cache_key(group_queryset: BaseQuerySet, limit: int) -> Optional[str]:
+    try:
+        sql = str(group_queryset.query)
+    except EmptyResultSet:
+        return None
+    return "search:candidates:{}".format(md5(f"{limit}:{sql}".encode("utf-8")).hexdigest())
+
+
+def get_candidates(group_queryset: BaseQuerySet, limit: int, ttl: int) -> FrozenSet[int]:
+    """
+    Returns the ids of up to `limit` groups matching `group_queryset`. The result has more
+    than `limit` ids if there are more matching groups, the set is then incomplete.
+    """
+    cache_key = get_cache_key(group_queryset, limit) if ttl > 0 else None
+    if cache_key is not None:
+        value = cache.get(cache_key)
+        if value is not None:
+            metrics.incr("snuba.search.candidates.cache_hit", skip_internal=False)
+            return decode_group_ids(value)
+        metrics.incr("snuba.search.candidates.cache_miss", skip_internal=False)
+
+    group_ids = list(group_queryset.using_replica().values_list("id", flat=True)[: limit + 1])
+
+    if cache_key is not None:
+        value = encode_group_ids(group_ids)
+        metrics.timing("snuba.search.candidates.size", len(value))
+        cache.set(cache_key, value, ttl)
+    return frozenset(group_ids)
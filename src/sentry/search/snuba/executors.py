@@ -6,9 +6,10 @@ from abc import ABCMeta, abstractmethod
 from dataclasses import replace
 from datetime import datetime, timedelta
 from hashlib import md5
-from typing import Any, List, Mapping, Sequence, Set, Tuple
+from typing import Any, FrozenSet, List, Mapping, Sequence, Set, Tuple
 
 import sentry_sdk
+from django.db.models import Model
 from django.utils import timezone
 from snuba_sdk import Direction, Op
 from snuba_sdk.expressions import Expression
@@ -23,10 +24,18 @@ from sentry.db.models.manager.base_query_set import BaseQuerySet
 from sentry.models import Environment, Group, Optional, Project
 from sentry.search.events.fields import DateArg
 from sentry.search.events.filter import convert_search_filter_to_snuba_query
+from sentry.search.snuba.candidates import get_candidates
 from sentry.search.utils import validate_cdc_search_filters
 from sentry.utils import json, metrics, snuba
+from sentry.utils.cache import cache
 from sentry.utils.cursors import Cursor, CursorResult
 
+# How long to wait for a scheduled hits estimate before scheduling another one
+HITS_ESTIMATE_SCHEDULE_TIMEOUT = 60
+
+# Granularity, in seconds, of the dates in the cache key of hits estimates
+HITS_CACHE_DATE_GRANULARITY = 60
+
 
 def get_search_filter(search_filters: Sequence[SearchFilter], name: str, operator: str) -> Any:
     """
@@ -51,6 +60,62 @@ def get_search_filter(search_filters: Sequence[SearchFilter], name: str, operato
     return found_val
 
 
+def _serialize_search_value(value: Any) -> Any:
+    if isinstance(value, (list, tuple, set, frozenset)):
+        values = [_serialize_search_value(v) for v in value]
+        return sorted(values, key=repr) if isinstance(value, (set, frozenset)) else values
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Model):
+        # The repr of model instances includes their address, so use their id instead.
+        return [value._meta.label, value.id]
+    return value
+
+
+def _serialize_search_filters(search_filters: Optional[Sequence[SearchFilter]]) -> List[Any]:
+    return sorted(
+        (
+            [f.key.name, f.operator, _serialize_search_value(f.value.raw_value)]
+            for f in search_filters or []
+        ),
+        key=repr,
+    )
+
+
+def _get_hits_cache_bucket(value: Optional[datetime]) -> Optional[int]:
+    return int(value.timestamp() // HITS_CACHE_DATE_GRANULARITY) if value else None
+
+
+def get_hits_cache_key(
+    project_ids: Sequence[int],
+    environment_ids: Optional[Sequence[int]],
+    sort_field: str,
+    search_filters: Optional[Sequence[SearchFilter]],
+    start: Optional[datetime],
+    end: Optional[datetime],
+    retention_window_start: Optional[datetime],
+) -> str:
+    """
+    Builds the cache key of the hits estimate of a search. The key doesn't depend on the
+    cursor, so that every page of the same search shares the estimate. Dates are bucketed
+    to `HITS_CACHE_DATE_GRANULARITY`, since relative date ranges move with every request.
+    """
+    key = md5(
+        json.dumps(
+            [
+                sorted(project_ids),
+                sorted(environment_ids) if environment_ids else None,
+                sort_field,
+                _serialize_search_filters(search_filters),
+                _get_hits_cache_bucket(start),
+                _get_hits_cache_bucket(end),
+                _get_hits_cache_bucket(retention_window_start),
+            ]
+        ).encode("utf-8")
+    ).hexdigest()
+    return f"search:hits:{key}"
+
+
 class AbstractQueryExecutor(metaclass=ABCMeta):
     """This class serves as a template for Query Executors.
     We subclass it in order to implement query methods (we use it to implement two classes: joined Postgres+Snuba queries, and Snuba only queries)
@@ -395,16 +460,25 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
         # to something that we can send down to Snuba in a `group_id IN (...)`
         # clause.
         max_candidates = options.get("snuba.search.max-pre-snuba-candidates")
+        # Larger candidate sets can't be passed down to snuba, but can still be used to
+        # post-filter the snuba results without going back to postgres.
+        max_post_filter_candidates = max(
+            max_candidates, options.get("snuba.search.max-post-filter-candidates")
+        )
 
         with sentry_sdk.start_span(op="snuba_group_query") as span:
-            group_ids = list(
-                group_queryset.using_replica().values_list("id", flat=True)[: max_candidates + 1]
+            candidates = get_candidates(
+                group_queryset,
+                max_post_filter_candidates,
+                options.get("snuba.search.candidates-cache-ttl"),
             )
+            group_ids = list(candidates)
             span.set_data("Max Candidates", max_candidates)
             span.set_data("Result Size", len(group_ids))
         metrics.timing("snuba.search.num_candidates", len(group_ids))
 
         too_many_candidates = False
+        post_filter_candidates: Optional[FrozenSet[int]] = None
         if not group_ids:
             # no matches could possibly be found from this point on
             metrics.incr("snuba.search.no_candidates", skip_internal=False)
@@ -421,6 +495,8 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
             metrics.incr("snuba.search.too_many_candidates", skip_internal=False)
             too_many_candidates = True
             group_ids = []
+            if len(candidates) <= max_post_filter_candidates:
+                post_filter_candidates = candidates
 
         sort_field = self.sort_strategies[sort_by]
         chunk_growth = options.get("snuba.search.chunk-growth-rate")
@@ -505,9 +581,14 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
             else:
                 # pre-filtered candidates were *not* passed down to Snuba,
                 # so we need to do post-filtering to verify Sentry DB predicates
-                filtered_group_ids = group_queryset.filter(
-                    id__in=[gid for gid, _ in snuba_groups]
-                ).values_list("id", flat=True)
+                if post_filter_candidates is not None:
+                    filtered_group_ids = [
+                        gid for gid, _ in snuba_groups if gid in post_filter_candidates
+                    ]
+                else:
+                    filtered_group_ids = group_queryset.filter(
+                        id__in=[gid for gid, _ in snuba_groups]
+                    ).values_list("id", flat=True)
 
                 group_to_score = dict(snuba_groups)
                 for group_id in filtered_group_ids:
@@ -591,66 +672,134 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
             # or if we have a cursor that bisects the overall result set (such
             # that our query only sees results on one side of the cursor) then
             # we need an alternative way to figure out the total hits that this
-            # query has.
-
-            # To do this, we get a sample of groups matching the snuba side of
-            # the query, and see how many of those pass the post-filter in
-            # postgres. This should give us an estimate of the total number of
-            # snuba matches that will be overall matches, which we can use to
-            # get an estimate for X-Hits.
-
-            # The sampling is not simple random sampling. It will return *all*
-            # matching groups if there are less than N groups matching the
-            # query, or it will return a random, deterministic subset of N of
-            # the groups if there are more than N overall matches. This means
-            # that the "estimate" is actually an accurate result when there are
-            # less than N matching groups.
-
-            # The number of samples required to achieve a certain error bound
-            # with a certain confidence interval can be calculated from a
-            # rearrangement of the normal approximation (Wald) confidence
-            # interval formula:
-            #
-            # https://en.wikipedia.org/wiki/Binomial_proportion_confidence_interval
-            #
-            # Effectively if we want the estimate to be within +/- 10% of the
-            # real value with 95% confidence, we would need (1.96^2 * p*(1-p))
-            # / 0.1^2 samples. With a starting assumption of p=0.5 (this
-            # requires the most samples) we would need 96 samples to achieve
-            # +/-10% @ 95% confidence.
-
-            sample_size = options.get("snuba.search.hits-sample-size")
-            kwargs = dict(
-                start=start,
-                end=end,
-                project_ids=[p.id for p in projects],
-                environment_ids=environments and [environment.id for environment in environments],
-                organization_id=projects[0].organization_id,
-                sort_field=sort_field,
-                limit=sample_size,
-                offset=0,
-                get_sample=True,
-                search_filters=search_filters,
+            # query has. Estimates are cached, so that paginating through the
+            # results of a search only estimates them once.
+            project_ids = [p.id for p in projects]
+            environment_ids = environments and [environment.id for environment in environments]
+            cache_key = get_hits_cache_key(
+                project_ids,
+                environment_ids,
+                sort_field,
+                search_filters,
+                start,
+                end,
+                retention_window_start,
             )
-            if not too_many_candidates:
-                kwargs["group_ids"] = group_ids
-
-            snuba_groups, snuba_total = self.snuba_search(**kwargs)
-            snuba_count = len(snuba_groups)
-            if snuba_count == 0:
-                # Maybe check for 0 hits and return EMPTY_RESULT in ::query? self.empty_result
-                return 0
-            else:
-                filtered_count = group_queryset.filter(
-                    id__in=[gid for gid, _ in snuba_groups]
-                ).count()
-
-                hit_ratio = filtered_count / float(snuba_count)
-                hits = int(hit_ratio * snuba_total)
-                return hits
+            hits = cache.get(cache_key)
+            if hits is not None:
+                metrics.incr("snuba.search.hits_estimate.cache_hit", skip_internal=False)
+                return int(hits)
+
+            if cursor is None and options.get("snuba.search.hits-estimate-async"):
+                # Don't block the first page on the estimate, the following ones can use it.
+                if cache.add(f"{cache_key}:scheduled", True, HITS_ESTIMATE_SCHEDULE_TIMEOUT):
+                    metrics.incr("snuba.search.hits_estimate.scheduled", skip_internal=False)
+                    from sentry.search.snuba.tasks import estimate_hits
+
+                    estimate_hits.delay(
+                        executor_cls=type(self),
+                        cache_key=cache_key,
+                        group_ids=None if too_many_candidates else group_ids,
+                        sort_field=sort_field,
+                        project_ids=project_ids,
+                        environment_ids=environment_ids,
+                        organization_id=projects[0].organization_id,
+                        group_query=group_queryset.query,
+                        search_filters=search_filters,
+                        start=start,
+                        end=end,
+                    )
+                return None
+
+            metrics.incr("snuba.search.hits_estimate.cache_miss", skip_internal=False)
+            hits = self.estimate_hits(
+                None if too_many_candidates else group_ids,
+                sort_field,
+                project_ids,
+                environment_ids,
+                projects[0].organization_id,
+                group_queryset,
+                search_filters,
+                start,
+                end,
+            )
+            cache.set(cache_key, hits, options.get("snuba.search.hits-cache-ttl"))
+            return hits
 
         return None
 
+    def estimate_hits(
+        self,
+        group_ids: Optional[Sequence[int]],
+        sort_field: str,
+        project_ids: Sequence[int],
+        environment_ids: Optional[Sequence[int]],
+        organization_id: int,
+        group_queryset: Query,
+        search_filters: Sequence[SearchFilter],
+        start: datetime,
+        end: datetime,
+    ) -> int:
+        """
+        Estimates the number of hits of a search by checking how many of a sample of the
+        groups matching the snuba side of the search pass the postgres filter.
+
+        :param group_ids: The postgres candidates to restrict the sample to, if there
+            weren't too many of them.
+        """
+        # We get a sample of groups matching the snuba side of the query, and see how
+        # many of those pass the post-filter in postgres. This should give us an
+        # estimate of the total number of snuba matches that will be overall matches,
+        # which we can use to get an estimate for X-Hits.
+
+        # The sampling is not simple random sampling. It will return *all*
+        # matching groups if there are less than N groups matching the
+        # query, or it will return a random, deterministic subset of N of
+        # the groups if there are more than N overall matches. This means
+        # that the "estimate" is actually an accurate result when there are
+        # less than N matching groups.
+
+        # The number of samples required to achieve a certain error bound
+        # with a certain confidence interval can be calculated from a
+        # rearrangement of the normal approximation (Wald) confidence
+        # interval formula:
+        #
+        # https://en.wikipedia.org/wiki/Binomial_proportion_confidence_interval
+        #
+        # Effectively if we want the estimate to be within +/- 10% of the
+        # real value with 95% confidence, we would need (1.96^2 * p*(1-p))
+        # / 0.1^2 samples. With a starting assumption of p=0.5 (this
+        # requires the most samples) we would need 96 samples to achieve
+        # +/-10% @ 95% confidence.
+
+        sample_size = options.get("snuba.search.hits-sample-size")
+        kwargs = dict(
+            start=start,
+            end=end,
+            project_ids=project_ids,
+            environment_ids=environment_ids,
+            organization_id=organization_id,
+            sort_field=sort_field,
+            limit=sample_size,
+            offset=0,
+            get_sample=True,
+            search_filters=search_filters,
+        )
+        if group_ids is not None:
+            kwargs["group_ids"] = group_ids
+
+        snuba_groups, snuba_total = self.snuba_search(**kwargs)
+        snuba_count = len(snuba_groups)
+        if snuba_count == 0:
+            # Maybe check for 0 hits and return EMPTY_RESULT in ::query? self.empty_result
+            return 0
+        else:
+            filtered_count = group_queryset.filter(id__in=[gid for gid, _ in snuba_groups]).count()
+
+            hit_ratio = filtered_count / float(snuba_count)
+            hits = int(hit_ratio * snuba_total)
+            return hits
+
 
 class InvalidQueryForExecutor(Exception):
     pass
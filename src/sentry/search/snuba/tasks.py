@@ -0,0 +1,47 @@
+from sentry import options
+from sentry.tasks.base import instrumented_task
+
+
+@instrumented_task(
+    name="sentry.search.snuba.tasks.estimate_hits",
+    queue="search",
+    time_limit=65,
+    soft_time_limit=60,
+)
+def estimate_hits(
+    executor_cls,
+    cache_key,
+    group_ids,
+    sort_field,
+    project_ids,
+    environment_ids,
+    organization_id,
+    group_query,
+    search_filters,
+    start,
+    end,
+    **kwargs,
+):
+    """
+    Estimates the hits of an issue search and caches them for the following pages of the
+    search. `group_query` is the query of the postgres side of the search, as a queryset
+    can't be passed without evaluating it.
+    """
+    from sentry.models import Group
+    from sentry.utils.cache import cache
+
+    group_queryset = Group.objects.all()
+    group_queryset.query = group_query
+
+    hits = executor_cls().estimate_hits(
+        group_ids,
+        sort_field,
+        project_ids,
+        environment_ids,
+        organization_id,
+        group_queryset,
+        search_filters,
+        start,
+        end,
+    )
+    cache.set(cache_key, hits, options.get("snuba.search.hits-cache-ttl"))
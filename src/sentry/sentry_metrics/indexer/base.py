@@ -1,4 +1,4 @@
-from typing import Dict, MutableMapping, Optional, Set
+from typing import Mapping, MutableMapping, Optional, Set
 
 from sentry.utils.services import Service
 
@@ -11,9 +11,17 @@ class StringIndexer(Service):
     Check `sentry.snuba.metrics` for convenience functions.
     """
 
-    __all__ = ("record", "resolve", "reverse_resolve", "bulk_record")
+    __all__ = ("record", "resolve", "reverse_resolve", "bulk_record", "warm")
 
-    def bulk_record(self, org_strings: MutableMapping[int, Set[str]]) -> Dict[str, int]:
+    def bulk_record(
+        self, org_strings: MutableMapping[int, Set[str]]
+    ) -> Mapping[int, Mapping[str, int]]:
+        """Store the strings of each organization, and return their integer IDs by
+        organization.
+
+        Strings that couldn't be recorded (e.g. because the organization has too
+        many of them) are missing from the result.
+        """
         raise NotImplementedError()
 
     def record(self, org_id: int, string: str) -> int:
@@ -39,3 +47,6 @@ class StringIndexer(Service):
         Returns None if the entry cannot be found.
         """
         raise NotImplementedError()
+
+    def warm(self, limit: int) -> None:
+        """Preload up to `limit` of the most used entries, if the backend caches them."""
@@ -0,0 +1,63 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Generic, Hashable, Mapping, Optional, Sequence, TypeVar
+
+from sentry.utils import metrics
+
+_LOCAL_CACHE_HIT_METRIC = "sentry_metrics.indexer.local_cache.hit"
+_LOCAL_CACHE_MISS_METRIC = "sentry_metrics.indexer.local_cache.miss"
+
+K = TypeVar("K", bound=Hashable)
+
+
+class StringCache(Generic[K]):
+    """
+    Bounded in-process LRU of indexed strings, in both directions. Strings are keyed
+    by the string itself, or by whatever else the indexer scopes them with.
+
+    The id of a string never changes once it has been indexed, so entries never
+    need to be invalidated and are only evicted to bound memory.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._ids: "OrderedDict[K, int]" = OrderedDict()
+        self._strings: Dict[int, K] = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, strings: Sequence[K]) -> Dict[K, int]:
+        result = {}
+        with self._lock:
+            for string in strings:
+                id = self._ids.get(string)
+                if id is not None:
+                    self._ids.move_to_end(string)
+                    result[string] = id
+
+        metrics.incr(_LOCAL_CACHE_HIT_METRIC, amount=len(result))
+        metrics.incr(_LOCAL_CACHE_MISS_METRIC, amount=len(strings) - len(result))
+        return result
+
+    def get_id(self, string: K) -> Optional[int]:
+        return self.get_many([string]).get(string)
+
+    def get_string(self, id: int) -> Optional[K]:
+        with self._lock:
+            string = self._strings.get(id)
+            if string is not None:
+                self._ids.move_to_end(string)
+        return string
+
+    def set_many(self, mapping: Mapping[K, int]) -> None:
+        with self._lock:
+            for string, id in mapping.items():
+                self._ids[string] = id
+                self._ids.move_to_end(string)
+                self._strings[id] = string
+
+            while len(self._ids) > self.max_size:
+                _, id = self._ids.popitem(last=False)
+                self._strings.pop(id, None)
+
+    def __len__(self) -> int:
+        return len(self._ids)
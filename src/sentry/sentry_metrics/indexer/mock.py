@@ -1,6 +1,6 @@
 import itertools
 from collections import defaultdict
-from typing import DefaultDict, Dict, MutableMapping, Optional, Set
+from typing import DefaultDict, Dict, Mapping, MutableMapping, Optional, Set
 
 from sentry.sentry_metrics.sessions import SessionMetricKey
 
@@ -33,11 +33,13 @@ class SimpleIndexer(StringIndexer):
         self._strings: DefaultDict[str, int] = defaultdict(self._counter.__next__)
         self._reverse: Dict[int, str] = {}
 
-    def bulk_record(self, org_strings: MutableMapping[int, Set[str]]) -> Dict[str, int]:
-        strings = set()
-        for _, strs in org_strings.items():
-            strings.update(strs)
-        return {string: self._record(string) for string in strings}
+    def bulk_record(
+        self, org_strings: MutableMapping[int, Set[str]]
+    ) -> Mapping[int, Mapping[str, int]]:
+        return {
+            org_id: {string: self._record(string) for string in strings}
+            for org_id, strings in org_strings.items()
+        }
 
     def record(self, org_id: int, string: str) -> int:
         return self._record(string)
@@ -1,5 +1,6 @@
 from typing import Any, Mapping, MutableMapping, Optional, Sequence, Set
 
+from sentry.sentry_metrics.indexer.cache import StringCache
 from sentry.sentry_metrics.indexer.models import MetricsKeyIndexer
 from sentry.utils import metrics
 from sentry.utils.services import Service
@@ -13,9 +14,17 @@ class PGStringIndexer(Service):
     """
     Provides integer IDs for metric names, tag keys and tag values
     and the corresponding reverse lookup.
+
+    With `local_cache_size`, up to that many strings are also kept in process in
+    front of the django cache, see `StringCache`.
     """
 
-    __all__ = ("record", "resolve", "reverse_resolve", "bulk_record")
+    __all__ = ("record", "resolve", "reverse_resolve", "bulk_record", "warm")
+
+    def __init__(self, local_cache_size: int = 0, **options: Any) -> None:
+        self._local_cache: Optional[StringCache[str]] = (
+            StringCache(local_cache_size) if local_cache_size else None
+        )
 
     def _bulk_record(self, unmapped_strings: Set[str]) -> Any:
         records = [MetricsKeyIndexer(string=string) for string in unmapped_strings]
@@ -31,19 +40,34 @@ class PGStringIndexer(Service):
         # (which should all exist point at this point), but also cache the results
         return MetricsKeyIndexer.objects.get_many_from_cache(list(unmapped_strings), key="string")
 
-    def bulk_record(self, org_strings: MutableMapping[int, Set[str]]) -> Mapping[str, int]:
-        # XXX(meredith): We are going to be changing the implementation of bulk_record
-        # in a future PR, so for now we don't need to do anything with the org_id, we just
-        # want the signature to be correct for the new implementation
+    def bulk_record(
+        self, org_strings: MutableMapping[int, Set[str]]
+    ) -> Mapping[int, Mapping[str, int]]:
+        # Strings aren't scoped by organization here, every organization gets the same ids.
         strings = set()
         for _, strs in org_strings.items():
             strings.update(strs)
 
+        mapping = self._record_strings(strings)
+        return {
+            org_id: {string: mapping[string] for string in strs}
+            for org_id, strs in org_strings.items()
+        }
+
+    def _record_strings(self, strings: Set[str]) -> Mapping[str, int]:
+        local_results: Mapping[str, int] = {}
+        if self._local_cache is not None:
+            local_results = self._local_cache.get_many(list(strings))
+            if len(local_results) == len(strings):
+                return dict(local_results)
+            strings.difference_update(local_results)
+
         cache_results: Sequence[Any] = MetricsKeyIndexer.objects.get_many_from_cache(
             list(strings), key="string"
         )
 
         mapped_result: MutableMapping[str, int] = {r.string: r.id for r in cache_results}
+        self._set_local(mapped_result)
 
         metrics.incr(_INDEXER_CACHE_FETCH_METRIC, amount=len(strings))
         unmapped = set(strings).difference(mapped_result.keys())
@@ -52,6 +76,7 @@ class PGStringIndexer(Service):
             # it's almost certain there would be a value we haven't seen before
             metrics.incr(_INDEXER_CACHE_HIT_METRIC, amount=len(strings))
             metrics.incr(_INDEXER_CACHE_MISS_METRIC, amount=0)
+            mapped_result.update(local_results)
             return mapped_result
 
         mapped = len(strings) - len(unmapped)
@@ -61,26 +86,38 @@ class PGStringIndexer(Service):
         with metrics.timer("sentry_metrics.indexer._bulk_record"):
             new_mapped = self._bulk_record(unmapped)
 
-        for new in new_mapped:
-            mapped_result[new.string] = new.id
+        new_result = {new.string: new.id for new in new_mapped}
+        self._set_local(new_result)
 
+        mapped_result.update(new_result)
+        mapped_result.update(local_results)
         return mapped_result
 
+    def _set_local(self, mapping: Mapping[str, int]) -> None:
+        if self._local_cache is not None and mapping:
+            self._local_cache.set_many(mapping)
+
     def record(self, org_id: int, string: str) -> int:
         """Store a string and return the integer ID generated for it"""
         result = self.bulk_record({org_id: {string}})
-        return result[string]
+        return result[org_id][string]
 
     def resolve(self, string: str) -> Optional[int]:
         """Lookup the integer ID for a string.
 
         Returns None if the entry cannot be found.
         """
+        if self._local_cache is not None:
+            local_id = self._local_cache.get_id(string)
+            if local_id is not None:
+                return local_id
+
         try:
             id: int = MetricsKeyIndexer.objects.get_from_cache(string=string).id
         except MetricsKeyIndexer.DoesNotExist:
             return None
 
+        self._set_local({string: id})
         return id
 
     def reverse_resolve(self, id: int) -> Optional[str]:
@@ -88,9 +125,29 @@ class PGStringIndexer(Service):
 
         Returns None if the entry cannot be found.
         """
+        if self._local_cache is not None:
+            local_string = self._local_cache.get_string(id)
+            if local_string is not None:
+                return local_string
+
         try:
             string: str = MetricsKeyIndexer.objects.get_from_cache(pk=id).string
         except MetricsKeyIndexer.DoesNotExist:
             return None
 
+        self._set_local({string: id})
         return string
+
+    def warm(self, limit: int) -> None:
+        """
+        Fills the local cache with up to `limit` of the first indexed strings. Those are
+        the metric names and tag keys every consumer process sees over and over.
+        """
+        if self._local_cache is None:
+            return
+
+        with metrics.timer("sentry_metrics.indexer.warm"):
+            rows = MetricsKeyIndexer.objects.order_by("id").values_list("string", "id")[
+                : min(limit, self._local_cache.max_size)
+            ]
+            self._set_local(dict(rows))
@@ -0,0 +1,214 @@
+from time import time
+from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import connections, router
+from django.db.models import Q
+from django.utils import timezone
+from psycopg2.extras import execute_values
+
+from sentry.sentry_metrics.indexer.cache import StringCache
+from sentry.sentry_metrics.indexer.models import StringIndexer
+from sentry.utils import metrics, redis
+from sentry.utils.services import Service
+
+OrgString = Tuple[int, str]
+
+_INSERT_QUERY = """
+    INSERT INTO sentry_stringindexer (string, organization_id, date_added, last_seen, retention_days)
+    VALUES %s
+    ON CONFLICT (string, organization_id) DO NOTHING
+    RETURNING organization_id, string, id
+"""
+
+
+class PGStringIndexerV2(Service):
+    """
+    Provides integer IDs for metric names, tag keys and tag values, scoped by
+    organization, and the corresponding reverse lookup.
+
+    New strings are inserted with a single statement returning the ids of the rows it
+    created, so only strings that were created concurrently by another consumer have
+    to be read back.
+
+    With `cardinality_limit`, an organization can only create that many new strings
+    per `cardinality_window` seconds. Strings over the limit aren't recorded and are
+    left out of the result of `bulk_record`.
+    """
+
+    __all__ = ("record", "resolve", "reverse_resolve", "bulk_record", "warm")
+
+    def __init__(
+        self,
+        local_cache_size: int = 0,
+        cardinality_limit: int = 0,
+        cardinality_window: int = 3600,
+        **options: Any,
+    ) -> None:
+        self._local_cache: Optional[StringCache[OrgString]] = (
+            StringCache(local_cache_size) if local_cache_size else None
+        )
+        self.cardinality_limit = cardinality_limit
+        self.cardinality_window = cardinality_window
+
+    def bulk_record(
+        self, org_strings: MutableMapping[int, Set[str]]
+    ) -> Mapping[int, Mapping[str, int]]:
+        keys = {(org_id, string) for org_id, strings in org_strings.items() for string in strings}
+
+        result: Dict[OrgString, int] = {}
+        if self._local_cache is not None:
+            result.update(self._local_cache.get_many(list(keys)))
+
+        missing = keys.difference(result)
+        if missing:
+            with metrics.timer("sentry_metrics.indexer.v2.fetch"):
+                fetched = self._fetch(missing)
+            self._set_local(fetched)
+            result.update(fetched)
+            missing.difference_update(fetched)
+
+        metrics.incr("sentry_metrics.indexer.v2.new_strings", amount=len(missing))
+        if missing:
+            missing = self._apply_cardinality_limit(missing)
+            with metrics.timer("sentry_metrics.indexer.v2.create"):
+                created = self._create(missing)
+            self._set_local(created)
+            result.update(created)
+
+        mapping: Dict[int, Dict[str, int]] = {org_id: {} for org_id in org_strings}
+        for (org_id, string), id in result.items():
+            mapping[org_id][string] = id
+        return mapping
+
+    def _fetch(self, keys: Iterable[OrgString]) -> Dict[OrgString, int]:
+        strings_by_org: Dict[int, Set[str]] = {}
+        for org_id, string in keys:
+            strings_by_org.setdefault(org_id, set()).add(string)
+
+        query = Q()
+        for org_id, strings in strings_by_org.items():
+            query |= Q(organization_id=org_id, string__in=strings)
+
+        return {
+            (org_id, string): id
+            for org_id, string, id in StringIndexer.objects.filter(query).values_list(
+                "organization_id", "string", "id"
+            )
+        }
+
+    def _create(self, keys: Set[OrgString]) -> Dict[OrgString, int]:
+        if not keys:
+            return {}
+
+        now = timezone.now()
+        using = router.db_for_write(StringIndexer)
+        with connections[using].cursor() as cursor:
+            rows = execute_values(
+                cursor,
+                _INSERT_QUERY,
+                [(string, org_id, now, now, 90) for org_id, string in keys],
+                fetch=True,
+            )
+        created = {(org_id, string): id for org_id, string, id in rows}
+
+        # The remaining strings were created by someone else in the meantime.
+        conflicts = keys.difference(created)
+        metrics.incr("sentry_metrics.indexer.v2.insert_conflicts", amount=len(conflicts))
+        if conflicts:
+            created.update(self._fetch(conflicts))
+        return created
+
+    def _apply_cardinality_limit(self, keys: Set[OrgString]) -> Set[OrgString]:
+        """
+        Counts the new strings of each organization against its limit, and returns the
+        ones that may be created.
+        """
+        if not self.cardinality_limit:
+            return keys
+
+        strings_by_org: Dict[int, List[str]] = {}
+        for org_id, string in sorted(keys):
+            strings_by_org.setdefault(org_id, []).append(string)
+
+        bucket = int(time() / self.cardinality_window)
+        client = redis.redis_clusters.get(settings.SENTRY_METRICS_INDEXER_REDIS_CLUSTER)
+        with client.pipeline(transaction=False) as pipeline:
+            for org_id, strings in strings_by_org.items():
+                redis_key = f"sentry-metrics:indexer:cardinality:{org_id}:{bucket}"
+                pipeline.incrby(redis_key, len(strings))
+                pipeline.expire(redis_key, self.cardinality_window)
+            counts = pipeline.execute()[::2]
+
+        allowed = set()
+        for (org_id, strings), count in zip(strings_by_org.items(), counts):
+            available = max(0, self.cardinality_limit - (count - len(strings)))
+            if available < len(strings):
+                metrics.incr(
+                    "sentry_metrics.indexer.v2.cardinality_limited",
+                    amount=len(strings) - available,
+                )
+            allowed.update((org_id, string) for string in strings[:available])
+        return allowed
+
+    def _set_local(self, mapping: Mapping[OrgString, int]) -> None:
+        if self._local_cache is not None and mapping:
+            self._local_cache.set_many(mapping)
+
+    def record(self, org_id: int, string: str) -> Optional[int]:
+        """Store a string and return the integer ID generated for it.
+
+        Returns None if the organization reached its cardinality limit.
+        """
+        return self.bulk_record({org_id: {string}})[org_id].get(string)
+
+    def resolve(self, string: str, org_id: Optional[int] = None) -> Optional[int]:
+        """Lookup the integer ID for a string of an organization.
+
+        Strings are scoped by organization, so returns None without an organization,
+        as well as if the entry cannot be found.
+        """
+        if org_id is None:
+            return None
+
+        key = (org_id, string)
+        if self._local_cache is not None:
+            local_id = self._local_cache.get_id(key)
+            if local_id is not None:
+                return local_id
+
+        id = self._fetch([key]).get(key)
+        if id is not None:
+            self._set_local({key: id})
+        return id
+
+    def reverse_resolve(self, id: int) -> Optional[str]:
+        """Lookup the stored string for a given integer ID.
+
+        Returns None if the entry cannot be found.
+        """
+        if self._local_cache is not None:
+            key = self._local_cache.get_string(id)
+            if key is not None:
+                return key[1]
+
+        try:
+            row = StringIndexer.objects.values_list("organization_id", "string").get(id=id)
+        except StringIndexer.DoesNotExist:
+            return None
+
+        self._set_local({row: id})
+        return row[1]
+
+    def warm(self, limit: int) -> None:
+        """
+        Fills the local cache with up to `limit` of the first indexed strings.
+        """
+        if self._local_cache is None:
+            return
+
+        with metrics.timer("sentry_metrics.indexer.warm"):
+            rows = StringIndexer.objects.order_by("id").values_list(
+                "organization_id", "string", "id"
+            )[: min(limit, self._local_cache.max_size)]
+            self._set_local({(org_id, string): id for org_id, string, id in rows})
@@ -3,7 +3,6 @@ import logging
 import time
 from collections import defaultdict, deque
 from concurrent.futures import Future
-from copy import deepcopy
 from dataclasses import dataclass
 from functools import partial
 from typing import (
@@ -46,6 +45,14 @@ def initializer() -> None:
     from sentry.runner import configure
 
     configure()
+    warm_indexer()
+
+
+def warm_indexer() -> None:
+    from django.conf import settings
+
+    if settings.SENTRY_METRICS_INDEXER_WARM_SIZE:
+        get_indexer().warm(settings.SENTRY_METRICS_INDEXER_WARM_SIZE)
 
 
 @functools.lru_cache(maxsize=10)
@@ -381,30 +388,44 @@ def process_messages(
         mapping = indexer.bulk_record(org_strings)
 
     new_messages: List[Message[KafkaPayload]] = []
+    cardinality_limited = 0
 
     with metrics.timer("process_messages.reconstruct_messages"):
         for message in outer_message.payload:
-            parsed_payload_value = parsed_payloads_by_offset[message.offset]
-            new_payload_value = deepcopy(parsed_payload_value)
-
-            metric_name = parsed_payload_value["name"]
-            tags = parsed_payload_value.get("tags", {})
+            # The parsed payloads aren't used for anything else, so they are rewritten
+            # in place rather than copied.
+            payload_value = parsed_payloads_by_offset[message.offset]
+            tags = payload_value.get("tags", {})
+            org_mapping = mapping.get(payload_value["org_id"])
+            if org_mapping is None:
+                logger.error(
+                    "process_messages.key_error",
+                    extra={"org_id": payload_value["org_id"], "tags": tags},
+                )
+                continue
 
-            try:
-                new_tags: Mapping[int, int] = {mapping[k]: mapping[v] for k, v in tags.items()}
-            except KeyError:
-                logger.error("process_messages.key_error", extra={"tags": tags}, exc_info=True)
+            # The indexer leaves out the strings it didn't record because the organization
+            # reached its cardinality limit, their messages are dropped.
+            if payload_value["name"] not in org_mapping or any(
+                k not in org_mapping or v not in org_mapping for k, v in tags.items()
+            ):
+                cardinality_limited += 1
                 continue
 
-            new_payload_value["tags"] = new_tags
-            new_payload_value["metric_id"] = mapping[metric_name]
-            new_payload_value["retention_days"] = 90
+            # Keys are serialized as strings either way, rapidjson only accepts strings.
+            new_tags: Mapping[str, int] = {
+                str(org_mapping[k]): org_mapping[v] for k, v in tags.items()
+            }
+            metric_id = org_mapping[payload_value["name"]]
 
-            del new_payload_value["name"]
+            del payload_value["name"]
+            payload_value["tags"] = new_tags
+            payload_value["metric_id"] = metric_id
+            payload_value["retention_days"] = 90
 
             new_payload = KafkaPayload(
                 key=message.payload.key,
-                value=json.dumps(new_payload_value).encode(),
+                value=json.dumps(payload_value, use_rapid_json=True).encode(),
                 headers=message.payload.headers,
             )
             new_message = Message(
@@ -415,6 +436,8 @@ def process_messages(
             )
             new_messages.append(new_message)
 
+    if cardinality_limited:
+        metrics.incr("process_messages.cardinality_limited", amount=cardinality_limited)
     metrics.incr("metrics_consumer.process_message.messages_seen", amount=len(new_messages))
 
     return new_messages
@@ -688,6 +711,7 @@ def get_streaming_metrics_consumer(
         )
     else:
         assert factory_name == "default"
+        warm_indexer()
         processing_factory = BatchConsumerStrategyFactory(
             max_batch_size=max_batch_size,
             max_batch_time=max_batch_time,
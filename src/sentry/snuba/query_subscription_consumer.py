@@ -1,8 +1,10 @@
 import logging
 import re
 import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from random import random
-from typing import Any, Callable, Dict, Iterable, List, Optional, cast
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, cast
 
 import jsonschema
 import pytz
@@ -13,9 +15,10 @@ from dateutil.parser import parse as parse_date
 from django.conf import settings
 
 from sentry import options
+from sentry.models import Project
 from sentry.snuba.dataset import EntityKey
 from sentry.snuba.json_schemas import SUBSCRIPTION_PAYLOAD_VERSIONS, SUBSCRIPTION_WRAPPER_SCHEMA
-from sentry.snuba.models import QueryDatasets, QuerySubscription
+from sentry.snuba.models import QueryDatasets, QuerySubscription, SnubaQuery
 from sentry.snuba.tasks import _delete_from_snuba
 from sentry.utils import json, kafka_config, metrics
 from sentry.utils.batching_kafka_consumer import wait_for_topics
@@ -23,8 +26,12 @@ from sentry.utils.batching_kafka_consumer import wait_for_topics
 logger = logging.getLogger(__name__)
 
 TQuerySubscriptionCallable = Callable[[Dict[str, Any], QuerySubscription], None]
+TQuerySubscriptionBatchCallable = Callable[
+    [Sequence[Tuple[Dict[str, Any], QuerySubscription]]], None
+]
 
 subscriber_registry: Dict[str, TQuerySubscriptionCallable] = {}
+batch_subscriber_registry: Dict[str, TQuerySubscriptionBatchCallable] = {}
 
 
 def register_subscriber(
@@ -39,6 +46,24 @@ def register_subscriber(
     return inner
 
 
+def register_batch_subscriber(
+    subscriber_key: str,
+) -> Callable[[TQuerySubscriptionBatchCallable], TQuerySubscriptionBatchCallable]:
+    """
+    Registers a callback handling all the updates of a subscription type in a batch of
+    messages at once, in the order they were received. Used instead of the callback
+    registered with `register_subscriber` when the consumer processes batches.
+    """
+
+    def inner(func: TQuerySubscriptionBatchCallable) -> TQuerySubscriptionBatchCallable:
+        if subscriber_key in batch_subscriber_registry:
+            raise Exception("Batch handler already registered for %s" % subscriber_key)
+        batch_subscriber_registry[subscriber_key] = func
+        return func
+
+    return inner
+
+
 class InvalidMessageError(Exception):
     pass
 
@@ -52,6 +77,12 @@ class QuerySubscriptionConsumer:
     A Kafka consumer that processes query subscription update messages. Each message has
     a related subscription id and the latest values related to the subscribed query.
     These values are passed along to a callback associated with the subscription.
+
+    With `max_batch_size` above 1, messages are consumed and handled in batches: the
+    subscriptions of a batch are loaded at once, and the updates are passed to the batch
+    callbacks of their subscription types. Partitions are handled on up to
+    `partition_workers` threads, messages of the same partition are always handled in
+    order.
     """
 
     topic_to_dataset: Dict[str, QueryDatasets] = {
@@ -69,6 +100,8 @@ class QuerySubscriptionConsumer:
         commit_batch_timeout_ms: int = 5000,
         initial_offset_reset: str = "earliest",
         force_offset_reset: Optional[str] = None,
+        max_batch_size: int = 1,
+        partition_workers: int = 1,
     ):
         self.group_id = group_id
         if not topic:
@@ -104,6 +137,14 @@ class QuerySubscriptionConsumer:
         self.resolve_partition_force_offset = self.offset_reset_name_to_func(force_offset_reset)
         self.__shutdown_requested = False
 
+        self.max_batch_size = max_batch_size
+        self.partition_workers = partition_workers
+        self.__executor: Optional[ThreadPoolExecutor] = None
+        if partition_workers > 1:
+            self.__executor = ThreadPoolExecutor(
+                max_workers=partition_workers, thread_name_prefix="query-subscription-consumer"
+            )
+
     def offset_reset_name_to_func(
         self, offset_reset: Optional[str]
     ) -> Optional[Callable[[TopicPartition], TopicPartition]]:
@@ -173,6 +214,10 @@ class QuerySubscriptionConsumer:
 
         i = 0
         while not self.__shutdown_requested:
+            if self.max_batch_size > 1:
+                i = self.__consume_batch(i)
+                continue
+
             message = self.consumer.poll(0.1)
             if message is None:
                 continue
@@ -218,6 +263,43 @@ class QuerySubscriptionConsumer:
         logger.debug("Committing offsets and closing consumer")
         self.commit_offsets()
         self.consumer.close()
+        if self.__executor is not None:
+            self.__executor.shutdown()
+
+    def __consume_batch(self, i: int) -> int:
+        """
+        Consumes and handles a batch of messages, returns the number of messages
+        consumed so far.
+        """
+        messages = self.consumer.consume(num_messages=self.max_batch_size, timeout=0.1)
+        if not messages:
+            return i
+
+        for message in messages:
+            error = message.error()
+            if error is not None:
+                raise KafkaException(error)
+
+        with sentry_sdk.start_transaction(
+            op="handle_messages",
+            name="query_subscription_consumer_process_messages",
+            sampled=random() <= options.get("subscriptions-query.sample-rate"),
+        ), metrics.timer("snuba_query_subscriber.handle_messages"):
+            self.handle_messages(messages)
+        metrics.timing("snuba_query_subscriber.batch_size", len(messages))
+
+        for message in messages:
+            self.offsets[message.partition()] = message.offset() + 1
+
+        previous, i = i, i + len(messages)
+        batch_by_size: bool = i // self.commit_batch_size > previous // self.commit_batch_size
+        batch_by_time: bool = (
+            self.__batch_deadline is not None and time.time() > self.__batch_deadline
+        )
+        if batch_by_time or batch_by_size:
+            logger.debug("Committing offsets")
+            self.commit_offsets()
+        return i
 
     def _reset_batch(self) -> None:
         self.__batch_deadline = None
@@ -285,50 +367,10 @@ class QuerySubscriptionConsumer:
                         metrics.incr("snuba_query_subscriber.subscription_inactive")
                         return
             except QuerySubscription.DoesNotExist:
-                metrics.incr("snuba_query_subscriber.subscription_doesnt_exist")
-                logger.error(
-                    "Received subscription update, but subscription does not exist",
-                    extra={
-                        "offset": message.offset(),
-                        "partition": message.partition(),
-                        "value": message.value(),
-                    },
-                )
-                try:
-                    if "entity" in contents:
-                        entity_key = contents["entity"]
-                    else:
-                        # XXX(ahmed): Remove this logic. This was kept here as backwards compat
-                        # for subscription updates with schema version `2`. However schema version 3
-                        # sends the "entity" in the payload
-                        entity_regex = r"^(MATCH|match)[ ]*\(([^)]+)\)"
-                        entity_match = re.match(entity_regex, contents["request"]["query"])
-                        if not entity_match:
-                            raise InvalidMessageError(
-                                "Unable to fetch entity from query in message"
-                            )
-                        entity_key = entity_match.group(2)
-                    _delete_from_snuba(
-                        self.topic_to_dataset[message.topic()],
-                        contents["subscription_id"],
-                        EntityKey(entity_key),
-                    )
-                except InvalidMessageError as e:
-                    logger.exception(e)
-                except Exception:
-                    logger.exception("Failed to delete unused subscription from snuba.")
+                self.handle_missing_subscription(message, contents)
                 return
 
-            if subscription.type not in subscriber_registry:
-                metrics.incr("snuba_query_subscriber.subscription_type_not_registered")
-                logger.error(
-                    "Received subscription update, but no subscription handler registered",
-                    extra={
-                        "offset": message.offset(),
-                        "partition": message.partition(),
-                        "value": message.value(),
-                    },
-                )
+            if not self.is_registered(message, subscription):
                 return
 
             sentry_sdk.set_tag("project_id", subscription.project_id)
@@ -350,6 +392,175 @@ class QuerySubscriptionConsumer:
 
                 callback(contents, subscription)
 
+    def handle_messages(self, messages: Sequence[Message]) -> None:
+        """
+        Handles a batch of messages. Messages of different partitions are independent
+        and are handled concurrently if `partition_workers` allows it.
+        """
+        if not self.__batch_deadline:
+            self.__batch_deadline = self.commit_batch_timeout_ms / 1000.0 + time.time()
+
+        messages_by_partition: Dict[int, List[Message]] = defaultdict(list)
+        for message in messages:
+            messages_by_partition[message.partition()].append(message)
+
+        if self.__executor is not None and len(messages_by_partition) > 1:
+            for _ in self.__executor.map(
+                self.handle_partition_messages, messages_by_partition.values()
+            ):
+                pass
+        else:
+            for partition_messages in messages_by_partition.values():
+                self.handle_partition_messages(partition_messages)
+
+    def handle_partition_messages(self, messages: Sequence[Message]) -> None:
+        """
+        Handles the messages of a single partition, in order. Subscriptions and their
+        queries and projects are loaded once for all the messages.
+        """
+        updates: List[Tuple[Message, Dict[str, Any]]] = []
+        for message in messages:
+            try:
+                with metrics.timer("snuba_query_subscriber.parse_message_value"):
+                    updates.append((message, self.parse_message_value(message.value())))
+            except InvalidMessageError:
+                logger.exception(
+                    "Subscription update could not be parsed",
+                    extra={
+                        "offset": message.offset(),
+                        "partition": message.partition(),
+                        "value": message.value(),
+                    },
+                )
+
+        with metrics.timer("snuba_query_subscriber.fetch_subscriptions"):
+            subscriptions = self.get_subscriptions(
+                {contents["subscription_id"] for _, contents in updates}
+            )
+
+        updates_by_type: Dict[
+            str, List[Tuple[Message, Dict[str, Any], QuerySubscription]]
+        ] = defaultdict(list)
+        for message, contents in updates:
+            subscription = subscriptions.get(contents["subscription_id"])
+            if subscription is None:
+                self.handle_missing_subscription(message, contents)
+            elif subscription.status != QuerySubscription.Status.ACTIVE.value:
+                metrics.incr("snuba_query_subscriber.subscription_inactive")
+            elif self.is_registered(message, subscription):
+                updates_by_type[subscription.type].append((message, contents, subscription))
+
+        for subscription_type, type_updates in updates_by_type.items():
+            with metrics.timer(
+                "snuba_query_subscriber.callback.duration", instance=subscription_type
+            ):
+                batch_callback = batch_subscriber_registry.get(subscription_type)
+                if batch_callback is not None:
+                    try:
+                        batch_callback(
+                            [(contents, subscription) for _, contents, subscription in type_updates]
+                        )
+                    except Exception:
+                        logger.exception(
+                            "Unexpected error while handling a batch of subscription updates.",
+                            extra={"subscription_type": subscription_type},
+                        )
+                    continue
+
+                callback = subscriber_registry[subscription_type]
+                for message, contents, subscription in type_updates:
+                    try:
+                        callback(contents, subscription)
+                    except Exception:
+                        logger.exception(
+                            "Unexpected error while handling message in QuerySubscriptionConsumer. Skipping message.",
+                            extra={
+                                "offset": message.offset(),
+                                "partition": message.partition(),
+                                "value": message.value(),
+                            },
+                        )
+
+    def get_subscriptions(self, subscription_ids: Iterable[str]) -> Dict[str, QuerySubscription]:
+        """
+        Fetches subscriptions by their snuba subscription id, along with their queries
+        and projects.
+        """
+        subscriptions = {
+            subscription.subscription_id: subscription
+            for subscription in QuerySubscription.objects.get_many_from_cache(
+                list(subscription_ids), key="subscription_id"
+            )
+        }
+
+        snuba_queries = SnubaQuery.objects.in_bulk(
+            {s.snuba_query_id for s in subscriptions.values() if s.snuba_query_id is not None}
+        )
+        projects = {
+            project.id: project
+            for project in Project.objects.get_many_from_cache(
+                list({s.project_id for s in subscriptions.values()})
+            )
+        }
+        for subscription in subscriptions.values():
+            if subscription.snuba_query_id in snuba_queries:
+                subscription.set_cached_field_value(
+                    "snuba_query", snuba_queries[subscription.snuba_query_id]
+                )
+            if subscription.project_id in projects:
+                subscription.set_cached_field_value("project", projects[subscription.project_id])
+        return subscriptions
+
+    def is_registered(self, message: Message, subscription: QuerySubscription) -> bool:
+        if subscription.type in subscriber_registry:
+            return True
+
+        metrics.incr("snuba_query_subscriber.subscription_type_not_registered")
+        logger.error(
+            "Received subscription update, but no subscription handler registered",
+            extra={
+                "offset": message.offset(),
+                "partition": message.partition(),
+                "value": message.value(),
+            },
+        )
+        return False
+
+    def handle_missing_subscription(self, message: Message, contents: Dict[str, Any]) -> None:
+        """
+        Deletes the snuba subscription of an update whose subscription doesn't exist.
+        """
+        metrics.incr("snuba_query_subscriber.subscription_doesnt_exist")
+        logger.error(
+            "Received subscription update, but subscription does not exist",
+            extra={
+                "offset": message.offset(),
+                "partition": message.partition(),
+                "value": message.value(),
+            },
+        )
+        try:
+            if "entity" in contents:
+                entity_key = contents["entity"]
+            else:
+                # XXX(ahmed): Remove this logic. This was kept here as backwards compat
+                # for subscription updates with schema version `2`. However schema version 3
+                # sends the "entity" in the payload
+                entity_regex = r"^(MATCH|match)[ ]*\(([^)]+)\)"
+                entity_match = re.match(entity_regex, contents["request"]["query"])
+                if not entity_match:
+                    raise InvalidMessageError("Unable to fetch entity from query in message")
+                entity_key = entity_match.group(2)
+            _delete_from_snuba(
+                self.topic_to_dataset[message.topic()],
+                contents["subscription_id"],
+                EntityKey(entity_key),
+            )
+        except InvalidMessageError as e:
+            logger.exception(e)
+        except Exception:
+            logger.exception("Failed to delete unused subscription from snuba.")
+
     def parse_message_value(self, value: str) -> Dict[str, Any]:
         """
         Parses the value received via the Kafka consumer and verifies that it
@@ -2,6 +2,7 @@ import logging
 from datetime import timedelta
 from uuid import uuid4
 
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import transaction
 from django.utils import timezone
@@ -130,11 +131,20 @@ def delete_groups(object_ids, transaction_id=None, eventstream_state=None, **kwa
 
     transaction_id = transaction_id or uuid4().hex
 
-    max_batch_size = 100
+    bulk_batch_size = settings.SENTRY_GROUP_BULK_DELETION_BATCH_SIZE
+    if bulk_batch_size:
+        max_batch_size = bulk_batch_size
+        task_options = {"bulk": True, "chunk_size": bulk_batch_size}
+    else:
+        max_batch_size = 100
+        task_options = {}
     current_batch, rest = object_ids[:max_batch_size], object_ids[max_batch_size:]
 
     task = deletions.get(
-        model=Group, query={"id__in": current_batch}, transaction_id=transaction_id
+        model=Group,
+        query={"id__in": current_batch},
+        transaction_id=transaction_id,
+        **task_options,
     )
     has_more = task.chunk()
     if has_more or rest:
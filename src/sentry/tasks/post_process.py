@@ -10,6 +10,7 @@ from sentry.signals import event_processed, issue_unignored, transaction_process
 from sentry.tasks.base import instrumented_task
 from sentry.utils import metrics
 from sentry.utils.cache import cache
+from sentry.utils.context_loader import ContextLoader
 from sentry.utils.locking import UnableToAcquireLock
 from sentry.utils.safe import safe_execute
 from sentry.utils.sdk import bind_organization_context, set_current_event_project
@@ -17,42 +18,112 @@ from sentry.utils.sdk import bind_organization_context, set_current_event_projec
 logger = logging.getLogger("sentry")
 
 
-def _get_service_hooks(project_id):
+def _get_service_hooks(project, group):
     from sentry.models import ServiceHook
 
-    cache_key = f"servicehooks:1:{project_id}"
-    result = cache.get(cache_key)
+    hooks = ServiceHook.objects.filter(servicehookproject__project_id=project.id)
+    return [(h.id, h.events) for h in hooks]
 
-    if result is None:
-        hooks = ServiceHook.objects.filter(servicehookproject__project_id=project_id)
-        result = [(h.id, h.events) for h in hooks]
-        cache.set(cache_key, result, 60)
-    return result
 
-
-def _should_send_error_created_hooks(project):
+def _should_send_error_created_hooks(project, group):
     from sentry.models import Organization, ServiceHook
 
-    cache_key = f"servicehooks-error-created:1:{project.id}"
-    result = cache.get(cache_key)
+    org = Organization.objects.get_from_cache(id=project.organization_id)
+    if not features.has("organizations:integrations-event-hooks", organization=org):
+        return 0
+
+    result = (
+        ServiceHook.objects.filter(organization_id=org.id)
+        .extra(where=["events @> '{error.created}'"])
+        .exists()
+    )
+    return 1 if result else 0
 
-    if result is None:
 
-        org = Organization.objects.get_from_cache(id=project.organization_id)
-        if not features.has("organizations:integrations-event-hooks", organization=org):
-            cache.set(cache_key, 0, 60)
-            return False
+def _org_has_commit(project, group):
+    from sentry.models import Commit
+
+    return Commit.objects.filter(organization_id=project.organization_id).exists()
+
+
+def _get_project_rules(project, group):
+    from sentry.models import Rule, RuleStatus
+
+    return list(Rule.objects.filter(project=project.id, status=RuleStatus.ACTIVE))
+
+
+def _get_group_snooze(project, group):
+    from sentry.models import GroupSnooze
+
+    try:
+        return GroupSnooze.objects.get(group=group)
+    except GroupSnooze.DoesNotExist:
+        return False
+
+
+def _group_snooze_cache_key(project, group):
+    from sentry.models import GroupSnooze
+
+    return GroupSnooze.get_cache_key(group.id)
 
-        result = (
-            ServiceHook.objects.filter(organization_id=org.id)
-            .extra(where=["events @> '{error.created}'"])
-            .exists()
-        )
 
-        cache_value = 1 if result else 0
-        cache.set(cache_key, cache_value, 60)
+def _project_rules_cache_key(project, group):
+    from sentry.models import Rule
 
-    return result
+    return Rule.get_project_cache_key(project.id)
+
+
+# Cached values that post processing reads for every event, fetched in a single round trip
+# by `post_process_group`. Values which have no invalidation and are cached for a while
+# anyway are additionally kept in a per-process cache for a few seconds.
+post_process_context = ContextLoader("post_process")
+post_process_context.register(
+    "service_hooks",
+    key=lambda project, group: f"servicehooks:1:{project.id}",
+    loader=_get_service_hooks,
+    ttl=60,
+    local_ttl=10,
+)
+post_process_context.register(
+    "send_error_created_hooks",
+    key=lambda project, group: f"servicehooks-error-created:1:{project.id}",
+    loader=_should_send_error_created_hooks,
+    ttl=60,
+    local_ttl=10,
+)
+post_process_context.register(
+    "org_has_commit",
+    key=lambda project, group: f"w-o:{project.organization_id}-h-c",
+    loader=_org_has_commit,
+    ttl=3600,
+    local_ttl=10,
+)
+post_process_context.register(
+    "rules",
+    key=_project_rules_cache_key,
+    loader=_get_project_rules,
+    ttl=60,
+)
+post_process_context.register(
+    "snooze",
+    key=_group_snooze_cache_key,
+    loader=_get_group_snooze,
+    # This cache is also set in post_save|delete.
+    ttl=3600,
+)
+post_process_context.register(
+    "owners_exists",
+    key=lambda project, group: f"owner_exists:1:{group.id}",
+    loader=lambda project, group: group.groupowner_set.exists(),
+    # Cache for an hour if it's assigned. We don't need to move that fast.
+    ttl=lambda exists: 3600 if exists else 60,
+)
+post_process_context.register(
+    "assignees_exists",
+    key=lambda project, group: f"assignee_exists:1:{group.id}",
+    loader=lambda project, group: group.assignee_set.exists(),
+    ttl=lambda exists: 3600 if exists else 60,
+)
 
 
 def _capture_stats(event, is_new):
@@ -79,26 +150,13 @@ def _capture_stats(event, is_new):
             metrics.incr("events.platform_mismatch", tags=tags)
 
 
-def handle_owner_assignment(project, group, event):
+def handle_owner_assignment(project, group, event, context):
     from sentry.models import GroupAssignee, ProjectOwnership
 
     with metrics.timer("post_process.handle_owner_assignment"):
-        with sentry_sdk.start_span(op="post_process.handle_owner_assignment.cache_set_owner"):
-            owner_key = "owner_exists:1:%s" % group.id
-            owners_exists = cache.get(owner_key)
-            if owners_exists is None:
-                owners_exists = group.groupowner_set.exists()
-                # Cache for an hour if it's assigned. We don't need to move that fast.
-                cache.set(owner_key, owners_exists, 3600 if owners_exists else 60)
-
-        with sentry_sdk.start_span(op="post_process.handle_owner_assignment.cache_set_assignee"):
-            # Is the issue already assigned to a team or user?
-            assignee_key = "assignee_exists:1:%s" % group.id
-            assignees_exists = cache.get(assignee_key)
-            if assignees_exists is None:
-                assignees_exists = group.assignee_set.exists()
-                # Cache for an hour if it's assigned. We don't need to move that fast.
-                cache.set(assignee_key, assignees_exists, 3600 if assignees_exists else 60)
+        owners_exists = context["owners_exists"]
+        # Is the issue already assigned to a team or user?
+        assignees_exists = context["assignees_exists"]
 
         if owners_exists and assignees_exists:
             return
@@ -241,7 +299,7 @@ def post_process_group(
     from sentry.reprocessing2 import is_reprocessed_event
     from sentry.utils import snuba
 
-    with snuba.options_override({"consistent": True}):
+    with snuba.options_override({"consistent": True}), features.evaluation_scope():
         # We use the data being present/missing in the processing store
         # to ensure that we don't duplicate work should the forwarding consumers
         # need to rewind history.
@@ -294,7 +352,7 @@ def post_process_group(
         # NOTE: we must pass through the full Event object, and not an
         # event_id since the Event object may not actually have been stored
         # in the database due to sampling.
-        from sentry.models import Commit, GroupInboxReason
+        from sentry.models import GroupInboxReason
         from sentry.models.group import get_group_with_redirect
         from sentry.models.groupinbox import add_group_to_inbox
         from sentry.rules.processor import RuleProcessor
@@ -317,6 +375,23 @@ def post_process_group(
 
         _capture_stats(event, is_new)
 
+        # Only load the context values that processing this event reads.
+        has_servicehooks = not is_reprocessed and features.has(
+            "projects:servicehooks", project=event.project
+        )
+        context_names = []
+        if not is_reprocessed:
+            context_names.extend(["owners_exists", "assignees_exists", "rules", "org_has_commit"])
+            if not is_new:
+                context_names.append("snooze")
+            if has_servicehooks:
+                context_names.append("service_hooks")
+            if event.get_event_type() == "error":
+                context_names.append("send_error_created_hooks")
+
+        with sentry_sdk.start_span(op="tasks.post_process_group.load_context"):
+            context = post_process_context.load(event.project, event.group, names=context_names)
+
         with sentry_sdk.start_span(op="tasks.post_process_group.add_group_to_inbox"):
             try:
                 if is_reprocessed and is_new:
@@ -330,7 +405,7 @@ def post_process_group(
             has_reappeared = not is_new
             try:
                 if has_reappeared:
-                    has_reappeared = process_snoozes(event.group)
+                    has_reappeared = process_snoozes(event.group, context["snooze"])
             except Exception:
                 logger.exception("Failed to process snoozes for group")
 
@@ -345,12 +420,18 @@ def post_process_group(
 
             with sentry_sdk.start_span(op="tasks.post_process_group.handle_owner_assignment"):
                 try:
-                    handle_owner_assignment(event.project, event.group, event)
+                    handle_owner_assignment(event.project, event.group, event, context)
                 except Exception:
                     logger.exception("Failed to handle owner assignments")
 
             rp = RuleProcessor(
-                event, is_new, is_regression, is_new_group_environment, has_reappeared
+                event,
+                is_new,
+                is_regression,
+                is_new_group_environment,
+                has_reappeared,
+                # Loads the rules itself if they couldn't be loaded with the context.
+                rules=context.get("rules"),
             )
             has_alert = False
             with sentry_sdk.start_span(op="tasks.post_process_group.rule_processor_callbacks"):
@@ -366,15 +447,7 @@ def post_process_group(
                     duration=10,
                 )
                 with lock.acquire():
-                    has_commit_key = f"w-o:{event.project.organization_id}-h-c"
-                    org_has_commit = cache.get(has_commit_key)
-                    if org_has_commit is None:
-                        org_has_commit = Commit.objects.filter(
-                            organization_id=event.project.organization_id
-                        ).exists()
-                        cache.set(has_commit_key, org_has_commit, 3600)
-
-                    if org_has_commit:
+                    if context["org_has_commit"]:
                         group_cache_key = f"w-o-i:g-{event.group_id}"
                         if cache.get(group_cache_key):
                             metrics.incr(
@@ -398,21 +471,19 @@ def post_process_group(
             except Exception:
                 logger.exception("Failed to process suspect commits")
 
-            if features.has("projects:servicehooks", project=event.project):
+            if has_servicehooks:
                 allowed_events = {"event.created"}
                 if has_alert:
                     allowed_events.add("event.alert")
 
                 if allowed_events:
-                    for servicehook_id, events in _get_service_hooks(project_id=event.project_id):
+                    for servicehook_id, events in context.get("service_hooks", ()):
                         if any(e in allowed_events for e in events):
                             process_service_hook.delay(servicehook_id=servicehook_id, event=event)
 
             from sentry.tasks.sentry_apps import process_resource_change_bound
 
-            if event.get_event_type() == "error" and _should_send_error_created_hooks(
-                event.project
-            ):
+            if event.get_event_type() == "error" and context.get("send_error_created_hooks"):
                 process_resource_change_bound.delay(
                     action="created", sender="Error", instance_id=event.event_id, instance=event
                 )
@@ -449,29 +520,14 @@ def post_process_group(
             )
 
 
-def process_snoozes(group):
+def process_snoozes(group, snooze):
     """
     Return True if the group is transitioning from "resolved" to "unresolved",
     otherwise return False.
     """
-    from sentry.models import (
-        Activity,
-        GroupInboxReason,
-        GroupSnooze,
-        GroupStatus,
-        add_group_to_inbox,
-    )
+    from sentry.models import Activity, GroupInboxReason, GroupStatus, add_group_to_inbox
     from sentry.models.grouphistory import GroupHistoryStatus, record_group_history
 
-    key = GroupSnooze.get_cache_key(group.id)
-    snooze = cache.get(key)
-    if snooze is None:
-        try:
-            snooze = GroupSnooze.objects.get(group=group)
-        except GroupSnooze.DoesNotExist:
-            snooze = False
-        # This cache is also set in post_save|delete.
-        cache.set(key, snooze, 3600)
     if not snooze:
         return False
 
@@ -1,8 +1,10 @@
 import logging
+from collections import defaultdict
 
 import sentry_sdk
 from django.conf import settings
 
+from sentry import features
 from sentry.relay import projectconfig_debounce_cache
 from sentry.tasks.base import instrumented_task
 from sentry.utils import metrics
@@ -28,9 +30,8 @@ def update_config_cache(
         invalidated.
     """
 
-    from sentry.models import Project, ProjectKey, ProjectKeyStatus
+    from sentry.models import Project, ProjectKey
     from sentry.relay import projectconfig_cache
-    from sentry.relay.config import get_project_config
 
     if project_id:
         set_current_event_project(project_id)
@@ -63,6 +64,7 @@ def update_config_cache(
     elif public_key:
         try:
             keys = [ProjectKey.objects.get(public_key=public_key)]
+            projects = [keys[0].project]
         except ProjectKey.DoesNotExist:
             # In this particular case, where a project key got deleted and
             # triggered an update, we at least know the public key that needs
@@ -78,17 +80,7 @@ def update_config_cache(
         assert False
 
     if generate:
-        config_cache = {}
-        for key in keys:
-            if key.status != ProjectKeyStatus.ACTIVE:
-                project_config = {"disabled": True}
-            else:
-                project_config = get_project_config(
-                    key.project, project_keys=[key], full_config=True
-                ).to_dict()
-            config_cache[key.public_key] = project_config
-
-        projectconfig_cache.set_many(config_cache)
+        projectconfig_cache.set_many(_generate_configs(projects, keys))
     else:
         cache_keys_to_delete = []
         for key in keys:
@@ -97,6 +89,64 @@ def update_config_cache(
         projectconfig_cache.delete_many(cache_keys_to_delete)
 
 
+def _generate_configs(projects, keys):
+    """
+    Generates the full configs of `keys`, mapped by public key.
+
+    Parts of the config which only depend on the organization or the project are
+    computed once and shared between all keys, and the options of all projects are
+    fetched upfront.
+    """
+    from sentry.models import ProjectKeyStatus, ProjectOption
+    from sentry.relay.config import get_organization_config, get_project_configs, prefetch_features
+
+    configs = {}
+    keys_by_project = defaultdict(list)
+    for key in keys:
+        if key.status != ProjectKeyStatus.ACTIVE:
+            configs[key.public_key] = {"disabled": True}
+        else:
+            keys_by_project[key.project_id].append(key)
+
+    ProjectOption.objects.prefetch_all_values(list(keys_by_project))
+
+    projects = [project for project in projects if keys_by_project.get(project.id)]
+    projects_by_organization = defaultdict(list)
+    for project in projects:
+        projects_by_organization[project.organization_id].append(project)
+
+    organizations = {}
+    organization_configs = {}
+    with features.evaluation_scope():
+        for project in projects:
+            project_keys = keys_by_project[project.id]
+
+            organization_id = project.organization_id
+            if organization_id in organizations:
+                project.set_cached_field_value("organization", organizations[organization_id])
+            else:
+                organizations[organization_id] = project.organization
+                prefetch_features(project.organization, projects_by_organization[organization_id])
+                organization_configs[organization_id] = get_organization_config(
+                    project.organization
+                )
+
+            for key in project_keys:
+                key.set_cached_field_value("project", project)
+
+            project_configs = get_project_configs(
+                project,
+                project_keys,
+                full_config=True,
+                organization_config=organization_configs[organization_id],
+            )
+            for public_key, project_config in project_configs.items():
+                configs[public_key] = project_config.to_dict()
+
+    metrics.timing("relay.projectconfig_cache.generated_projects", len(keys_by_project))
+    return configs
+
+
 def schedule_update_config_cache(
     generate, project_id=None, organization_id=None, public_key=None, update_reason=None
 ):
@@ -121,6 +121,7 @@ from sentry.testutils.helpers.slack import install_slack
 from sentry.types.integrations import ExternalProviders
 from sentry.utils import json
 from sentry.utils.auth import SsoSession
+from sentry.utils.context_loader import clear_local_cache as clear_context_local_cache
 from sentry.utils.pytest.selenium import Browser
 from sentry.utils.retries import TimedRetryPolicy
 from sentry.utils.snuba import _snuba_pool
@@ -286,6 +287,7 @@ class BaseTestCase(Fixtures, Exam):
         super()._pre_setup()
 
         cache.clear()
+        clear_context_local_cache()
         ProjectOption.objects.clear_local_cache()
         GroupMeta.objects.clear_local_cache()
 
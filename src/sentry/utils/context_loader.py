@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence, Tuple, Union
+
+from sentry.utils import metrics
+from sentry.utils.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Upper bound for the number of values kept in the per-process cache. When it is reached
+# the cache is simply dropped, the values are cheap to refetch and this keeps us from
+# tracking recency on every read.
+LOCAL_CACHE_MAX_SIZE = 10000
+
+_local_cache: Dict[str, Tuple[float, Any]] = {}
+
+
+def clear_local_cache() -> None:
+    _local_cache.clear()
+
+
+@dataclass(frozen=True)
+class ContextEntry:
+    name: str
+    key: Callable[..., str]
+    loader: Callable[..., Any]
+    ttl: Union[int, Callable[[Any], int]]
+    local_ttl: Optional[int] = None
+
+    def get_ttl(self, value: Any) -> int:
+        return self.ttl(value) if callable(self.ttl) else self.ttl
+
+
+class ContextLoader:
+    """
+    Batches the independent cache lookups of several processing steps into a single
+    round trip.
+
+    Each step registers the value it needs with `register`, providing the cache key it is
+    stored under and a loader used to compute it on a miss. `load` then fetches all of
+    them with one `get_many`, calls the loaders for the misses, writes the results back
+    with `set_many` and returns a mapping of name -> value for the steps to read from.
+
+    Cached values must never be `None`, as that is what denotes a miss. Values whose
+    loader raises are logged and left out of the result, so that the steps reading them
+    can be skipped without failing the others.
+
+    Entries registered with a `local_ttl` are additionally kept in a per-process cache
+    for that many seconds. This is only meant for values which already tolerate being
+    stale for longer than that, as the per-process cache is never invalidated.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._entries: Dict[str, ContextEntry] = {}
+
+    def register(
+        self,
+        name: str,
+        key: Callable[..., str],
+        loader: Callable[..., Any],
+        ttl: Union[int, Callable[[Any], int]],
+        local_ttl: Optional[int] = None,
+    ) -> None:
+        """
+        Registers a value to load. `key` and `loader` are called with the arguments
+        passed to `load`, `ttl` can be a callable which computes the cache duration from
+        the loaded value.
+        """
+        assert name not in self._entries, f"{name} is already registered"
+        self._entries[name] = ContextEntry(name, key, loader, ttl, local_ttl)
+
+    def load(self, *args: Any, names: Optional[Sequence[str]] = None) -> Mapping[str, Any]:
+        entries = (
+            [self._entries[name] for name in names]
+            if names is not None
+            else list(self._entries.values())
+        )
+        keys = {entry.name: entry.key(*args) for entry in entries}
+        now = time.monotonic()
+
+        result: Dict[str, Any] = {}
+        remote_entries = []
+        for entry in entries:
+            if entry.local_ttl:
+                expires_at, value = _local_cache.get(keys[entry.name], (0, None))
+                if expires_at > now:
+                    result[entry.name] = value
+                    continue
+            remote_entries.append(entry)
+
+        if remote_entries:
+            cached = cache.get_many([keys[entry.name] for entry in remote_entries])
+        else:
+            cached = {}
+
+        to_set: Dict[int, Dict[str, Any]] = defaultdict(dict)
+        for entry in remote_entries:
+            key = keys[entry.name]
+            value = cached.get(key)
+            if value is None:
+                try:
+                    value = entry.loader(*args)
+                except Exception:
+                    logger.exception(
+                        "context_loader.load_failed",
+                        extra={"context": self.name, "entry": entry.name},
+                    )
+                    continue
+                to_set[entry.get_ttl(value)][key] = value
+            result[entry.name] = value
+
+            if entry.local_ttl:
+                if len(_local_cache) >= LOCAL_CACHE_MAX_SIZE:
+                    _local_cache.clear()
+                _local_cache[key] = (now + entry.local_ttl, value)
+
+        for ttl, values in to_set.items():
+            cache.set_many(values, ttl)
+
+        local_hits = len(entries) - len(remote_entries)
+        misses = sum(len(values) for values in to_set.values())
+        metrics.incr(f"{self.name}.context.local_hit", amount=local_hits)
+        metrics.incr(f"{self.name}.context.hit", amount=len(remote_entries) - misses)
+        metrics.incr(f"{self.name}.context.miss", amount=misses)
+        return result
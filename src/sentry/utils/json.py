@@ -95,10 +95,21 @@ def dump(value: JSONData, fp, **kwargs):
         fp.write(chunk)
 
 
-def dumps(value: JSONData, escape: bool = False, **kwargs) -> str:
+def dumps(value: JSONData, escape: bool = False, use_rapid_json: bool = False, **kwargs) -> str:
     # Legacy use. Do not use. Use dumps_htmlsafe
     if escape:
         return _default_escaped_encoder.encode(value)
+    if use_rapid_json is True:
+        # Only for plain JSON values, without the fallbacks of `better_default_encoder`.
+        # The output matches the default encoder, which rapidjson can't do for non-finite
+        # floats (serialized as null) and \u escapes (written with lowercase digits).
+        try:
+            encoded: str = rapidjson.dumps(value, number_mode=rapidjson.NM_NONE)
+        except ValueError:
+            return _default_encoder.encode(value)
+        if "\\u" in encoded:
+            return _default_encoder.encode(value)
+        return encoded
     return _default_encoder.encode(value)
 
 
@@ -1,4 +1,5 @@
 import logging
+import time
 from queue import Full, Queue
 from threading import Thread
 
@@ -62,6 +63,46 @@ class RedisPublisher:
             self.rds.publish(channel, value)
 
 
+class RedisSubscriber:
+    """
+    Calls `callback` with the data of every message published on `channel`, from a
+    daemon thread.
+
+    The subscription is reestablished whenever it fails, in which case `on_reconnect` is
+    called, as messages may have been missed in the meantime.
+    """
+
+    def __init__(self, connection, channel, callback, on_reconnect=None):
+        self.rds = redis.StrictRedis(**connection)
+        self.channel = channel
+        self.callback = callback
+        self.on_reconnect = on_reconnect
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+
+        self._thread = Thread(target=self._run, name=f"pubsub-{self.channel}", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                pubsub = self.rds.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    self.callback(message["data"])
+            except Exception:
+                logging.getLogger("sentry.errors").exception(
+                    "pubsub.subscription-failed", extra={"channel": self.channel}
+                )
+
+            if self.on_reconnect is not None:
+                self.on_reconnect()
+            time.sleep(1)
+
+
 class KafkaPublisher:
     def __init__(self, connection, asynchronous=True):
         from confluent_kafka import Producer
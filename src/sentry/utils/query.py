@@ -222,8 +222,12 @@ def bulk_delete_objects(
             params.append(value)
 
     for column, value in filters.items():
-        query.append(f"{quote_name(column)} = %s")
-        params.append(value)
+        if column.endswith("__in"):
+            query.append(f"{quote_name(column[:-4])} = any(%s)")
+            params.append(list(value))
+        else:
+            query.append(f"{quote_name(column)} = %s")
+            params.append(value)
 
     query = """
         delete from %(table)s
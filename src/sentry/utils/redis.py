@@ -67,7 +67,7 @@ class _RBCluster:
     def supports(self, config):
         return not config.get("is_redis_cluster", False)
 
-    def factory(self, **config):
+    def factory(self, decode_responses=True, **config):
         # rb expects a dict of { host, port } dicts where the key is the host
         # ID. Coerce the configuration into the correct format if necessary.
         hosts = config["hosts"]
@@ -214,7 +214,7 @@ class _RedisCluster:
         #    in non-cluster mode.
         return config.get("is_redis_cluster", False) or len(config.get("hosts")) == 1
 
-    def factory(self, **config):
+    def factory(self, decode_responses=True, **config):
         # StrictRedisCluster expects a list of { host, port } dicts. Coerce the
         # configuration into the correct format if necessary.
         hosts = config.get("hosts")
@@ -233,14 +233,14 @@ class _RedisCluster:
                     #
                     # https://github.com/Grokzen/redis-py-cluster/blob/73f27edf7ceb4a408b3008ef7d82dac570ab9c6a/rediscluster/nodemanager.py#L385
                     startup_nodes=deepcopy(hosts),
-                    decode_responses=True,
+                    decode_responses=decode_responses,
                     skip_full_coverage_check=True,
                     max_connections=16,
                     max_connections_per_node=True,
                 )
             else:
                 host = hosts[0].copy()
-                host["decode_responses"] = True
+                host["decode_responses"] = decode_responses
                 return (
                     import_string(config["client_class"])
                     if "client_class" in config
@@ -259,8 +259,8 @@ class ClusterManager:
         self.__options_manager = options_manager
         self.__cluster_type = cluster_type()
 
-    def get(self, key):
-        cluster = self.__clusters.get(key)
+    def _get(self, key, decode_responses):
+        cluster = self.__clusters.get((key, decode_responses))
 
         # Do not access attributes of the `cluster` object to prevent
         # setup/init of lazy objects. The _RedisCluster type will try to
@@ -275,10 +275,22 @@ class ClusterManager:
             if not self.__cluster_type.supports(configuration):
                 raise KeyError(f"Invalid cluster type, expected: {self.__cluster_type}")
 
-            cluster = self.__clusters[key] = self.__cluster_type.factory(**configuration)
+            cluster = self.__clusters[(key, decode_responses)] = self.__cluster_type.factory(
+                decode_responses=decode_responses, **configuration
+            )
 
         return cluster
 
+    def get(self, key):
+        return self._get(key, decode_responses=True)
+
+    def get_binary(self, key):
+        """
+        Like `get`, but responses are returned as raw bytes instead of being decoded
+        to strings, for clusters storing binary values.
+        """
+        return self._get(key, decode_responses=False)
+
 
 # TODO(epurkhiser): When migration of all rb cluster to true redis clusters has
 # completed, remove the rb ``clusters`` module variable and rename
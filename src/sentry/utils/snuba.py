@@ -3,15 +3,27 @@ import logging
 import os
 import random
 import re
+import threading
 import time
 from collections import OrderedDict, namedtuple
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
 from copy import deepcopy
 from datetime import datetime, timedelta
 from hashlib import sha1
 from operator import itemgetter
-from typing import Any, Callable, List, Mapping, MutableMapping, Optional, Sequence, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 from urllib.parse import urlparse
 
 import pytz
@@ -39,7 +51,7 @@ from sentry.net.http import connection_from_url
 from sentry.sentry_metrics import indexer
 from sentry.snuba.dataset import Dataset
 from sentry.snuba.events import Columns
-from sentry.utils import json, metrics
+from sentry.utils import json, metrics, redis
 from sentry.utils.compat import map
 from sentry.utils.dates import outside_retention_with_modified_start, to_timestamp
 
@@ -342,6 +354,8 @@ _snuba_pool = connection_from_url(
     maxsize=10,
 )
 _query_thread_pool = ThreadPoolExecutor(max_workers=10)
+# Separate from `_query_thread_pool`, as refreshes run bulk queries on that pool themselves.
+_query_cache_refresh_pool = ThreadPoolExecutor(max_workers=2)
 
 
 epoch_naive = datetime(1970, 1, 1, tzinfo=None)
@@ -711,8 +725,8 @@ def get_cache_key(query: SnubaQuery) -> str:
     else:
         hashable = json.dumps(query, sort_keys=True)
 
-    # sqc - Snuba Query Cache
-    return f"sqc:{sha1(hashable.encode('utf-8')).hexdigest()}"
+    # sqc - Snuba Query Cache, v2 entries wrap results with their freshness
+    return f"sqc:2:{sha1(hashable.encode('utf-8')).hexdigest()}"
 
 
 def bulk_raw_query(
@@ -724,11 +738,183 @@ def bulk_raw_query(
     return _apply_cache_and_build_results(params, referrer=referrer, use_cache=use_cache)
 
 
+# Interval at which workers waiting for another worker's query check the cache.
+QUERY_CACHE_POLL_INTERVAL = 0.05
+
+# Queries which are currently being run by this process, by cache key. Threads missing the
+# same key wait for these instead of querying snuba as well.
+_inflight_queries: MutableMapping[str, Future] = {}
+_inflight_queries_lock = threading.Lock()
+
+
+def _get_query_cache_ttl(referrer: Optional[str]) -> int:
+    ttl: int = settings.SENTRY_SNUBA_CACHE_REFERRER_TTL_SECONDS.get(
+        referrer, settings.SENTRY_SNUBA_CACHE_TTL_SECONDS
+    )
+    return ttl
+
+
+def _get_lease_key(cache_key: str) -> str:
+    return f"{cache_key}:lease"
+
+
+def _get_lease_client() -> Any:
+    return redis.redis_clusters.get(settings.SENTRY_SNUBA_CACHE_REDIS_CLUSTER)
+
+
+def _acquire_query_lease(cache_key: str) -> bool:
+    """
+    Acquires the lease to query snuba for a missing cache key, which other workers wait
+    for instead of running the same query. Fails open, so that snuba can still be queried
+    when redis is unavailable.
+    """
+    try:
+        return bool(
+            _get_lease_client().set(
+                _get_lease_key(cache_key),
+                "1",
+                ex=settings.SENTRY_SNUBA_CACHE_LEASE_SECONDS,
+                nx=True,
+            )
+        )
+    except Exception:
+        logger.exception("snuba.query_cache.lease_failed")
+        return True
+
+
+def _release_query_leases(cache_keys: Sequence[str]) -> None:
+    try:
+        _get_lease_client().delete(*map(_get_lease_key, cache_keys))
+    except Exception:
+        logger.exception("snuba.query_cache.lease_failed")
+
+
+def _get_held_query_leases(cache_keys: Sequence[str]) -> Set[str]:
+    """
+    Returns the cache keys whose lease is still held by some worker. Assumes all of them
+    are when redis is unavailable.
+    """
+    try:
+        with _get_lease_client().pipeline(transaction=False) as pipeline:
+            for cache_key in cache_keys:
+                pipeline.exists(_get_lease_key(cache_key))
+            held = pipeline.execute()
+    except Exception:
+        logger.exception("snuba.query_cache.lease_failed")
+        return set(cache_keys)
+    return {cache_key for cache_key, exists in zip(cache_keys, held) if exists}
+
+
+def _set_query_cache(cache_key: str, result: Mapping[str, Any], referrer: Optional[str]) -> None:
+    ttl = _get_query_cache_ttl(referrer)
+    entry = {"fresh_until": time.time() + ttl, "result": result}
+    cache.set(cache_key, json.dumps(entry), ttl + settings.SENTRY_SNUBA_CACHE_STALE_SECONDS)
+
+
+def _query_and_cache(
+    to_query: Sequence[Tuple[int, SnubaQueryBody, str]],
+    headers: Mapping[str, str],
+    referrer: Optional[str],
+) -> List[Tuple[int, Mapping[str, Any]]]:
+    """
+    Runs queries this worker holds the lease for, caches their results and hands them to
+    threads of this process waiting for them.
+    """
+    futures = []
+    with _inflight_queries_lock:
+        for _, _, cache_key in to_query:
+            future: Future = Future()
+            _inflight_queries[cache_key] = future
+            futures.append(future)
+
+    cache_keys = [cache_key for _, _, cache_key in to_query]
+    try:
+        query_results = list(_bulk_snuba_query([params for _, params, _ in to_query], headers))
+    except Exception as e:
+        for future in futures:
+            future.set_exception(e)
+        raise
+    else:
+        for result, cache_key, future in zip(query_results, cache_keys, futures):
+            _set_query_cache(cache_key, result, referrer)
+            future.set_result(result)
+    finally:
+        with _inflight_queries_lock:
+            for cache_key in cache_keys:
+                _inflight_queries.pop(cache_key, None)
+        _release_query_leases(cache_keys)
+
+    return [(query_pos, result) for (query_pos, _, _), result in zip(to_query, query_results)]
+
+
+def _wait_for_cache(
+    to_wait: Sequence[Tuple[int, SnubaQueryBody, str]]
+) -> Tuple[
+    List[Tuple[int, Mapping[str, Any]]],
+    List[Tuple[int, SnubaQueryBody, str]],
+    List[Tuple[int, SnubaQueryBody, str]],
+]:
+    """
+    Waits for the results of queries another worker holds the lease for, up to the
+    duration of the lease. Returns the results which showed up, the queries whose lease
+    was released without a result and which this worker took the lease over for, and the
+    queries which didn't finish in time.
+    """
+    results = []
+    taken_over = []
+    deadline = time.time() + settings.SENTRY_SNUBA_CACHE_LEASE_SECONDS
+    pending = list(to_wait)
+    while pending and time.time() < deadline:
+        time.sleep(QUERY_CACHE_POLL_INTERVAL)
+        cache_keys = [cache_key for _, _, cache_key in pending]
+        # Leases are checked before the cache: results are cached before their lease is
+        # released, so a missing result with a released lease means the query failed.
+        held_leases = _get_held_query_leases(cache_keys)
+        cache_data = cache.get_many(cache_keys)
+        still_pending = []
+        for query_pos, query_params, cache_key in pending:
+            entry = cache_data.get(cache_key)
+            if entry is not None:
+                results.append((query_pos, json.loads(entry)["result"]))
+            elif cache_key not in held_leases and _acquire_query_lease(cache_key):
+                taken_over.append((query_pos, query_params, cache_key))
+            else:
+                still_pending.append((query_pos, query_params, cache_key))
+        pending = still_pending
+
+    return results, taken_over, pending
+
+
+def _refresh_stale(
+    to_refresh: Sequence[Tuple[int, SnubaQueryBody, str]],
+    headers: Mapping[str, str],
+    referrer: Optional[str],
+) -> None:
+    to_query = [item for item in to_refresh if _acquire_query_lease(item[2])]
+    if not to_query:
+        return
+
+    try:
+        _query_and_cache(to_query, headers, referrer)
+    except Exception:
+        logger.exception("snuba.query_cache.refresh_failed")
+
+
 def _apply_cache_and_build_results(
     snuba_param_list: Sequence[SnubaQueryBody],
     referrer: Optional[str] = None,
     use_cache: Optional[bool] = False,
 ) -> ResultSet:
+    """
+    Runs the queries, going through the query cache when `use_cache` is set.
+
+    Identical queries missing the cache at the same time only go to snuba once: threads
+    of the same process wait for the thread running the query, and other workers wait
+    for the worker holding the query's lease in redis to cache the result.
+
+    When `SENTRY_SNUBA_CACHE_STALE_SECONDS` is set, results past their TTL keep being
+    served for that long while they are refreshed in the background.
+    """
     headers = {}
     if referrer:
         headers["referer"] = referrer
@@ -738,31 +924,69 @@ def _apply_cache_and_build_results(
 
     results = []
 
-    if use_cache:
+    if not use_cache:
+        results = list(enumerate(_bulk_snuba_query(snuba_param_list, headers)))
+    else:
+        metric_tags = {"referrer": referrer} if referrer else None
         cache_keys = [get_cache_key(query_params[0]) for _, query_params in query_param_list]
         cache_data = cache.get_many(cache_keys)
-        to_query: List[Tuple[int, SnubaQueryBody, Optional[str]]] = []
+        now = time.time()
+
+        to_query: List[Tuple[int, SnubaQueryBody, str]] = []
+        to_wait: List[Tuple[int, SnubaQueryBody, str]] = []
+        to_refresh: List[Tuple[int, SnubaQueryBody, str]] = []
+        inflight: List[Tuple[int, Future]] = []
         for (query_pos, query_params), cache_key in zip(query_param_list, cache_keys):
-            cached_result = cache_data.get(cache_key)
-            metric_tags = {"referrer": referrer} if referrer else None
-            if cached_result is None:
+            cached_entry = cache_data.get(cache_key)
+            if cached_entry is not None:
+                entry = json.loads(cached_entry)
+                if entry["fresh_until"] > now:
+                    metrics.incr("snuba.query_cache.hit", tags=metric_tags)
+                else:
+                    metrics.incr("snuba.query_cache.stale", tags=metric_tags)
+                    to_refresh.append((query_pos, query_params, cache_key))
+                results.append((query_pos, entry["result"]))
+                continue
+
+            with _inflight_queries_lock:
+                future = _inflight_queries.get(cache_key)
+            if future is not None:
+                metrics.incr("snuba.query_cache.coalesced", tags=metric_tags)
+                inflight.append((query_pos, future))
+            elif _acquire_query_lease(cache_key):
                 metrics.incr("snuba.query_cache.miss", tags=metric_tags)
                 to_query.append((query_pos, query_params, cache_key))
             else:
-                metrics.incr("snuba.query_cache.hit", tags=metric_tags)
-                results.append((query_pos, json.loads(cached_result)))
-    else:
-        to_query = [(query_pos, query_params, None) for query_pos, query_params in query_param_list]
+                to_wait.append((query_pos, query_params, cache_key))
+
+        if to_refresh:
+            _query_cache_refresh_pool.submit(_refresh_stale, to_refresh, headers, referrer)
 
-    if to_query:
-        query_results = _bulk_snuba_query(map(itemgetter(1), to_query), headers)
-        for result, (query_pos, _, cache_key) in zip(query_results, to_query):
-            if cache_key:
-                cache.set(cache_key, json.dumps(result), settings.SENTRY_SNUBA_CACHE_TTL_SECONDS)
-            results.append((query_pos, result))
+        if to_query:
+            results.extend(_query_and_cache(to_query, headers, referrer))
+
+        for query_pos, future in inflight:
+            results.append((query_pos, future.result()))
+
+        if to_wait:
+            waited_results, taken_over, timed_out = _wait_for_cache(to_wait)
+            metrics.incr(
+                "snuba.query_cache.coalesced", amount=len(waited_results), tags=metric_tags
+            )
+            metrics.incr(
+                "snuba.query_cache.miss", amount=len(taken_over) + len(timed_out), tags=metric_tags
+            )
+            results.extend(waited_results)
+            if taken_over:
+                results.extend(_query_and_cache(taken_over, headers, referrer))
+            if timed_out:
+                query_results = _bulk_snuba_query(map(itemgetter(1), timed_out), headers)
+                for result, (query_pos, _, cache_key) in zip(query_results, timed_out):
+                    _set_query_cache(cache_key, result, referrer)
+                    results.append((query_pos, result))
 
     # Sort so that we get the results back in the original param list order
-    results.sort()
+    results.sort(key=itemgetter(0))
     # Drop the sort order val
     return map(itemgetter(1), results)
 
@@ -856,8 +1080,11 @@ def _bulk_snuba_query(
             else:
                 raise SnubaError(f"HTTP {response.status}")
 
-        # Forward and reverse translation maps from model ids to snuba keys, per column
-        body["data"] = [reverse(d) for d in body["data"]]
+        # Forward and reverse translation maps from model ids to snuba keys, per column.
+        # Rows are translated in place so that the result isn't held in memory twice.
+        data = body["data"]
+        for i, row in enumerate(data):
+            data[i] = reverse(row)
         results.append(body)
 
     return results
@@ -1122,7 +1349,19 @@ def aliased_query(**kwargs):
         return _aliased_query_impl(**kwargs)
 
 
-def _aliased_query_impl(
+def _aliased_query_impl(**kwargs):
+    return raw_query(**_resolve_aliased_query(**kwargs))
+
+
+def aliased_query_params(**kwargs) -> SnubaQueryParams:
+    """
+    Like `aliased_query`, but returns the parameters of the query rather than running it,
+    so that several queries can be run concurrently with `bulk_raw_query`.
+    """
+    return SnubaQueryParams(**_resolve_aliased_query(**kwargs))
+
+
+def _resolve_aliased_query(
     start=None,
     end=None,
     groupby=None,
@@ -1175,7 +1414,7 @@ def _aliased_query_impl(
             updated_order.append("{}{}".format("-" if order.startswith("-") else "", order_field))
         orderby = updated_order
 
-    return raw_query(
+    return dict(
         start=start,
         end=end,
         groupby=groupby,
@@ -9,7 +9,7 @@ from sentry import quotas
 from sentry.constants import ObjectStatus
 from sentry.models import ProjectKey, ProjectKeyStatus
 from sentry.models.relay import Relay
-from sentry.testutils.helpers import Feature
+from sentry.testutils.helpers import Feature, override_options
 from sentry.utils import json, safe
 
 _date_regex = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d+Z$")
@@ -377,3 +377,44 @@ def test_exposes_features(call_endpoint, task_runner):
             config = config["config"]
             assert "features" in config
             assert config["features"] == ["organizations:metrics-extraction"]
+
+
+@pytest.mark.django_db
+def test_relay_projectconfig_cache_read_through(
+    call_endpoint, default_projectkey, projectconfig_cache_set, monkeypatch, task_runner
+):
+    """
+    With read-through enabled, cached configs are returned as-is and only the missing ones
+    are computed and written back.
+    """
+    cached_public_key = ProjectKey.generate_api_key()
+    cached_config = {"disabled": False, "slug": "cached"}
+    get_many_calls = []
+
+    def get_many(public_keys):
+        get_many_calls.append(set(public_keys))
+        return {cached_public_key: json.dumps(cached_config)}
+
+    monkeypatch.setattr("sentry.relay.projectconfig_cache.get_many", get_many)
+
+    public_keys = [default_projectkey.public_key, cached_public_key]
+    with override_options({"relay.project-config-cache-read-through": True}):
+        with task_runner():
+            result, status_code = call_endpoint(full_config=True, public_keys=public_keys)
+            assert status_code < 400
+
+    assert get_many_calls == [set(public_keys)]
+    assert result["configs"][cached_public_key] == cached_config
+    assert result["configs"][default_projectkey.public_key]["disabled"] is False
+
+    (call,) = projectconfig_cache_set
+    assert list(call) == [default_projectkey.public_key]
+
+    # Minimal configs are never read from the cache
+    get_many_calls.clear()
+    with override_options({"relay.project-config-cache-read-through": True}):
+        result, status_code = call_endpoint(full_config=False, public_keys=public_keys)
+        assert status_code < 400
+
+    assert not get_many_calls
+    assert result["configs"][cached_public_key] == {"disabled": True}
@@ -1,6 +1,7 @@
 import datetime
 import os
 from datetime import timedelta
+from unittest.mock import patch
 
 import pytest
 from django.test import SimpleTestCase
@@ -14,6 +15,8 @@ from sentry.api.event_search import (
     SearchFilter,
     SearchKey,
     SearchValue,
+    _parse_query,
+    event_search_grammar,
     parse_search_query,
 )
 from sentry.constants import MODULE_ROOT
@@ -263,6 +266,42 @@ class ParseSearchQueryBackendTest(SimpleTestCase):
                 SearchFilter(key=SearchKey(name="random"), operator="=", value=SearchValue("-2w"))
             ]
 
+    def test_parse_cache(self):
+        _parse_query.cache_clear()
+        with patch(
+            "sentry.api.event_search.event_search_grammar.parse",
+            wraps=event_search_grammar.parse,
+        ) as parse:
+            with freeze_time("2021-06-01"):
+                assert parse_search_query("time:-1d ") == [
+                    SearchFilter(
+                        key=SearchKey(name="time"),
+                        operator=">=",
+                        value=SearchValue(
+                            raw_value=datetime.datetime(2021, 5, 31, tzinfo=timezone.utc)
+                        ),
+                    )
+                ]
+
+            # Relative dates are resolved against the time of each call, not when the
+            # query got cached.
+            with freeze_time("2021-06-10"):
+                assert parse_search_query("time:-1d ") == [
+                    SearchFilter(
+                        key=SearchKey(name="time"),
+                        operator=">=",
+                        value=SearchValue(
+                            raw_value=datetime.datetime(2021, 6, 9, tzinfo=timezone.utc)
+                        ),
+                    )
+                ]
+
+            # The cached tree is shared between configs
+            config = SearchConfig(key_mappings={"target": ["time"]})
+            assert parse_search_query("time:-1d ", config=config)[0].key.name == "target"
+
+        parse.assert_called_once_with("time:-1d ")
+
     def test_specific_time_filter(self):
         assert parse_search_query("time:2018-01-01") == [
             SearchFilter(
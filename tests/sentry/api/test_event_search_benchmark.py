@@ -0,0 +1,30 @@
+from sentry.api.event_search import _parse_query, parse_search_query
+from sentry.testutils.skips import requires_pytest_benchmark
+
+QUERIES = [
+    "",
+    "is:unresolved",
+    "event.type:transaction transaction.duration:>300ms",
+    "!user.email:*@example.com browser.name:[Chrome, Firefox] release:latest",
+    "timestamp:-24h has:stack.filename (level:error OR level:fatal)",
+    'message:"Connection reset by peer" os.name:Windows tags[runtime]:CPython',
+    "p95():>1s count():>100 failure_rate():>0.05 event.type:transaction",
+    "transaction:/api/0/organizations/*/events/ http.method:GET "
+    "(user.id:1 OR user.id:2 OR user.id:3) !environment:[staging, development]",
+]
+
+
+def parse_queries():
+    for query in QUERIES:
+        parse_search_query(query)
+
+
+@requires_pytest_benchmark
+def test_benchmark_parse_search_query_uncached(benchmark):
+    benchmark.pedantic(parse_queries, setup=_parse_query.cache_clear, rounds=100)
+
+
+@requires_pytest_benchmark
+def test_benchmark_parse_search_query_cached(benchmark):
+    parse_queries()
+    benchmark(parse_queries)
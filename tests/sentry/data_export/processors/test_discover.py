@@ -71,3 +71,24 @@ class DiscoverProcessorTestWithSnql(DiscoverProcessorTest):
             "query": "",
             "use_snql": True,
         }
+
+    def test_get_keyset_order(self):
+        query = {"field": ["title", "timestamp"], "query": "event.type:error"}
+        assert DiscoverProcessor.get_keyset_order(query) == "-"
+        assert DiscoverProcessor.get_keyset_order(dict(query, sort="timestamp")) == ""
+        assert DiscoverProcessor.get_keyset_order(dict(query, sort=["-timestamp"])) == "-"
+        assert DiscoverProcessor.get_keyset_order(dict(query, sort="title")) is None
+        assert DiscoverProcessor.get_keyset_order(dict(query, field=["count()"])) is None
+        assert DiscoverProcessor.get_keyset_order(dict(query, equations=["1 + 1"])) is None
+        assert DiscoverProcessor.get_keyset_order(dict(query, query="(count():>1)")) is None
+
+    def test_get_keyset_partitions(self):
+        self.discover_query["field"] = ["title"]
+        processor = DiscoverProcessor(
+            organization_id=self.org.id, discover_query=self.discover_query
+        )
+        cursors = processor.get_keyset_partitions(2)
+        assert cursors == [
+            {"start": cursors[1]["end"], "end": processor.end.isoformat()},
+            {"start": processor.start.isoformat(), "end": cursors[0]["start"]},
+        ]
@@ -1,8 +1,11 @@
+from hashlib import sha1
 from unittest.mock import patch
 
 from django.db import IntegrityError
+from django.test import override_settings
 
-from sentry.data_export.base import ExportQueryType
+from sentry.data_export import tasks
+from sentry.data_export.base import ExportError, ExportQueryType
 from sentry.data_export.models import ExportedData
 from sentry.data_export.tasks import assemble_download, merge_export_blobs
 from sentry.exceptions import InvalidSearchQuery
@@ -598,6 +601,74 @@ class AssembleDownloadTest(TestCase, SnubaTestCase):
 
         assert emailer.called
 
+    @override_settings(SENTRY_DATA_EXPORT_PARTITIONS=3)
+    @patch("sentry.data_export.models.ExportedData.email_success")
+    def test_discover_partitioned(self, emailer):
+        de = ExportedData.objects.create(
+            user=self.user,
+            organization=self.org,
+            query_type=ExportQueryType.DISCOVER,
+            query_info={"project": [self.project.id], "field": ["environment"], "query": ""},
+        )
+        with self.tasks():
+            assemble_download(de.id, batch_size=1)
+        de = ExportedData.objects.get(id=de.id)
+        assert de.date_finished is not None
+        file = de._get_file()
+        assert file.size is not None
+        assert file.checksum is not None
+        header, *rows = file.getfile().read().strip().split(b"\r\n")
+        assert header == b"environment"
+        assert sorted(rows) == [b"dev", b"prod", b"prod"]
+
+        assert emailer.called
+
+    @override_settings(SENTRY_DATA_EXPORT_PARTITIONS=3)
+    @patch("sentry.data_export.models.ExportedData.email_success")
+    def test_discover_partitioned_too_many_rows(self, emailer):
+        de = ExportedData.objects.create(
+            user=self.user,
+            organization=self.org,
+            query_type=ExportQueryType.DISCOVER,
+            query_info={"project": [self.project.id], "field": ["environment"], "query": ""},
+        )
+        with self.tasks():
+            assemble_download(de.id, export_limit=2)
+        de = ExportedData.objects.get(id=de.id)
+        header, raw1, raw2 = de._get_file().getfile().read().strip().split(b"\r\n")
+        assert header == b"environment"
+
+        assert emailer.called
+
+    @override_settings(SENTRY_DATA_EXPORT_PARTITIONS=3)
+    @patch("sentry.data_export.models.ExportedData.email_success")
+    def test_discover_partitioned_retry(self, emailer):
+        de = ExportedData.objects.create(
+            user=self.user,
+            organization=self.org,
+            query_type=ExportQueryType.DISCOVER,
+            query_info={"project": [self.project.id], "field": ["environment"], "query": ""},
+        )
+        failures = [ExportError("test", recoverable=True)]
+        original_store_export_chunk_as_blob = tasks.store_export_chunk_as_blob
+
+        def store_export_chunk_as_blob(*args, **kwargs):
+            if failures:
+                raise failures.pop()
+            return original_store_export_chunk_as_blob(*args, **kwargs)
+
+        with self.tasks(), patch(
+            "sentry.data_export.tasks.store_export_chunk_as_blob",
+            side_effect=store_export_chunk_as_blob,
+        ):
+            assemble_download(de.id, export_limit=3)
+        de = ExportedData.objects.get(id=de.id)
+        # The rows of the failed attempt aren't counted against the limit
+        header, *rows = de._get_file().getfile().read().strip().split(b"\r\n")
+        assert sorted(rows) == [b"dev", b"prod", b"prod"]
+
+        assert emailer.called
+
 
 class AssembleDownloadLargeTest(TestCase, SnubaTestCase):
     def setUp(self):
@@ -640,6 +711,43 @@ class AssembleDownloadLargeTest(TestCase, SnubaTestCase):
         assert de.date_expired is not None
         assert de.file_id is not None
         assert isinstance(de._get_file(), File)
+        file = de._get_file()
+        assert file.checksum == sha1(file.getfile().read()).hexdigest()
+
+        assert emailer.called
+
+    @override_settings(SENTRY_DATA_EXPORT_PARTITIONS=3)
+    @patch("sentry.data_export.tasks.MAX_FILE_SIZE", 200)
+    @patch("sentry.data_export.tasks.MAX_BATCH_SIZE", 30)
+    @patch("sentry.data_export.models.ExportedData.email_success")
+    def test_discover_partitioned_too_big(self, emailer):
+        """
+        The events spread over two partitions which could each store up to 200 bytes, the
+        file size limit is shared between them so the export stops on a chunk boundary.
+        """
+        de = ExportedData.objects.create(
+            user=self.user,
+            organization=self.org,
+            query_type=ExportQueryType.DISCOVER,
+            query_info={
+                "project": [self.project.id],
+                "field": ["title"],
+                "query": "",
+                "start": iso_format(before_now(minutes=2)),
+                "end": iso_format(before_now()),
+            },
+        )
+        with self.tasks():
+            assemble_download(de.id, batch_size=3)
+        de = ExportedData.objects.get(id=de.id)
+        file = de._get_file()
+        contents = file.getfile().read()
+        assert file.size == len(contents) < 200
+        assert contents.endswith(b"\r\n")
+        header, *rows = contents.strip().split(b"\r\n")
+        assert header == b"title"
+        assert 0 < len(rows) < 50
+        assert all(row.startswith(b"/event/") and len(row) == 11 for row in rows)
 
         assert emailer.called
 
@@ -647,3 +755,25 @@ class AssembleDownloadLargeTest(TestCase, SnubaTestCase):
 class MergeExportBlobsTest(TestCase, SnubaTestCase):
     def test_task_persistent_name(self):
         assert merge_export_blobs.name == "sentry.data_export.tasks.merge_blobs"
+
+    @patch("sentry.data_export.models.ExportedData.email_success")
+    def test_checksum_written_with_blobs(self, emailer):
+        self.store_event(
+            data={"timestamp": iso_format(before_now(minutes=1))}, project_id=self.project.id
+        )
+        de = ExportedData.objects.create(
+            user=self.user,
+            organization=self.organization,
+            query_type=ExportQueryType.DISCOVER,
+            query_info={"project": [self.project.id], "field": ["title"], "query": ""},
+        )
+        with self.tasks(), patch(
+            "sentry.data_export.tasks.get_export_checksum"
+        ) as get_export_checksum, patch("sentry.models.FileBlob.getfile") as getfile:
+            assemble_download(de.id)
+        assert not get_export_checksum.called
+        assert not getfile.called
+
+        file = ExportedData.objects.get(id=de.id)._get_file()
+        assert file.size is not None
+        assert file.checksum == sha1(file.getfile().read()).hexdigest()
@@ -0,0 +1,93 @@
+import pickle
+from unittest import mock
+
+from django.test import override_settings
+
+from sentry.db.models.manager import make_key
+from sentry.db.models.manager.encoding import decode_instance, encode_instance
+from sentry.models import Group, Organization, Project, ProjectKey
+from sentry.testutils import TestCase
+from sentry.utils.cache import cache
+
+
+class EncodingTest(TestCase):
+    def assert_roundtrip(self, instance):
+        model = type(instance)
+        encoded = encode_instance(instance)
+        assert encoded is not None
+        assert len(encoded) < len(pickle.dumps(instance))
+
+        decoded = decode_instance(model, encoded)
+        assert type(decoded) is model
+        assert not decoded._state.adding
+        for field in model._meta.concrete_fields:
+            assert getattr(decoded, field.attname) == getattr(instance, field.attname)
+
+    def test_roundtrip(self):
+        self.organization.flags.require_2fa = True
+        self.organization.save()
+        group = self.create_group(data={"type": "error", "metadata": {"title": ("a", "b")}})
+
+        self.assert_roundtrip(Organization.objects.get(id=self.organization.id))
+        self.assert_roundtrip(Project.objects.get(id=self.project.id))
+        self.assert_roundtrip(ProjectKey.objects.get(project=self.project))
+        self.assert_roundtrip(Group.objects.get(id=group.id))
+
+    def test_unencodable(self):
+        project = Project.objects.get(id=self.project.id)
+        project.platform = object()
+        assert encode_instance(project) is None
+
+        assert encode_instance(Project.objects.only("id").get(id=self.project.id)) is None
+
+    def test_other_version(self):
+        with mock.patch("sentry.db.models.manager.encoding.FORMAT_VERSION", 0):
+            encoded = encode_instance(self.project)
+        assert decode_instance(Project, encoded) is None
+        assert decode_instance(Project, b"invalid") is None
+
+
+class CompactCacheFormatTest(TestCase):
+    @override_settings(SENTRY_MODEL_CACHE_COMPACT_FORMAT=True)
+    def test_get_from_cache(self):
+        self.project.save()
+        cached = cache.get(
+            make_key(Project, "modelcache", {"id": self.project.id}),
+            version=Project.objects.cache_version,
+        )
+        assert isinstance(cached, bytes)
+
+        project = Project.objects.get_from_cache(id=self.project.id)
+        assert project == self.project
+        assert project.slug == self.project.slug
+        assert project._state.db is not None
+
+        assert Project.objects.get_many_from_cache([self.project.id]) == [self.project]
+
+    def test_reads_pickles(self):
+        self.project.save()
+
+        with override_settings(SENTRY_MODEL_CACHE_COMPACT_FORMAT=True):
+            assert Project.objects.get_from_cache(id=self.project.id) == self.project
+            assert Project.objects.get_many_from_cache([self.project.id]) == [self.project]
+
+    @override_settings(SENTRY_MODEL_CACHE_COMPACT_FORMAT=True)
+    def test_other_version(self):
+        cache_key = make_key(Project, "modelcache", {"id": self.project.id})
+        with mock.patch("sentry.db.models.manager.encoding.FORMAT_VERSION", 0):
+            self.project.save()
+        cached = cache.get(cache_key, version=Project.objects.cache_version)
+        assert decode_instance(Project, cached) is None
+
+        # Entries of another version are misses, which are cached again
+        with mock.patch("sentry.db.models.manager.base.logger") as logger:
+            assert Project.objects.get_from_cache(id=self.project.id) == self.project
+            assert not logger.error.called
+        assert cache.get(cache_key, version=Project.objects.cache_version) != cached
+
+        with mock.patch("sentry.db.models.manager.encoding.FORMAT_VERSION", 0):
+            self.project.save()
+        with mock.patch("sentry.db.models.manager.base.logger") as logger:
+            assert Project.objects.get_many_from_cache([self.project.id]) == [self.project]
+            assert not logger.error.called
+        assert cache.get(cache_key, version=Project.objects.cache_version) != cached
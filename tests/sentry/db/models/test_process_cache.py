@@ -0,0 +1,94 @@
+from unittest import mock
+
+from django.test import override_settings
+
+from sentry.db.models.manager import process_cache
+from sentry.db.models.manager.process_cache import ProcessCache
+from sentry.models import Organization
+from sentry.testutils import TestCase
+from sentry.utils import json
+
+
+def test_process_cache_ttl():
+    cache = ProcessCache("test", ttl=10, max_size=2)
+    with mock.patch("time.monotonic", return_value=100):
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+    with mock.patch("time.monotonic", return_value=111):
+        assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_process_cache_max_size():
+    cache = ProcessCache("test", ttl=10, max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    # `b` is the least recently used
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+@override_settings(SENTRY_MODEL_PROCESS_CACHE={"sentry.Organization": {"ttl": 60}})
+class ModelProcessCacheTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        process_cache.clear_process_caches()
+        self.addCleanup(process_cache.clear_process_caches)
+
+    def test_get_from_cache(self):
+        org = Organization.objects.get_from_cache(id=self.organization.id)
+
+        with mock.patch("sentry.db.models.manager.base.cache") as cache:
+            assert Organization.objects.get_from_cache(id=org.id) == org
+            assert not cache.get.called
+
+            # Lookups by other cache fields skip the pointer lookup once cached
+            cache.get.return_value = org.id
+            assert Organization.objects.get_from_cache(slug=org.slug) == org
+            assert Organization.objects.get_from_cache(slug=org.slug) == org
+            assert cache.get.call_count == 1
+
+        # Every lookup gets its own instance
+        assert Organization.objects.get_from_cache(id=org.id) is not org
+
+    def test_invalidation(self):
+        Organization.objects.get_from_cache(id=self.organization.id)
+        Organization.objects.get_from_cache(slug=self.organization.slug)
+
+        org = Organization.objects.get(id=self.organization.id)
+        old_slug = org.slug
+
+        org.name = "Renamed"
+        org.slug = "renamed"
+        org.save()
+
+        assert Organization.objects.get_from_cache(id=org.id).name == "Renamed"
+        assert Organization.objects.get_from_cache(slug="renamed").name == "Renamed"
+        with self.assertRaises(Organization.DoesNotExist):
+            Organization.objects.get_from_cache(slug=old_slug)
+
+    def test_pubsub_invalidation(self):
+        org = Organization.objects.get_from_cache(id=self.organization.id)
+        model_cache = process_cache.get_process_cache(Organization)
+        assert len(model_cache) == 1
+
+        with mock.patch.object(process_cache, "_get_publisher") as get_publisher:
+            Organization.objects.uncache_object(org.id)
+        ((channel, message), _) = get_publisher.return_value.publish.call_args
+        assert channel == process_cache.INVALIDATION_CHANNEL
+        assert json.loads(message)["model"] == "sentry.Organization"
+
+        Organization.objects.get_from_cache(id=org.id)
+        assert len(model_cache) == 1
+        process_cache._handle_invalidation(message)
+        assert len(model_cache) == 0
+
+
+class ModelProcessCacheDisabledTest(TestCase):
+    def test_save(self):
+        with mock.patch.object(process_cache, "invalidate") as invalidate:
+            self.organization.save()
+        assert not invalidate.called
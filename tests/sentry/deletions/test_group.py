@@ -1,6 +1,8 @@
 from unittest import mock
 from uuid import uuid4
 
+from django.test import override_settings
+
 from sentry import nodestore
 from sentry.deletions.defaults.group import EventDataDeletionTask
 from sentry.eventstore.models import Event
@@ -111,3 +113,25 @@ class DeleteGroupTest(TestCase, SnubaTestCase):
             delete_groups(object_ids=[group.id])
 
         assert nodestore_delete_multi.call_count == 0
+
+    @override_settings(SENTRY_GROUP_BULK_DELETION_BATCH_SIZE=1000)
+    def test_bulk(self):
+        group = self.event.group
+        other_group = Group.objects.exclude(id=group.id).get(project=self.project)
+        GroupMeta.objects.create(group=other_group, key="foo", value="bar")
+
+        with self.tasks():
+            delete_groups(object_ids=[group.id, other_group.id])
+
+        assert not UserReport.objects.filter(group_id=group.id).exists()
+        assert not UserReport.objects.filter(event_id=self.event.event_id).exists()
+        assert not EventAttachment.objects.filter(event_id=self.event.event_id).exists()
+
+        assert not GroupAssignee.objects.filter(group_id=group.id).exists()
+        assert not GroupMeta.objects.filter(group_id__in=[group.id, other_group.id]).exists()
+        assert not GroupRedirect.objects.filter(group_id=group.id).exists()
+        assert not GroupHash.objects.filter(group_id__in=[group.id, other_group.id]).exists()
+        assert not Group.objects.filter(id__in=[group.id, other_group.id]).exists()
+        assert not nodestore.get(self.node_id)
+        assert not nodestore.get(self.node_id2)
+        assert not nodestore.get(self.node_id3)
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import pytest
 
 from sentry.discover.arithmetic import (
@@ -5,6 +7,8 @@ from sentry.discover.arithmetic import (
     ArithmeticValidationError,
     MaxOperatorError,
     Operation,
+    _parse_equation,
+    arithmetic_grammar,
     parse_arithmetic,
 )
 from sentry.search.events.fields import get_function_alias
@@ -190,6 +194,23 @@ def test_max_operators():
     parse_arithmetic("1 + 2 * 3 * 4", 3)
 
 
+def test_parse_cache():
+    _parse_equation.cache_clear()
+    with patch(
+        "sentry.discover.arithmetic.arithmetic_grammar.parse", wraps=arithmetic_grammar.parse
+    ) as parse:
+        first = parse_arithmetic("spans.http + spans.db * 2")
+        second = parse_arithmetic("spans.http + spans.db * 2")
+        assert repr(first) == repr(second)
+        # Each call returns its own Operations
+        assert first[0] is not second[0]
+        # Validation still runs against the cached tree
+        with pytest.raises(MaxOperatorError):
+            parse_arithmetic("spans.http + spans.db * 2", 1)
+
+    parse.assert_called_once_with("spans.http + spans.db * 2")
+
+
 @pytest.mark.parametrize(
     "a,op,b",
     [
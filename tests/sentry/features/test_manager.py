@@ -209,3 +209,62 @@ class FeatureManagerTest(TestCase):
         assert manager.has("organizations:feature", actor=self.user, organization=self.organization)
         assert manager.has("projects:feature", actor=self.user, project=self.project)
         assert manager.has("auth:register", actor=self.user)
+
+    def test_evaluation_scope(self):
+        manager = features.FeatureManager()
+        manager.add("organizations:feature", features.OrganizationFeature)
+        manager.add("projects:plugin-feature", features.ProjectPluginFeature)
+        entity_handler = mock.Mock()
+        entity_handler.has.return_value = True
+        manager.add_entity_handler(entity_handler)
+
+        with manager.evaluation_scope():
+            assert manager.has("organizations:feature", self.organization, actor=self.user)
+            assert manager.has("organizations:feature", self.organization, actor=self.user)
+            assert entity_handler.has.call_count == 1
+
+            # Checks for another actor or without the entity handler aren't shared
+            assert manager.has("organizations:feature", self.organization)
+            assert (
+                manager.has("organizations:feature", self.organization, skip_entity=True) is False
+            )
+            assert entity_handler.has.call_count == 2
+
+            # Plugin features depend on the plugin too
+            manager.has("projects:plugin-feature", self.project, mock.Mock())
+            manager.has("projects:plugin-feature", self.project, mock.Mock())
+            assert entity_handler.has.call_count == 4
+
+        assert manager.has("organizations:feature", self.organization, actor=self.user)
+        assert entity_handler.has.call_count == 5
+
+    def test_prefetch(self):
+        manager = features.FeatureManager()
+        manager.add("organizations:feature", features.OrganizationFeature)
+        manager.add("organizations:other-feature", features.OrganizationFeature)
+        manager.add("projects:feature", features.ProjectFeature)
+        entity_handler = mock.Mock()
+        entity_handler.batch_has.side_effect = [
+            {f"organization:{self.organization.id}": {"organizations:feature": True}},
+            {f"project:{self.project.id}": {"projects:feature": False}},
+        ]
+        manager.add_entity_handler(entity_handler)
+
+        feature_names = ["organizations:feature", "organizations:other-feature", "projects:feature"]
+
+        # Outside of a scope, there's nothing to prefetch into
+        manager.prefetch(feature_names, self.organization, projects=[self.project])
+        assert entity_handler.batch_has.call_count == 0
+
+        with manager.evaluation_scope():
+            manager.prefetch(feature_names, self.organization, projects=[self.project])
+            assert entity_handler.batch_has.call_count == 2
+
+            assert manager.has("organizations:feature", self.organization) is True
+            assert manager.has("projects:feature", self.project) is False
+            assert entity_handler.has.call_count == 0
+
+            # Features missing from the results are checked one by one
+            entity_handler.has.return_value = True
+            assert manager.has("organizations:other-feature", self.organization) is True
+            assert entity_handler.has.call_count == 1
@@ -34,6 +34,7 @@ from sentry.incidents.subscription_processor import (
     build_alert_rule_trigger_stat_key,
     build_trigger_stat_keys,
     get_alert_rule_stats,
+    get_many_alert_rule_stats,
     get_redis_client,
     partition,
     update_alert_rule_stats,
@@ -46,7 +47,7 @@ from sentry.testutils import SnubaTestCase, TestCase
 from sentry.testutils.cases import SessionMetricsTestCase
 from sentry.testutils.helpers.datetime import iso_format
 from sentry.utils import json
-from sentry.utils.dates import to_timestamp
+from sentry.utils.dates import to_datetime, to_timestamp
 
 EMPTY = object()
 
@@ -2184,6 +2185,51 @@ class TestGetAlertRuleStats(TestCase):
         assert resolve_counts == {3: 2, 4: 4}
 
 
+class TestGetManyAlertRuleStats(TestCase):
+    def test(self):
+        sub = QuerySubscription(project_id=2)
+        other_sub = QuerySubscription(project_id=3)
+        timestamp = datetime.now().replace(tzinfo=pytz.utc, microsecond=0)
+        client = get_redis_client()
+        client.set("{alert_rule:1:project:2}:last_update", int(to_timestamp(timestamp)))
+        client.set("{alert_rule:1:project:2}:trigger:3:alert_triggered", 1)
+        client.set("{alert_rule:5:project:3}:trigger:6:resolve_triggered", 2)
+
+        assert get_many_alert_rule_stats(
+            [
+                (AlertRule(id=1), sub, [AlertRuleTrigger(id=3), AlertRuleTrigger(id=4)]),
+                (AlertRule(id=5), other_sub, [AlertRuleTrigger(id=6)]),
+                (AlertRule(id=7), other_sub, []),
+            ]
+        ) == [
+            (timestamp, {3: 1, 4: 0}, {3: 0, 4: 0}),
+            (to_datetime(0), {6: 0}, {6: 2}),
+            (to_datetime(0), {}, {}),
+        ]
+        assert get_many_alert_rule_stats([]) == []
+
+
+class TestSubscriptionProcessorForSubscriptions(TestCase):
+    def test(self):
+        rule = self.create_alert_rule(projects=[self.project, self.create_project()])
+        critical = create_alert_rule_trigger(rule, CRITICAL_TRIGGER_LABEL, 100)
+        warning = create_alert_rule_trigger(rule, WARNING_TRIGGER_LABEL, 50)
+        subs = list(rule.snuba_query.subscriptions.order_by("id"))
+        other_sub = QuerySubscription.objects.create(
+            project=self.project, type="unregistered", subscription_id="an_id"
+        )
+
+        processors = SubscriptionProcessor.for_subscriptions(subs + [other_sub])
+        assert set(processors) == {sub.id for sub in subs + [other_sub]}
+        for sub in subs:
+            processor = processors[sub.id]
+            assert processor.subscription == sub
+            assert processor.alert_rule == rule
+            assert processor.triggers == [warning, critical]
+            assert processor.trigger_alert_counts == {warning.id: 0, critical.id: 0}
+        assert not hasattr(processors[other_sub.id], "alert_rule")
+
+
 class TestUpdateAlertRuleStats(TestCase):
     def test(self):
         alert_rule = AlertRule(id=1)
@@ -2207,3 +2253,15 @@ class TestUpdateAlertRuleStats(TestCase):
         )
 
         assert results == [int(to_timestamp(date)), 20, 10, 3, 15]
+
+    def test_pipeline(self):
+        alert_rule = AlertRule(id=1)
+        sub = QuerySubscription(project_id=2)
+        date = datetime.utcnow().replace(tzinfo=pytz.utc)
+        client = get_redis_client()
+        pipeline = client.pipeline()
+        update_alert_rule_stats(alert_rule, sub, date, {3: 20}, {}, pipeline=pipeline)
+        assert client.get("{alert_rule:1:project:2}:trigger:3:alert_triggered") is None
+
+        pipeline.execute()
+        assert int(client.get("{alert_rule:1:project:2}:trigger:3:alert_triggered")) == 20
@@ -87,3 +87,15 @@ class ProjectCodeOwnersTestCase(TestCase):
                 },
             ],
         }
+
+    def test_get_codeowners_cached_invalidated_on_save(self):
+        assert ProjectCodeOwners.get_codeowners_cached(self.project.id) is None
+
+        rule = Rule(Matcher("codeowners", "docs/*"), [Owner("team", self.team.slug)])
+        code_owners = self.create_codeowners(
+            self.project, self.code_mapping, raw=self.data["raw"], schema=dump_schema([rule])
+        )
+        assert ProjectCodeOwners.get_codeowners_cached(self.project.id) == code_owners
+
+        code_owners.delete()
+        assert ProjectCodeOwners.get_codeowners_cached(self.project.id) is None
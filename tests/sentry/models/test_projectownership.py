@@ -1,3 +1,5 @@
+from unittest import mock
+
 from sentry.models import ActorTuple, ProjectOwnership, Team, User
 from sentry.ownership.grammar import Matcher, Owner, Rule, dump_schema, resolve_actors
 from sentry.testutils import TestCase
@@ -230,6 +232,65 @@ class ProjectOwnershipTestCase(TestCase):
             self.project.id, {"stacktrace": {"frames": [{"filename": "src/foo.py"}]}}
         ) == (True, [self.user, self.team], False)
 
+    def test_get_autoassign_owners_cached(self):
+        rule_a = Rule(Matcher("path", "*.py"), [Owner("team", self.team.slug)])
+        ownership = ProjectOwnership.objects.create(
+            project_id=self.project.id, schema=dump_schema([rule_a]), auto_assignment=True
+        )
+
+        with mock.patch.object(
+            ProjectOwnership,
+            "_matching_ownership_rules",
+            wraps=ProjectOwnership._matching_ownership_rules,
+        ) as matching_rules:
+            for lineno in range(3):
+                data = {"stacktrace": {"frames": [{"filename": "foo.py", "lineno": lineno}]}}
+                assert ProjectOwnership.get_autoassign_owners(self.project.id, data) == (
+                    True,
+                    [self.team],
+                    False,
+                )
+            assert matching_rules.call_count == 1
+
+            # Owners are resolved again when the result is cached
+            Team.objects.filter(id=self.team.id).update(name="renamed")
+            _, owners, _ = ProjectOwnership.get_autoassign_owners(self.project.id, data)
+            assert owners[0].name == "renamed"
+            assert matching_rules.call_count == 1
+
+            # Updating the rules invalidates the cached result
+            ownership.schema = dump_schema([])
+            ownership.save()
+            assert ProjectOwnership.get_autoassign_owners(self.project.id, data) == (
+                True,
+                [],
+                False,
+            )
+            assert matching_rules.call_count == 2
+
+    def test_get_owners_cached(self):
+        rule_a = Rule(Matcher("path", "*.py"), [Owner("team", self.team.slug)])
+        ProjectOwnership.objects.create(
+            project_id=self.project.id, schema=dump_schema([rule_a]), fallthrough=True
+        )
+
+        data = {"stacktrace": {"frames": [{"filename": "foo.py"}]}}
+        with mock.patch.object(
+            ProjectOwnership,
+            "_matching_ownership_rules",
+            wraps=ProjectOwnership._matching_ownership_rules,
+        ) as matching_rules:
+            for _ in range(2):
+                assert ProjectOwnership.get_owners(self.project.id, data) == (
+                    [ActorTuple(self.team.id, Team)],
+                    [rule_a],
+                )
+                assert ProjectOwnership.get_owners(self.project.id, {}) == (
+                    ProjectOwnership.Everyone,
+                    None,
+                )
+            assert matching_rules.call_count == 2
+
     def test_abs_path_when_filename_present(self):
         frame = {
             "filename": "computer.cpp",
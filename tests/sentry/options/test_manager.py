@@ -297,6 +297,25 @@ class OptionsManagerTest(TestCase):
         keys = list(self.manager.filter(flag=FLAG_REQUIRED))
         assert {k.name for k in keys} == {"required", "nostorerequired"}
 
+    def test_bootstrap(self):
+        self.manager.register("nostore", flags=FLAG_NOSTORE)
+
+        with patch.object(self.store, "bootstrap", return_value=True) as bootstrap:
+            self.manager.get("foo")
+            assert not bootstrap.called
+
+            with self.settings(SENTRY_OPTIONS_BOOTSTRAP_INTERVAL=10), patch(
+                "sentry.options.manager.time", return_value=100
+            ) as mocked_time:
+                self.manager.get("foo")
+                self.manager.get("foo")
+                assert bootstrap.call_count == 1
+                assert [key.name for key in bootstrap.call_args[0][0]] == ["foo"]
+
+                mocked_time.return_value = 110
+                self.manager.get("foo")
+                assert bootstrap.call_count == 2
+
     def test_isset(self):
         self.manager.register("basic")
         assert self.manager.isset("basic") is False
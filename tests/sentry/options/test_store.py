@@ -149,3 +149,41 @@ class OptionsStoreTest(TestCase):
         mocked_time.return_value = 26
         store.clean_local_cache()
         assert not store._local_cache
+
+    def test_bootstrap(self):
+        store = self.store
+        cached_key, stored_key, unset_key = self.make_key(), self.make_key(), self.make_key()
+        store.set(cached_key, "cached")
+        Option.objects.create(key=stored_key.name, value="stored")
+        store.flush_local_cache()
+
+        assert store.bootstrap([cached_key, stored_key, unset_key])
+        assert store.cache.get(stored_key.cache_key) == "stored"
+
+        with patch.object(Option.objects, "get_queryset", side_effect=RuntimeError()):
+            with patch.object(store.cache, "get", side_effect=RuntimeError()):
+                assert store.get(cached_key) == "cached"
+                assert store.get(stored_key) == "stored"
+                assert store.get(unset_key) is None
+
+        # Setting a key replaces the marker of it not being set
+        store.set(unset_key, "set")
+        assert store.get(unset_key) == "set"
+
+    def test_bootstrap_without_cache(self):
+        assert not OptionsStore(cache=None).bootstrap([self.key])
+
+    def test_invalidation(self):
+        store, key = self.store, self.key
+        store.set(key, "bar")
+
+        with self.settings(SENTRY_OPTIONS_PUBSUB={"host": "localhost"}), patch(
+            "sentry.options.store.RedisPublisher"
+        ) as publisher:
+            store.set(key, "baz")
+        publisher.return_value.publish.assert_called_once_with(
+            "sentry:options:invalidate", key.cache_key
+        )
+
+        store._handle_invalidation(key.cache_key.encode("utf-8"))
+        assert key.cache_key not in store._local_cache
@@ -7,6 +7,8 @@ from sentry.ownership.grammar import (
     convert_codeowners_syntax,
     convert_schema_to_rules_text,
     dump_schema,
+    get_schema_matcher_types,
+    hash_matcher_relevant_data,
     load_schema,
     parse_code_owners,
     parse_rules,
@@ -210,6 +212,47 @@ def test_matcher_test_tags_without_tag_data(data):
     assert not Matcher("tags.bar", "barval").test(data)
 
 
+def test_get_schema_matcher_types():
+    assert get_schema_matcher_types(None) == set()
+    assert get_schema_matcher_types(dump_schema(parse_rules(fixture_data))) == {
+        "path",
+        "url",
+        "tags.foo",
+        "module",
+        "codeowners",
+    }
+
+
+def test_hash_matcher_relevant_data():
+    data = {
+        "request": {"url": "http://example.com/foo"},
+        "tags": [["foo", "foo_value"], ["bar", "barval"]],
+        "stacktrace": {"frames": [{"filename": "foo.py", "module": "foo", "lineno": 1}]},
+    }
+
+    # Fields that no matcher looks at don't change the hash
+    other = {
+        **data,
+        "message": "something else",
+        "tags": [["foo", "foo_value"], ["bar", "other"]],
+        "stacktrace": {"frames": [{"filename": "foo.py", "module": "foo", "lineno": 2}]},
+    }
+    types = {"path", "module", "url", "tags.foo"}
+    assert hash_matcher_relevant_data(types, data) == hash_matcher_relevant_data(types, other)
+
+    # ... but fields that they do look at change it
+    assert hash_matcher_relevant_data({"tags.bar"}, data) != hash_matcher_relevant_data(
+        {"tags.bar"}, other
+    )
+    assert hash_matcher_relevant_data({"path"}, data) != hash_matcher_relevant_data(
+        {"path"}, {**data, "stacktrace": {"frames": [{"filename": "bar.py"}]}}
+    )
+    assert hash_matcher_relevant_data({"url"}, data) != hash_matcher_relevant_data(
+        {"url"}, {**data, "request": {"url": "http://example.com/bar"}}
+    )
+    assert hash_matcher_relevant_data({"url"}, data) != hash_matcher_relevant_data({"url"}, {})
+
+
 def _assert_matcher(matcher: Matcher, path_details, expected):
     """Helper function to reduce repeated code"""
     frames = {"stacktrace": {"frames": path_details}}
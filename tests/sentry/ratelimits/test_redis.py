@@ -65,3 +65,30 @@ class RedisRateLimiterTest(TestCase):
             assert not limited
             assert value == 1
             assert reset_time == expected_reset_time + 5
+
+    def test_approximate(self):
+        backend = RedisRateLimiter(approximate_categories=["ip"], reservation_fraction=0.5)
+
+        with freeze_time("2000-01-01") as frozen_time:
+            results = [backend.is_limited_with_value("ip:foo", 10)[:2] for _ in range(12)]
+            assert results == [(False, value) for value in range(1, 11)] + [(True, 11), (True, 11)]
+            # Reservations of 1, 2, 4 and 5 values
+            assert backend.current_value("ip:foo") == 12
+
+            # Other categories are still counted exactly
+            assert backend.is_limited_with_value("user:foo", 10)[:2] == (False, 1)
+            assert backend.current_value("user:foo") == 1
+
+            frozen_time.tick(60)
+            assert backend.is_limited_with_value("ip:foo", 10)[:2] == (False, 1)
+            assert backend.current_value("ip:foo") == 1
+
+    def test_approximate_shared_counter(self):
+        backend = RedisRateLimiter(approximate_categories=["ip"], reservation_fraction=0.5)
+        other_backend = RedisRateLimiter(approximate_categories=["ip"], reservation_fraction=0.5)
+
+        with freeze_time("2000-01-01"):
+            assert backend.is_limited_with_value("ip:foo", 3)[:2] == (False, 1)
+            assert other_backend.is_limited_with_value("ip:foo", 3)[:2] == (False, 2)
+            assert backend.is_limited_with_value("ip:foo", 3)[:2] == (False, 3)
+            assert other_backend.is_limited_with_value("ip:foo", 3)[0]
@@ -0,0 +1,41 @@
+import pytest
+
+from sentry.relay.projectconfig_cache.redis import COMPRESSED_HEADER, RedisProjectConfigCache
+from sentry.utils import json
+
+CONFIG = {"disabled": False, "slug": "bar", "config": {"piiConfig": {"rules": {}}}}
+
+
+@pytest.mark.parametrize("compression", [False, True])
+def test_roundtrip(compression):
+    cache = RedisProjectConfigCache(compression=compression)
+    cache.set_many({"abc": CONFIG, "def": {"disabled": True}})
+
+    assert cache.get("abc") == CONFIG
+    assert cache.get("def") == {"disabled": True}
+    assert cache.get("ghi") is None
+
+    raw = cache.get_many(["abc", "def", "ghi"])
+    assert set(raw) == {"abc", "def"}
+    assert json.loads(raw["abc"].decode("utf-8")) == CONFIG
+
+    cache.delete_many(["abc"])
+    assert cache.get("abc") is None
+    assert set(cache.get_many(["abc", "def"])) == {"def"}
+
+
+def test_compressed_format():
+    cache = RedisProjectConfigCache(compression=True)
+    cache.set_many({"abc": CONFIG})
+    assert cache.cluster.get("relayconfig:abc").startswith(COMPRESSED_HEADER)
+
+
+def test_reads_both_formats():
+    RedisProjectConfigCache(compression=False).set_many({"abc": CONFIG})
+    RedisProjectConfigCache(compression=True).set_many({"def": CONFIG})
+
+    for compression in (False, True):
+        cache = RedisProjectConfigCache(compression=compression)
+        assert cache.get("abc") == cache.get("def") == CONFIG
+        raw = cache.get_many(["abc", "def"])
+        assert raw["abc"] == raw["def"] == json.dumps(CONFIG).encode("utf-8")
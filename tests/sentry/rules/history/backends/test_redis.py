@@ -0,0 +1,131 @@
+from datetime import timedelta
+from unittest import mock
+
+from freezegun import freeze_time
+
+from sentry.models import Rule, RuleFireHistory
+from sentry.rules.history.backends.redis import (
+    BUFFER_KEY,
+    HOURLY_START_KEY,
+    RedisBufferedRuleHistoryBackend,
+)
+from sentry.testutils import TestCase
+from sentry.testutils.helpers.datetime import before_now
+from sentry.utils.dates import to_timestamp
+
+
+class BaseRedisBufferedRuleHistoryBackendTest(TestCase):
+    def setUp(self):
+        self.backend = RedisBufferedRuleHistoryBackend(flush_size=3)
+
+
+@mock.patch("sentry.rules.history.tasks.flush_rule_fire_history")
+class RecordTest(BaseRedisBufferedRuleHistoryBackendTest):
+    def test(self, flush_task):
+        rule = Rule.objects.create(project=self.event.project)
+        self.backend.record(rule, self.group)
+        self.backend.record(rule, self.group)
+        assert not RuleFireHistory.objects.filter(rule=rule).exists()
+        assert self.backend.client.llen(BUFFER_KEY) == 2
+        # The first record schedules a delayed flush
+        flush_task.apply_async.assert_called_once_with(countdown=self.backend.flush_interval)
+        assert not flush_task.delay.called
+
+        group_2 = self.create_group()
+        self.backend.record(rule, group_2)
+        # Reaching the flush size flushes right away
+        flush_task.delay.assert_called_once_with()
+
+        self.backend.flush()
+        assert self.backend.client.llen(BUFFER_KEY) == 0
+        assert RuleFireHistory.objects.filter(rule=rule, group=self.group).count() == 2
+        assert RuleFireHistory.objects.filter(rule=rule, group=group_2).count() == 1
+
+    def test_flush_multiple_batches(self, flush_task):
+        rule = Rule.objects.create(project=self.event.project)
+        for _ in range(7):
+            self.backend.record(rule, self.group)
+        self.backend.flush()
+        assert self.backend.client.llen(BUFFER_KEY) == 0
+        assert RuleFireHistory.objects.filter(rule=rule, group=self.group).count() == 7
+
+    def test_flush_deleted_rule(self, flush_task):
+        rule = Rule.objects.create(project=self.event.project)
+        rule_2 = Rule.objects.create(project=self.event.project)
+        self.backend.record(rule, self.group)
+        self.backend.record(rule_2, self.group)
+        rule_2.delete()
+        self.backend.flush()
+        assert RuleFireHistory.objects.filter(rule=rule).count() == 1
+        assert RuleFireHistory.objects.count() == 1
+
+    def test_flush_failure(self, flush_task):
+        rule = Rule.objects.create(project=self.event.project)
+        self.backend.record(rule, self.group)
+        flush_task.reset_mock()
+
+        with mock.patch.object(
+            self.backend, "_write_records", side_effect=Exception
+        ), self.assertRaises(Exception):
+            self.backend.flush()
+        # The records are put back, and flushed again later
+        assert self.backend.client.llen(BUFFER_KEY) == 1
+        flush_task.apply_async.assert_called_once_with(countdown=self.backend.flush_interval)
+
+        self.backend.flush()
+        assert RuleFireHistory.objects.filter(rule=rule).count() == 1
+
+
+@mock.patch("sentry.rules.history.tasks.flush_rule_fire_history")
+class FetchRuleHourlyStatsTest(BaseRedisBufferedRuleHistoryBackendTest):
+    def test(self, flush_task):
+        rule = Rule.objects.create(project=self.event.project)
+        rule_2 = Rule.objects.create(project=self.event.project)
+        now = before_now().replace(minute=30)
+        self.backend.client.set(HOURLY_START_KEY, int(to_timestamp(now - timedelta(days=1))))
+
+        for i in range(3):
+            with freeze_time(now - timedelta(hours=i)):
+                for _ in range(i + 1):
+                    self.backend.record(rule, self.group)
+        with freeze_time(now - timedelta(hours=1)):
+            self.backend.record(rule_2, self.group)
+
+        with freeze_time(now):
+            results = self.backend.fetch_rule_hourly_stats(rule, before_now(hours=24), before_now())
+            assert len(results) == 24
+            assert [r.count for r in results[-4:]] == [0, 3, 2, 1]
+
+            results = self.backend.fetch_rule_hourly_stats(
+                rule_2, before_now(hours=24), before_now()
+            )
+            assert len(results) == 24
+            assert [r.count for r in results[-4:]] == [0, 1, 0, 0]
+
+        # Nothing was written to postgres, the counts come from the pre-rolled buckets
+        assert not RuleFireHistory.objects.exists()
+
+    def test_hours_before_counting(self, flush_task):
+        rule = Rule.objects.create(project=self.event.project)
+        now = before_now().replace(minute=30)
+
+        # Fires recorded before switching to this backend
+        for i in range(2, 4):
+            RuleFireHistory.objects.create(
+                project=rule.project,
+                rule=rule,
+                group=self.group,
+                date_added=now - timedelta(hours=i),
+            )
+        with freeze_time(now - timedelta(hours=1)):
+            self.backend.record(rule, self.group)
+            self.backend.record(rule, self.group)
+        with freeze_time(now):
+            self.backend.record(rule, self.group)
+        self.backend.flush()
+
+        with freeze_time(now):
+            results = self.backend.fetch_rule_hourly_stats(rule, before_now(hours=24), before_now())
+            assert len(results) == 24
+            # Hours until the first fully counted one are aggregated from postgres
+            assert [r.count for r in results[-5:]] == [0, 1, 1, 2, 1]
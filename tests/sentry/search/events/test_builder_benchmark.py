@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from sentry.api.event_search import _parse_query
+from sentry.discover.arithmetic import _parse_equation
+from sentry.search.events.builder import QueryBuilder
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils.snuba import Dataset
+
+# Typical dashboard widget queries: (query, selected columns, equations, orderby)
+WIDGETS = [
+    ("event.type:error", ["count()"], [], None),
+    (
+        "event.type:transaction",
+        ["transaction", "p50(transaction.duration)", "p95(transaction.duration)"],
+        [],
+        ["-p95(transaction.duration)"],
+    ),
+    (
+        "event.type:transaction transaction.op:pageload",
+        ["transaction", "count()", "failure_rate()", "count_unique(user)"],
+        ["count() * failure_rate()"],
+        ["-count()"],
+    ),
+    (
+        "!user.email:*@example.com (browser.name:Chrome OR browser.name:Firefox) "
+        "transaction.duration:>300ms",
+        ["browser.name", "avg(transaction.duration)", "max(transaction.duration)"],
+        ["max(transaction.duration) - avg(transaction.duration)"],
+        ["-avg(transaction.duration)"],
+    ),
+]
+
+
+def build_queries():
+    end = timezone.now()
+    params = {"project_id": [1, 2, 3], "start": end - timedelta(days=1), "end": end}
+    for query, selected_columns, equations, orderby in WIDGETS:
+        QueryBuilder(
+            Dataset.Discover,
+            params,
+            query=query,
+            selected_columns=selected_columns,
+            equations=equations,
+            orderby=orderby,
+            use_aggregate_conditions=True,
+        ).get_snql_query()
+
+
+def clear_caches():
+    _parse_query.cache_clear()
+    _parse_equation.cache_clear()
+
+
+@requires_pytest_benchmark
+def test_benchmark_query_builder_uncached(benchmark):
+    benchmark.pedantic(build_queries, setup=clear_caches, rounds=50)
+
+
+@requires_pytest_benchmark
+def test_benchmark_query_builder_cached(benchmark):
+    build_queries()
+    benchmark(build_queries)
@@ -0,0 +1,32 @@
+from unittest import mock
+
+from sentry.models import Group
+from sentry.search.snuba.candidates import decode_group_ids, encode_group_ids, get_candidates
+from sentry.testutils import TestCase
+
+
+def test_encode_group_ids():
+    group_ids = [5, 1, 2 ** 40, 3, 1000]
+    assert decode_group_ids(encode_group_ids(group_ids)) == frozenset(group_ids)
+    assert decode_group_ids(encode_group_ids([])) == frozenset()
+
+
+class GetCandidatesTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.groups = [self.create_group() for _ in range(3)]
+        self.queryset = Group.objects.filter(project=self.project)
+
+    def test_limit(self):
+        assert get_candidates(self.queryset, 5, 0) == {group.id for group in self.groups}
+        assert len(get_candidates(self.queryset, 1, 0)) == 2
+
+    def test_cache(self):
+        candidates = get_candidates(self.queryset, 5, 60)
+
+        with mock.patch.object(type(self.queryset), "using_replica", side_effect=AssertionError):
+            assert get_candidates(self.queryset, 5, 60) == candidates
+
+        # Different filters are cached separately
+        queryset = self.queryset.filter(id=self.groups[0].id)
+        assert get_candidates(queryset, 5, 60) == {self.groups[0].id}
@@ -0,0 +1,39 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from sentry.api.event_search import SearchFilter, SearchKey, SearchValue
+from sentry.models import User
+from sentry.search.snuba.executors import get_hits_cache_key
+from sentry.testutils import TestCase
+
+
+class GetHitsCacheKeyTest(TestCase):
+    def get_key(self, search_filters, start, end, retention_window_start=None):
+        return get_hits_cache_key(
+            [self.project.id], None, "last_seen", search_filters, start, end, retention_window_start
+        )
+
+    def test_model_values(self):
+        end = timezone.now()
+        start = end - timedelta(days=14)
+
+        def assigned_to(user):
+            return [SearchFilter(SearchKey("assigned_to"), "=", SearchValue([user]))]
+
+        key = self.get_key(assigned_to(self.user), start, end)
+        assert self.get_key(assigned_to(User.objects.get(id=self.user.id)), start, end) == key
+        assert self.get_key(assigned_to(self.create_user()), start, end) != key
+
+    def test_dates(self):
+        end = timezone.now().replace(second=0, microsecond=0)
+        start = end - timedelta(days=14)
+        search_filters = [SearchFilter(SearchKey("status"), "=", SearchValue([0]))]
+
+        key = self.get_key(search_filters, start, end)
+        assert (
+            self.get_key(search_filters, start + timedelta(seconds=10), end + timedelta(seconds=10))
+            == key
+        )
+        assert self.get_key(search_filters, end - timedelta(days=1), end) != key
+        assert self.get_key(search_filters, start, end, start) != key
@@ -0,0 +1,52 @@
+import random
+from datetime import datetime
+from unittest.mock import patch
+
+from arroyo.backends.kafka import KafkaPayload
+from arroyo.types import Message, Partition, Topic
+
+from sentry.sentry_metrics.indexer.mock import SimpleIndexer
+from sentry.sentry_metrics.multiprocess import process_messages
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils import json
+
+# Roughly the size of the batches the consumer hands to its workers.
+BATCH_SIZE = 1000
+
+
+def make_batch():
+    rng = random.Random(0)
+    messages = []
+    for offset in range(BATCH_SIZE):
+        payload = {
+            "name": rng.choice(["c:sessions", "d:transactions.duration", "s:users"]),
+            "tags": {
+                "environment": rng.choice(["production", "staging"]),
+                "release": f"backend@{rng.randint(1, 50)}",
+                "session.status": rng.choice(["init", "healthy", "errored", "crashed"]),
+                "transaction": f"/api/{rng.randint(1, 200)}/",
+            },
+            "timestamp": 1640000000 + offset,
+            "type": "d",
+            "value": [rng.random() for _ in range(5)],
+            "org_id": rng.randint(1, 10),
+            "project_id": rng.randint(1, 100),
+        }
+        messages.append(
+            Message(
+                Partition(Topic("ingest-metrics"), 0),
+                offset,
+                KafkaPayload(None, json.dumps(payload).encode("utf-8"), []),
+                datetime.now(),
+            )
+        )
+    last = messages[-1]
+    return Message(last.partition, last.offset, messages, last.timestamp)
+
+
+@requires_pytest_benchmark
+def test_benchmark_process_messages(benchmark):
+    outer_message = make_batch()
+    with patch("sentry.sentry_metrics.multiprocess.get_indexer", return_value=SimpleIndexer()):
+        new_messages = benchmark(process_messages, outer_message)
+    assert len(new_messages) == BATCH_SIZE
@@ -1,6 +1,6 @@
 import time
 from datetime import datetime, timezone
-from typing import Dict, List, Mapping, MutableMapping, Union
+from typing import Dict, List, Mapping, MutableMapping, Set, Union
 from unittest.mock import Mock, call, patch
 
 import pytest
@@ -251,6 +251,43 @@ def test_process_messages(mock_indexer, mock_task) -> None:
     assert new_batch == expected_new_batch
 
 
+class CardinalityLimitedIndexer(MockIndexer):
+    def bulk_record(
+        self, org_strings: MutableMapping[int, Set[str]]
+    ) -> Mapping[int, Mapping[str, int]]:
+        mapping = super().bulk_record(org_strings)
+        # The org reached its limit before the status of the distribution payload
+        return {
+            org_id: {k: v for k, v in org_mapping.items() if k != "healthy"}
+            for org_id, org_mapping in mapping.items()
+        }
+
+
+@patch("sentry.sentry_metrics.indexer.tasks.process_indexed_metrics")
+@patch("sentry.sentry_metrics.multiprocess.logger")
+def test_process_messages_cardinality_limited(mock_logger, mock_task) -> None:
+    message_payloads = [counter_payload, distribution_payload, set_payload]
+    message_batch = [
+        Message(
+            Partition(Topic("topic"), 0),
+            i + 1,
+            KafkaPayload(None, json.dumps(payload).encode("utf-8"), []),
+            datetime.now(),
+        )
+        for i, payload in enumerate(message_payloads)
+    ]
+    last = message_batch[-1]
+    outer_message = Message(last.partition, last.offset, message_batch, last.timestamp)
+
+    with patch(
+        "sentry.sentry_metrics.multiprocess.get_indexer", return_value=CardinalityLimitedIndexer()
+    ):
+        new_batch = process_messages(outer_message=outer_message)
+
+    assert [m.offset for m in new_batch] == [1, 3]
+    assert not mock_logger.error.called
+
+
 def test_produce_step() -> None:
     topic = Topic("snuba-metrics")
     partition = Partition(topic, 0)
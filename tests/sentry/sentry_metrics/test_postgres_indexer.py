@@ -1,5 +1,8 @@
-from sentry.sentry_metrics.indexer.models import MetricsKeyIndexer
+from unittest import mock
+
+from sentry.sentry_metrics.indexer.models import MetricsKeyIndexer, StringIndexer
 from sentry.sentry_metrics.indexer.postgres import PGStringIndexer
+from sentry.sentry_metrics.indexer.postgres_v2 import PGStringIndexerV2
 from sentry.testutils.cases import TestCase
 
 
@@ -16,7 +19,7 @@ class PostgresIndexerTest(TestCase):
                 "id", flat=True
             )
         )
-        assert list(results.values()) == obj_ids
+        assert sorted(results[org_id].values()) == sorted(obj_ids)
 
         # test resolve and reverse_resolve
         obj = MetricsKeyIndexer.objects.get(string="hello")
@@ -30,3 +33,82 @@ class PostgresIndexerTest(TestCase):
         # test invalid values
         assert PGStringIndexer().resolve("beep") is None
         assert PGStringIndexer().reverse_resolve(1234) is None
+
+    def test_local_cache(self):
+        org_id = self.organization.id
+        indexer = PGStringIndexer(local_cache_size=2)
+        results = indexer.bulk_record(org_strings={org_id: {"hello", "hey"}})[org_id]
+        assert len(indexer._local_cache) == 2
+
+        with mock.patch.object(MetricsKeyIndexer.objects, "get_many_from_cache") as get_many:
+            assert indexer.bulk_record(org_strings={org_id: {"hello", "hey"}}) == {org_id: results}
+            assert indexer.resolve("hello") == results["hello"]
+            assert indexer.reverse_resolve(results["hey"]) == "hey"
+        assert not get_many.called
+
+        # Only the strings missing locally are fetched, the least recently used
+        # string is evicted
+        results.update(indexer.bulk_record(org_strings={org_id: {"hey", "hi"}})[org_id])
+        assert indexer._local_cache.get_many(["hello", "hey", "hi"]) == {
+            "hey": results["hey"],
+            "hi": results["hi"],
+        }
+        assert indexer.resolve("hello") == results["hello"]
+
+    def test_warm(self):
+        org_id = self.organization.id
+        results = PGStringIndexer().bulk_record(org_strings={org_id: {"hello", "hey", "hi"}})
+
+        indexer = PGStringIndexer(local_cache_size=10)
+        indexer.warm(2)
+        assert len(indexer._local_cache) == 2
+        indexer.warm(10)
+        assert indexer._local_cache.get_many(["hello", "hey", "hi"]) == results[org_id]
+
+
+class PostgresIndexerV2Test(TestCase):
+    def test_indexer(self):
+        org_id = self.organization.id
+        other_org_id = self.create_organization().id
+        indexer = PGStringIndexerV2()
+
+        results = indexer.bulk_record({org_id: {"hello", "hey"}, other_org_id: {"hello"}})
+        rows = StringIndexer.objects.values_list("organization_id", "string", "id")
+        assert results == {
+            org_id: {"hello": mock.ANY, "hey": mock.ANY},
+            other_org_id: {"hello": mock.ANY},
+        }
+        assert {(o, s, results[o][s]) for o, s, _ in rows} == set(rows)
+        # Strings are scoped by organization
+        assert results[org_id]["hello"] != results[other_org_id]["hello"]
+
+        assert indexer.record(org_id, "hello") == results[org_id]["hello"]
+        assert indexer.resolve("hello", org_id=other_org_id) == results[other_org_id]["hello"]
+        assert indexer.resolve("hey", org_id=other_org_id) is None
+        assert indexer.resolve("hey") is None
+        assert indexer.reverse_resolve(results[org_id]["hey"]) == "hey"
+        assert indexer.reverse_resolve(1234) is None
+
+    def test_insert_conflict(self):
+        org_id = self.organization.id
+        existing = StringIndexer.objects.create(organization_id=org_id, string="hello")
+
+        # As if the string had been created concurrently, after looking it up
+        results = PGStringIndexerV2()._create({(org_id, "hello"), (org_id, "hey")})
+
+        assert results[(org_id, "hello")] == existing.id
+        assert results[(org_id, "hey")] == StringIndexer.objects.get(string="hey").id
+
+    def test_cardinality_limit(self):
+        org_id = self.organization.id
+        other_org_id = self.create_organization().id
+        indexer = PGStringIndexerV2(local_cache_size=100, cardinality_limit=3)
+
+        results = indexer.bulk_record({org_id: {"a", "b"}, other_org_id: {"a"}})
+        assert len(results[org_id]) == 2
+
+        results = indexer.bulk_record({org_id: {"a", "c", "d", "e"}})
+        assert set(results[org_id]) == {"a", "c"}
+        assert indexer.record(org_id, "f") is None
+        assert indexer.record(other_org_id, "f") is not None
+        assert StringIndexer.objects.filter(organization_id=org_id).count() == 3
@@ -14,6 +14,8 @@ from sentry.snuba.query_subscription_consumer import (
     InvalidMessageError,
     InvalidSchemaError,
     QuerySubscriptionConsumer,
+    batch_subscriber_registry,
+    register_batch_subscriber,
     register_subscriber,
     subscriber_registry,
 )
@@ -124,6 +126,85 @@ class HandleMessageTest(BaseQuerySubscriptionTest, TestCase):
         mock_callback.assert_called_once_with(data["payload"], sub)
 
 
+class HandleMessagesTest(BaseQuerySubscriptionTest, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.orig_registry = deepcopy(subscriber_registry)
+        self.orig_batch_registry = deepcopy(batch_subscriber_registry)
+
+    def tearDown(self):
+        super().tearDown()
+        subscriber_registry.clear()
+        subscriber_registry.update(self.orig_registry)
+        batch_subscriber_registry.clear()
+        batch_subscriber_registry.update(self.orig_batch_registry)
+
+    def create_subscription(self, registration_key):
+        with self.tasks():
+            snuba_query = create_snuba_query(
+                QueryDatasets.EVENTS,
+                "hello",
+                "count()",
+                timedelta(minutes=10),
+                timedelta(minutes=1),
+                None,
+            )
+            sub = create_snuba_subscription(self.project, registration_key, snuba_query)
+        sub.refresh_from_db()
+        return sub
+
+    def build_partition_message(self, subscription, partition, timestamp):
+        data = deepcopy(self.valid_wrapper)
+        data["payload"]["subscription_id"] = subscription.subscription_id
+        data["payload"]["timestamp"] = timestamp
+        message = self.build_mock_message(data)
+        message.partition.return_value = partition
+        return message
+
+    def test_batch_subscriber(self):
+        registration_key = "batch_registered_test"
+        mock_callback = mock.Mock()
+        mock_batch_callback = mock.Mock()
+        register_subscriber(registration_key)(mock_callback)
+        register_batch_subscriber(registration_key)(mock_batch_callback)
+        sub = self.create_subscription(registration_key)
+        other_sub = self.create_subscription(registration_key)
+
+        self.consumer.handle_messages(
+            [
+                self.build_partition_message(sub, 0, "2020-01-01T01:23:45.1234"),
+                self.build_partition_message(other_sub, 1, "2020-01-01T01:23:45.1234"),
+                self.build_partition_message(sub, 0, "2020-01-01T01:24:45.1234"),
+            ]
+        )
+        assert not mock_callback.called
+        assert mock_batch_callback.call_count == 2
+
+        (updates,), _ = mock_batch_callback.call_args_list[0]
+        assert [(update["timestamp"].minute, s) for update, s in updates] == [
+            (23, sub),
+            (24, sub),
+        ]
+        assert updates[0][1].snuba_query.query == "hello"
+        (updates,), _ = mock_batch_callback.call_args_list[1]
+        assert [s for _, s in updates] == [other_sub]
+
+    def test_subscriber(self):
+        registration_key = "batch_fallback_test"
+        mock_callback = mock.Mock(side_effect=[Exception(), None])
+        register_subscriber(registration_key)(mock_callback)
+        sub = self.create_subscription(registration_key)
+
+        self.consumer.handle_messages(
+            [
+                self.build_partition_message(sub, 0, "2020-01-01T01:23:45.1234"),
+                self.build_partition_message(sub, 0, "2020-01-01T01:24:45.1234"),
+            ]
+        )
+        # An update failing doesn't prevent the next ones from being handled.
+        assert mock_callback.call_count == 2
+
+
 class ParseMessageValueTest(BaseQuerySubscriptionTest, unittest.TestCase):
     def run_test(self, message):
         self.consumer.parse_message_value(json.dumps(message))
@@ -198,3 +279,16 @@ class RegisterSubscriberTest(unittest.TestCase):
         with self.assertRaises(Exception) as cm:
             register_subscriber("hello")(other_callback)
         assert str(cm.exception) == "Handler already registered for hello"
+
+    def test_register_batch(self):
+        orig_batch_registry = deepcopy(batch_subscriber_registry)
+        try:
+            callback = object()
+            register_batch_subscriber("hello")(callback)
+            assert batch_subscriber_registry["hello"] == callback
+            with self.assertRaises(Exception) as cm:
+                register_batch_subscriber("hello")(object())
+            assert str(cm.exception) == "Batch handler already registered for hello"
+        finally:
+            batch_subscriber_registry.clear()
+            batch_subscriber_registry.update(orig_batch_registry)
@@ -1,3 +1,4 @@
+from dataclasses import replace
 from datetime import timedelta
 from unittest import mock
 from unittest.mock import ANY, Mock, patch
@@ -24,7 +25,7 @@ from sentry.models import (
 from sentry.ownership.grammar import Matcher, Owner, Rule, dump_schema
 from sentry.rules import init_registry
 from sentry.tasks.merge import merge_groups
-from sentry.tasks.post_process import post_process_group
+from sentry.tasks.post_process import post_process_context, post_process_group
 from sentry.testutils import TestCase
 from sentry.testutils.helpers import with_feature
 from sentry.testutils.helpers.datetime import before_now, iso_format
@@ -129,6 +130,61 @@ class PostProcessGroupTest(TestCase):
         )
         assert event_processing_store.get(cache_key) is None
 
+    def test_loads_needed_context(self):
+        event = self.store_event(data={"message": "testing"}, project_id=self.project.id)
+
+        with patch.object(
+            post_process_context, "load", wraps=post_process_context.load
+        ) as mock_load:
+            post_process_group(
+                is_new=True,
+                is_regression=False,
+                is_new_group_environment=True,
+                cache_key=write_event_to_cache(event),
+                group_id=event.group_id,
+            )
+            # New groups can't be snoozed, and service hooks are disabled
+            assert set(mock_load.call_args[1]["names"]) == {
+                "owners_exists",
+                "assignees_exists",
+                "rules",
+                "org_has_commit",
+                "send_error_created_hooks",
+            }
+
+            with self.feature("projects:servicehooks"):
+                post_process_group(
+                    is_new=False,
+                    is_regression=False,
+                    is_new_group_environment=False,
+                    cache_key=write_event_to_cache(event),
+                    group_id=event.group_id,
+                )
+            assert {"snooze", "service_hooks"} <= set(mock_load.call_args[1]["names"])
+
+    @patch("sentry.rules.processor.RuleProcessor")
+    def test_context_loader_error(self, mock_processor):
+        event = self.store_event(data={"message": "testing"}, project_id=self.project.id)
+        entries = post_process_context._entries
+        failing_entries = {
+            name: replace(entries[name], loader=Mock(side_effect=Exception("boom")))
+            for name in ("rules", "owners_exists")
+        }
+
+        with patch.dict(entries, failing_entries):
+            post_process_group(
+                is_new=True,
+                is_regression=False,
+                is_new_group_environment=True,
+                cache_key=write_event_to_cache(event),
+                group_id=event.group_id,
+            )
+        # The processor loads the rules itself
+        mock_processor.assert_called_once_with(
+            EventMatcher(event), True, False, True, False, rules=None
+        )
+        mock_processor.return_value.apply.assert_called_once_with()
+
     @patch("sentry.rules.processor.RuleProcessor")
     def test_rule_processor_backwards_compat(self, mock_processor):
         event = self.store_event(data={}, project_id=self.project.id)
@@ -147,7 +203,9 @@ class PostProcessGroupTest(TestCase):
             cache_key=cache_key,
         )
 
-        mock_processor.assert_called_once_with(EventMatcher(event), True, False, True, False)
+        mock_processor.assert_called_once_with(
+            EventMatcher(event), True, False, True, False, rules=ANY
+        )
         mock_processor.return_value.apply.assert_called_once_with()
 
         mock_callback.assert_called_once_with(EventMatcher(event), mock_futures)
@@ -170,7 +228,9 @@ class PostProcessGroupTest(TestCase):
             group_id=event.group_id,
         )
 
-        mock_processor.assert_called_once_with(EventMatcher(event), True, False, True, False)
+        mock_processor.assert_called_once_with(
+            EventMatcher(event), True, False, True, False, rules=ANY
+        )
         mock_processor.return_value.apply.assert_called_once_with()
 
         mock_callback.assert_called_once_with(EventMatcher(event), mock_futures)
@@ -262,7 +322,7 @@ class PostProcessGroupTest(TestCase):
         )
         # Ensure that rule processing sees the merged group.
         mock_processor.assert_called_with(
-            EventMatcher(event, group=group2), True, False, True, False
+            EventMatcher(event, group=group2), True, False, True, False, rules=ANY
         )
 
     @patch("sentry.signals.issue_unignored.send_robust")
@@ -286,7 +346,7 @@ class PostProcessGroupTest(TestCase):
         GroupInbox.objects.filter(group=group).delete()  # Delete so it creates the UNIGNORED entry.
         Activity.objects.filter(group=group).delete()
 
-        mock_processor.assert_called_with(EventMatcher(event), True, False, True, False)
+        mock_processor.assert_called_with(EventMatcher(event), True, False, True, False, rules=ANY)
 
         cache_key = write_event_to_cache(event)
         # Check for has_reappeared=True if is_new=False
@@ -298,7 +358,7 @@ class PostProcessGroupTest(TestCase):
             group_id=event.group_id,
         )
 
-        mock_processor.assert_called_with(EventMatcher(event), False, False, True, True)
+        mock_processor.assert_called_with(EventMatcher(event), False, False, True, True, rules=ANY)
 
         assert not GroupSnooze.objects.filter(id=snooze.id).exists()
 
@@ -366,7 +426,7 @@ class PostProcessGroupTest(TestCase):
             group_id=event.group_id,
         )
 
-        mock_processor.assert_called_with(EventMatcher(event), True, False, True, False)
+        mock_processor.assert_called_with(EventMatcher(event), True, False, True, False, rules=ANY)
 
         assert GroupSnooze.objects.filter(id=snooze.id).exists()
 
@@ -612,7 +672,7 @@ class PostProcessGroupTest(TestCase):
         #     group=group
         # ).delete()  # Delete so it creates the .REGRESSION entry.
 
-        mock_processor.assert_called_with(EventMatcher(event), True, True, False, False)
+        mock_processor.assert_called_with(EventMatcher(event), True, True, False, False, rules=ANY)
 
         cache_key = write_event_to_cache(event)
         post_process_group(
@@ -624,7 +684,7 @@ class PostProcessGroupTest(TestCase):
             group_id=event.group_id,
         )
 
-        mock_processor.assert_called_with(EventMatcher(event), False, True, False, False)
+        mock_processor.assert_called_with(EventMatcher(event), False, True, False, False, rules=ANY)
 
         group = Group.objects.get(id=group.id)
         assert group.status == GroupStatus.UNRESOLVED
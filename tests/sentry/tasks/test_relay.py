@@ -3,9 +3,11 @@ from unittest.mock import patch
 import pytest
 
 from sentry.models import ProjectKey, ProjectKeyStatus, ProjectOption
+from sentry.relay.config import get_organization_config, get_project_config
 from sentry.relay.projectconfig_cache.redis import RedisProjectConfigCache
 from sentry.relay.projectconfig_debounce_cache.redis import RedisProjectConfigDebounceCache
 from sentry.tasks.relay import schedule_update_config_cache
+from sentry.utils import json
 
 
 def _cache_keys_for_project(project):
@@ -120,6 +122,38 @@ def test_generate(
     ]
 
 
+@pytest.mark.django_db
+def test_generate_organization(
+    default_project, default_organization, default_projectkey, factories, task_runner, redis_cache
+):
+    project_2 = factories.create_project(organization=default_organization)
+    project_2.update_option("sentry:relay_pii_config", '{"applications": {}}')
+    keys = [
+        default_projectkey,
+        factories.create_project_key(project=default_project),
+        factories.create_project_key(project=project_2),
+    ]
+
+    with patch(
+        "sentry.relay.config.get_organization_config",
+        wraps=get_organization_config,
+    ) as get_org_config, task_runner():
+        schedule_update_config_cache(generate=True, organization_id=default_organization.id)
+
+    # Organization level parts of the config are only computed once
+    assert get_org_config.call_count == 1
+
+    for key in keys:
+        cfg = redis_cache.get(key.public_key)
+        assert cfg["projectId"] == key.project_id
+        assert cfg["publicKeys"] == [
+            {"isEnabled": True, "publicKey": key.public_key, "numericId": key.id, "quotas": []}
+        ]
+        # Same as generating the config of the key on its own
+        expected = get_project_config(key.project, project_keys=[key]).to_dict()
+        assert cfg["config"] == json.loads(json.dumps(expected["config"]))
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize("entire_organization", (True, False))
 def test_invalidate(
@@ -41,6 +41,24 @@ class JSONTest(TestCase):
         res = float("inf")
         self.assertEqual(json.dumps(res), "null")
 
+    def test_rapid_json(self):
+        payload = {
+            "name": "c:sessions/session@none",
+            "tags": {"1": 2, "3": 4},
+            "value": [0.1, 1e-07, 1e20, 1.2345678901234567e19, -0.0, 2 ** 70],
+            "unit": "caf\xe9\u2028\x01",
+            "org_id": 1,
+            "timestamp": 1640995200,
+            "retention_days": 90,
+            "nested": [True, False, None, {}],
+        }
+        for value in [
+            payload,
+            {**payload, "unit": "seconds"},
+            {**payload, "value": [float("nan"), float("inf"), float("-inf")]},
+        ]:
+            assert json.dumps(value, use_rapid_json=True) == json.dumps(value)
+
     def test_enum(self):
         enum = Enum("foo", "a b c")
         res = enum.a
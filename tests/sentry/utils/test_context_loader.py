@@ -0,0 +1,67 @@
+from unittest.mock import Mock, patch
+
+from sentry.testutils import TestCase
+from sentry.utils.cache import cache
+from sentry.utils.context_loader import ContextLoader
+
+
+class ContextLoaderTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.hooks_loader = Mock(return_value=["hook"])
+        self.commit_loader = Mock(return_value=False)
+        self.loader = ContextLoader("test")
+        self.loader.register(
+            "hooks", key=lambda id: f"test-hooks:{id}", loader=self.hooks_loader, ttl=60
+        )
+        self.loader.register(
+            "has_commit",
+            key=lambda id: f"test-has-commit:{id}",
+            loader=self.commit_loader,
+            ttl=lambda value: 60 if value else 10,
+            local_ttl=10,
+        )
+
+    def test_backfills_misses(self):
+        assert self.loader.load(1) == {"hooks": ["hook"], "has_commit": False}
+        self.hooks_loader.assert_called_once_with(1)
+        self.commit_loader.assert_called_once_with(1)
+        assert cache.get("test-hooks:1") == ["hook"]
+        assert cache.get("test-has-commit:1") is False
+
+    def test_single_round_trip(self):
+        cache.set("test-hooks:1", ["cached"], 60)
+        cache.set("test-has-commit:1", True, 60)
+        with patch.object(cache, "get_many", wraps=cache.get_many) as get_many, patch.object(
+            cache, "get", wraps=cache.get
+        ) as get:
+            assert self.loader.load(1) == {"hooks": ["cached"], "has_commit": True}
+        assert get_many.call_count == 1
+        assert get.call_count == 0
+        assert not self.hooks_loader.called
+        assert not self.commit_loader.called
+
+    def test_local_cache(self):
+        self.loader.load(1)
+        cache.clear()
+
+        # `has_commit` is served from the per-process cache, `hooks` is not
+        with patch.object(cache, "get_many", wraps=cache.get_many) as get_many:
+            assert self.loader.load(1) == {"hooks": ["hook"], "has_commit": False}
+        get_many.assert_called_once_with(["test-hooks:1"])
+        assert self.hooks_loader.call_count == 2
+        assert self.commit_loader.call_count == 1
+
+        # Different arguments don't share the local cache
+        self.loader.load(2)
+        assert self.commit_loader.call_count == 2
+
+    def test_names(self):
+        assert self.loader.load(1, names=["hooks"]) == {"hooks": ["hook"]}
+        assert not self.commit_loader.called
+
+    def test_loader_error(self):
+        self.hooks_loader.side_effect = Exception("boom")
+        assert self.loader.load(1) == {"has_commit": False}
+        assert cache.get("test-hooks:1") is None
+        assert cache.get("test-has-commit:1") is False
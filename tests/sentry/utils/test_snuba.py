@@ -4,7 +4,9 @@ from unittest import mock
 
 import pytest
 import pytz
+from django.test import override_settings
 from django.utils import timezone
+from freezegun import freeze_time
 
 from sentry.models import GroupRelease, Project, Release
 from sentry.testutils import TestCase
@@ -12,7 +14,13 @@ from sentry.utils.snuba import (
     Dataset,
     SnubaQueryParams,
     UnqualifiedQueryError,
+    _acquire_query_lease,
+    _apply_cache_and_build_results,
     _prepare_query_params,
+    _refresh_stale,
+    _release_query_leases,
+    _set_query_cache,
+    get_cache_key,
     get_json_type,
     get_query_params_to_update_for_projects,
     get_snuba_column_name,
@@ -374,3 +382,93 @@ class QuantizeTimeTest(unittest.TestCase):
                 break
 
         assert i != j
+
+
+@mock.patch("sentry.utils.snuba._bulk_snuba_query")
+class QueryCacheTest(TestCase):
+    query = {"dataset": "events", "selected_columns": ["event_id"]}
+
+    def run_query(self):
+        params = (dict(self.query), lambda x: x, lambda x: x)
+        return _apply_cache_and_build_results([params], referrer="test", use_cache=True)[0]
+
+    def test_hit_and_miss(self, bulk_snuba_query):
+        bulk_snuba_query.return_value = [{"data": [1]}]
+        with freeze_time("2022-01-01 00:00:00"):
+            assert self.run_query() == {"data": [1]}
+            assert self.run_query() == {"data": [1]}
+        assert bulk_snuba_query.call_count == 1
+
+        # The entry expired and isn't served stale
+        with freeze_time("2022-01-01 00:01:01"):
+            assert self.run_query() == {"data": [1]}
+        assert bulk_snuba_query.call_count == 2
+
+    @override_settings(SENTRY_SNUBA_CACHE_REFERRER_TTL_SECONDS={"test": 600})
+    def test_referrer_ttl(self, bulk_snuba_query):
+        bulk_snuba_query.return_value = [{"data": [1]}]
+        with freeze_time("2022-01-01 00:00:00"):
+            self.run_query()
+        with freeze_time("2022-01-01 00:09:00"):
+            self.run_query()
+        assert bulk_snuba_query.call_count == 1
+
+    @override_settings(SENTRY_SNUBA_CACHE_STALE_SECONDS=60)
+    @mock.patch("sentry.utils.snuba._query_cache_refresh_pool")
+    def test_stale_while_revalidate(self, refresh_pool, bulk_snuba_query):
+        bulk_snuba_query.return_value = [{"data": [1]}]
+        with freeze_time("2022-01-01 00:00:00"):
+            self.run_query()
+
+        bulk_snuba_query.return_value = [{"data": [2]}]
+        with freeze_time("2022-01-01 00:01:30"):
+            # The stale result is served, and refreshed in the background
+            assert self.run_query() == {"data": [1]}
+            assert bulk_snuba_query.call_count == 1
+            ((refresh, *args), _) = refresh_pool.submit.call_args
+            assert refresh is _refresh_stale
+            refresh(*args)
+            assert bulk_snuba_query.call_count == 2
+            assert self.run_query() == {"data": [2]}
+
+    def test_coalesce_with_other_worker(self, bulk_snuba_query):
+        cache_key = get_cache_key(self.query)
+        # Another worker is running the same query
+        assert _acquire_query_lease(cache_key)
+
+        def sleep(_):
+            _set_query_cache(cache_key, {"data": [3]}, "test")
+
+        with mock.patch("sentry.utils.snuba.time.sleep", side_effect=sleep) as mock_sleep:
+            assert self.run_query() == {"data": [3]}
+        assert mock_sleep.call_count == 1
+        assert not bulk_snuba_query.called
+
+    def test_lease_released_without_result(self, bulk_snuba_query):
+        bulk_snuba_query.return_value = [{"data": [1]}]
+        cache_key = get_cache_key(self.query)
+        assert _acquire_query_lease(cache_key)
+
+        with mock.patch(
+            "sentry.utils.snuba.time.sleep",
+            # The query of the other worker failed
+            side_effect=lambda _: _release_query_leases([cache_key]),
+        ) as mock_sleep:
+            assert self.run_query() == {"data": [1]}
+        # The lease is taken over right away instead of waiting for it to expire
+        assert mock_sleep.call_count == 1
+        assert bulk_snuba_query.call_count == 1
+        assert self.run_query() == {"data": [1]}
+        assert bulk_snuba_query.call_count == 1
+
+    def test_lease_timeout(self, bulk_snuba_query):
+        bulk_snuba_query.return_value = [{"data": [1]}]
+        assert _acquire_query_lease(get_cache_key(self.query))
+
+        with freeze_time("2022-01-01 00:00:00") as frozen_time, mock.patch(
+            "sentry.utils.snuba.time.sleep",
+            side_effect=lambda _: frozen_time.tick(timedelta(seconds=5)),
+        ):
+            # The worker holding the lease didn't finish in time, query snuba directly
+            assert self.run_query() == {"data": [1]}
+        assert bulk_snuba_query.call_count == 1
@@ -6,6 +6,7 @@ from unittest.mock import patch
 import pytz
 from django.utils import timezone
 
+from sentry.api.event_search import SearchFilter, SearchKey, SearchValue
 from sentry.api.serializers import serialize
 from sentry.api.serializers.models.group import (
     GroupSerializerSnuba,
@@ -30,6 +31,7 @@ from sentry.testutils.helpers.datetime import before_now, iso_format
 from sentry.types.integrations import ExternalProviders
 from sentry.utils.cache import cache
 from sentry.utils.hashlib import hash_values
+from sentry.utils.snuba import bulk_raw_query
 
 
 class GroupSerializerSnubaTest(APITestCase, SnubaTestCase):
@@ -445,6 +447,42 @@ class StreamGroupSerializerTestCase(APITestCase, SnubaTestCase):
             for args, kwargs in get_range.call_args_list:
                 assert kwargs["environment_ids"] is None
 
+    def test_seen_stats(self):
+        for event_id, level, timestamp in [
+            ("a" * 32, "error", iso_format(before_now(minutes=1))),
+            ("b" * 32, "warning", iso_format(before_now(minutes=1))),
+            ("c" * 32, "error", iso_format(before_now(days=7))),
+        ]:
+            group = self.store_event(
+                data={
+                    "event_id": event_id,
+                    "fingerprint": ["put-me-in-group1"],
+                    "timestamp": timestamp,
+                    "level": level,
+                },
+                project_id=self.project.id,
+            ).group
+
+        with mock.patch(
+            "sentry.api.serializers.models.group.bulk_raw_query", side_effect=bulk_raw_query
+        ) as query:
+            result = serialize(
+                [group],
+                serializer=StreamGroupSerializerSnuba(
+                    start=before_now(days=1),
+                    end=before_now(),
+                    search_filters=[
+                        SearchFilter(SearchKey("level"), "=", SearchValue("error")),
+                    ],
+                ),
+            )[0]
+
+        # The time range, filtered and lifetime stats are fetched together
+        assert query.call_count == 1
+        assert len(query.call_args[0][0]) == 3
+        assert result["count"] == "2"
+        assert result["filtered"]["count"] == "1"
+
     def test_session_count(self):
         group = self.group
 
@@ -27,7 +27,7 @@ from sentry.search.snuba.backend import (
     CdcEventsDatasetSnubaSearchBackend,
     EventsDatasetSnubaSearchBackend,
 )
-from sentry.search.snuba.executors import InvalidQueryForExecutor
+from sentry.search.snuba.executors import InvalidQueryForExecutor, PostgresSnubaQueryExecutor
 from sentry.testutils import SnubaTestCase, TestCase, xfail_if_not_postgres
 from sentry.testutils.helpers.datetime import before_now, iso_format
 from sentry.utils.snuba import SENTRY_SNUBA_MAP, Dataset, SnubaError
@@ -1313,6 +1313,26 @@ class EventsSnubaSearchTest(TestCase, SnubaTestCase):
         finally:
             options.set("snuba.search.max-pre-snuba-candidates", prev_max_pre)
 
+    def test_post_filtering_candidates(self):
+        with self.options(
+            {
+                "snuba.search.max-pre-snuba-candidates": 1,
+                "snuba.search.max-post-filter-candidates": 10,
+            }
+        ):
+            # too many candidates for snuba, post-filter them in memory
+            results = self.make_query()
+            assert set(results) == {self.group1, self.group2}
+            results = self.make_query(search_filter_query="foo")
+            assert set(results) == {self.group1}
+            results = self.make_query(search_filter_query="bar")
+            assert set(results) == {self.group2}
+
+            # too many candidates to post-filter in memory
+            with self.options({"snuba.search.max-post-filter-candidates": 1}):
+                results = self.make_query(search_filter_query="foo")
+                assert set(results) == {self.group1}
+
     def test_optimizer_enabled(self):
         prev_optimizer_enabled = options.get("snuba.search.pre-snuba-candidates-optimizer")
         options.set("snuba.search.pre-snuba-candidates-optimizer", True)
@@ -1395,6 +1415,60 @@ class EventsSnubaSearchTest(TestCase, SnubaTestCase):
             assert third_results.hits > 10
             assert third_results.results != second_results.results
 
+    def test_hits_estimate_cache(self):
+        for i in range(10):
+            self.store_event(
+                data={
+                    "fingerprint": [f"hits-group{i}"],
+                    "timestamp": iso_format(self.base_datetime - timedelta(days=21)),
+                },
+                project_id=self.project.id,
+            )
+
+        with self.options({"snuba.search.max-pre-snuba-candidates": 5}), mock.patch.object(
+            PostgresSnubaQueryExecutor,
+            "estimate_hits",
+            autospec=True,
+            side_effect=PostgresSnubaQueryExecutor.estimate_hits,
+        ) as estimate_hits:
+            first_results = self.make_query(
+                search_filter_query="is:unresolved", limit=5, count_hits=True
+            )
+            assert estimate_hits.call_count == 1
+
+            # Following searches reuse the estimate
+            second_results = self.make_query(
+                search_filter_query="is:unresolved", limit=5, count_hits=True
+            )
+            assert second_results.hits == first_results.hits
+            assert estimate_hits.call_count == 1
+
+            self.make_query(search_filter_query="is:resolved", limit=5, count_hits=True)
+            assert estimate_hits.call_count == 2
+
+    def test_hits_estimate_async(self):
+        for i in range(10):
+            self.store_event(
+                data={
+                    "fingerprint": [f"hits-group{i}"],
+                    "timestamp": iso_format(self.base_datetime - timedelta(days=21)),
+                },
+                project_id=self.project.id,
+            )
+
+        with self.options(
+            {
+                "snuba.search.max-pre-snuba-candidates": 5,
+                "snuba.search.hits-estimate-async": True,
+            }
+        ), self.tasks():
+            # The first page is returned without waiting for the estimate
+            results = self.make_query(search_filter_query="is:unresolved", limit=5, count_hits=True)
+            assert results.hits is None
+
+            results = self.make_query(search_filter_query="is:unresolved", limit=5, count_hits=True)
+            assert results.hits == 11
+
     def test_regressed_in_release(self):
         # expect no groups within the results since there are no releases
         results = self.make_query(search_filter_query="regressed_in_release:fake")